@@ -0,0 +1,110 @@
+"""
+Measures how long the dialog functions take before their window appears.
+
+Compares the old per-call theme check (running ``defaults`` in a new process) with the
+cached theme, then, when a display is available, times ``show_message`` from the call
+until its window is drawn, both starting a new Tk root for every dialog (as the dialogs
+used to) and reusing the dialog manager's root. Windows are closed automatically as soon
+as they appear.
+
+Usage:
+    python benchmarks/bench_dialogs.py [--repeat N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from byu_accounting.dialogs import theme  # noqa: E402
+
+
+def legacy_theme_check():
+    """
+    The theme check every dialog used to run on non-Windows systems.
+    """
+    try:
+        result = subprocess.run(["defaults", "read", "-g", "AppleInterfaceStyle"],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        return "Dark" in result.stdout
+    except Exception:
+        return False
+
+
+def time_calls(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def has_display():
+    if sys.platform in ('win32', 'darwin'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def time_to_appear(open_dialog, repeat):
+    """
+    Times ``open_dialog`` until its window is drawn, closing the window instead of waiting for the user.
+    """
+    import tkinter as tk
+
+    appeared = []
+    original_wait_window = tk.Misc.wait_window
+
+    def close_when_drawn(self, window=None):
+        window = window or self
+        window.update()
+        appeared.append(time.perf_counter())
+        window.destroy()
+
+    tk.Misc.wait_window = close_when_drawn
+    try:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            open_dialog()
+            times.append(appeared[-1] - start)
+    finally:
+        tk.Misc.wait_window = original_wait_window
+    return min(times), sum(times) / len(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    legacy = time_calls(legacy_theme_check, args.repeat)
+    theme.is_dark_mode()
+    cached = time_calls(theme.is_dark_mode, args.repeat * 100)
+    detect = time_calls(theme.detect_dark_mode, args.repeat)
+    print(f'theme check, new process per call: {legacy * 1000:8.3f} ms')
+    print(f'theme detection, uncached:          {detect * 1000:8.3f} ms')
+    print(f'theme check, cached:                {cached * 1000:8.3f} ms ({legacy / cached:,.0f}x faster)')
+
+    if not has_display():
+        print('no display; skipping window timings')
+        return 0
+
+    from byu_accounting.dialogs import get_manager, show_message
+
+    message = 'Timing how long this window takes to appear.'
+
+    def new_root_per_dialog():
+        get_manager().close()
+        show_message('Benchmark', message)
+
+    for label, open_dialog in [('show_message, new Tk root each time:', new_root_per_dialog),
+                               ('show_message, shared Tk root:', lambda: show_message('Benchmark', message))]:
+        best, mean = time_to_appear(open_dialog, args.repeat)
+        print(f'{label:<36}{best * 1000:8.1f} ms best, {mean * 1000:.1f} ms mean')
+    get_manager().close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
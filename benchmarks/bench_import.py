@@ -0,0 +1,81 @@
+"""
+Import-time benchmark for ``import byu_accounting``.
+
+Runs the import in fresh interpreters, reports the best time and fails when it
+exceeds the budget or when a heavy dependency is loaded eagerly.
+
+Usage:
+    python benchmarks/bench_import.py [--budget SECONDS] [--repeat N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Seconds allowed for a cold ``import byu_accounting`` (best of --repeat runs).
+IMPORT_BUDGET_SECONDS = 0.05
+
+# Modules that must not be loaded by ``import byu_accounting`` alone.
+HEAVY_MODULES = ['selenium', 'tkinter', 'pypdf', 'pandas', 'numpy', 'requests']
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import byu_accounting
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+
+def measure_import(repeat=5):
+    """
+    Measures ``import byu_accounting`` in fresh interpreters.
+
+    Args:
+        repeat (int, optional): Number of interpreters to start. Defaults to 5.
+
+    Returns:
+        dict: The best time in seconds and the heavy modules that were loaded.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_ROOT, env.get('PYTHONPATH')]))
+    best = None
+    loaded = set()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE],
+            stdout=subprocess.PIPE,
+            check=True,
+            env=env,
+            text=True,
+        ).stdout
+        result = json.loads(output)
+        best = result['seconds'] if best is None else min(best, result['seconds'])
+        loaded.update(m for m in HEAVY_MODULES if m in result['modules'])
+    return {'seconds': best, 'heavy_modules': sorted(loaded)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET_SECONDS)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    result = measure_import(args.repeat)
+    print(f"import byu_accounting: {result['seconds'] * 1000:.1f} ms (budget {args.budget * 1000:.0f} ms)")
+
+    ok = True
+    if result['heavy_modules']:
+        print(f"FAIL: heavy modules loaded at import: {', '.join(result['heavy_modules'])}")
+        ok = False
+    if result['seconds'] > args.budget:
+        print('FAIL: import time is over budget')
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
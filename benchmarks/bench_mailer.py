@@ -0,0 +1,75 @@
+"""
+Compares sending statement emails one connection per message with BulkMailer.
+
+Runs against a local SMTP sink (benchmarks/smtp_stub.py), so no mail server or
+credentials are needed.
+
+Usage:
+    python benchmarks/bench_mailer.py [--messages N] [--connections N] [--failure-rate RATE]
+"""
+import argparse
+import os
+import smtplib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from smtp_stub import SmtpStub  # noqa: E402
+
+from byu_accounting.mail import BulkMailer, add_attachment  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=300)
+    parser.add_argument('--connections', type=int, default=4)
+    parser.add_argument('--attachment-kb', type=int, default=200)
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='share of BulkMailer sends answered with 451')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp, SmtpStub() as stub:
+        attachment = os.path.join(tmp, 'statement.pdf')
+        with open(attachment, 'wb') as f:
+            f.write(os.urandom(args.attachment_kb * 1024))
+        recipients = [f'customer{i}@example.com' for i in range(args.messages)]
+        print(f'{args.messages} messages with a {args.attachment_kb} KB attachment')
+
+        # One connection per message, the way scripts usually send
+        from email.message import EmailMessage
+
+        start = time.perf_counter()
+        for recipient in recipients:
+            message = EmailMessage()
+            message['From'] = 'ar@example.com'
+            message['To'] = recipient
+            message['Subject'] = 'Your statement'
+            message.set_content('Your statement is attached.')
+            add_attachment(attachment, message)
+            with smtplib.SMTP(stub.host, stub.port) as smtp:
+                smtp.send_message(message)
+        elapsed = time.perf_counter() - start
+        print(f'{"connection per message":>26}: {elapsed:.2f}s ({args.messages / elapsed:,.1f} msgs/s)')
+
+        # Only BulkMailer retries, so transient failures are switched on for it alone
+        stub.failure_rate = args.failure_rate
+        with BulkMailer(stub.host, stub.port, sender='ar@example.com', starttls=False,
+                        connections=args.connections, retry_delay=0.01) as mailer:
+            start = time.perf_counter()
+            messages = {
+                recipient: mailer.build_message(recipient, 'Your statement', 'Your statement is attached.',
+                                                attachments=[attachment])
+                for recipient in recipients
+            }
+            report = mailer.send(messages)
+            elapsed = time.perf_counter() - start
+        print(f'{f"BulkMailer, {args.connections} connections":>26}: {elapsed:.2f}s '
+              f'({args.messages / elapsed:,.1f} msgs/s)')
+        print(f'{"":>26}  {report.summary()}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
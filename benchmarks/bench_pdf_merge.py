@@ -0,0 +1,77 @@
+"""
+Compares filling one template per DataFrame row with looped create_pdf and with PdfTemplate,
+including flattened files and one merged PDF, and reports the bytes written by each.
+
+Usage:
+    python benchmarks/bench_pdf_merge.py [--rows N] [--fields N] [--processes N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+from pdf_fixtures import make_form_pdf  # noqa: E402
+
+from byu_accounting import create_pdf  # noqa: E402
+from byu_accounting.pdf import PdfTemplate  # noqa: E402
+
+
+def _size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--fields', type=int, default=120)
+    parser.add_argument('--filled', type=int, default=10, help='fields filled per row')
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template_path = make_form_pdf(os.path.join(tmp, 'template.pdf'), args.fields)
+        df = pd.DataFrame({f'field_{j}': [f'row {i} value {j}' for i in range(args.rows)] for j in range(args.filled)})
+
+        def loop_create_pdf():
+            for i, row in enumerate(df.to_dict('records')):
+                create_pdf(template_path, os.path.join(tmp, 'loop', f'{i}.pdf'), row)
+
+        def template_serial():
+            PdfTemplate(template_path).fill_rows(df, os.path.join(tmp, 'serial', '{index}.pdf'), processes=1)
+
+        def template_parallel():
+            PdfTemplate(template_path).fill_rows(df, os.path.join(tmp, 'parallel', '{index}.pdf'), processes=args.processes)
+
+        def template_flattened():
+            PdfTemplate(template_path).fill_rows(df, os.path.join(tmp, 'flat', '{index}.pdf'), processes=args.processes,
+                                                 flatten=True)
+
+        def template_merged():
+            PdfTemplate(template_path).fill_merged(df, os.path.join(tmp, 'merged.pdf'))
+
+        os.makedirs(os.path.join(tmp, 'loop'))
+        print(f'{args.rows} rows, {args.fields}-field template, {args.filled} fields filled per row')
+        for name, run, output in [
+            ('create_pdf loop', loop_create_pdf, 'loop'),
+            ('PdfTemplate, 1 process', template_serial, 'serial'),
+            (f'PdfTemplate, {args.processes} processes', template_parallel, 'parallel'),
+            ('PdfTemplate, flattened', template_flattened, 'flat'),
+            ('PdfTemplate, merged', template_merged, 'merged.pdf'),
+        ]:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            size = _size(os.path.join(tmp, output))
+            print(f'{name:>28}: {elapsed:.2f}s ({args.rows / elapsed:,.1f} rows/s, {size / 1e6:,.2f} MB)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
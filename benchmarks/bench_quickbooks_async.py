@@ -0,0 +1,72 @@
+"""
+Compares pulling one query from many realms with the sync and async QuickBooks clients.
+
+Runs against a local stub server (benchmarks/qbo_stub.py), so no network or
+credentials are needed. Requires aiohttp for the async client.
+
+Usage:
+    python benchmarks/bench_quickbooks_async.py [--realms N] [--entities N] [--latency SECONDS]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from qbo_stub import QuickBooksStub  # noqa: E402
+
+from byu_accounting.quickbooks import QuickBooksClient, QuickBooksTokenManager  # noqa: E402
+
+QUERY = 'SELECT * FROM Invoice'
+TOKENS = {'accessToken': None, 'refreshToken': 'refresh'}
+
+
+def run_sync(stub, realms, page_size, workers):
+    def pull(realm_id):
+        manager = QuickBooksTokenManager('id', 'secret', tokens=TOKENS, token_url=stub.token_url)
+        client = QuickBooksClient(realm_id, manager, base_url=stub.base_url)
+        return sum(1 for _ in client.query(QUERY, page_size=page_size))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(pull, [str(i) for i in range(realms)]))
+
+
+async def run_async(stub, realms, page_size):
+    from byu_accounting.quickbooks.aio import AsyncQuickBooksClient, AsyncQuickBooksTokenManager
+
+    managers = {
+        str(i): AsyncQuickBooksTokenManager('id', 'secret', TOKENS, token_url=stub.token_url)
+        for i in range(realms)
+    }
+    async with AsyncQuickBooksClient(managers, base_url=stub.base_url) as client:
+        results = await asyncio.gather(*(client.query_all(realm_id, QUERY, page_size=page_size) for realm_id in managers))
+    return sum(len(rows) for rows in results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--realms', type=int, default=50)
+    parser.add_argument('--entities', type=int, default=2000)
+    parser.add_argument('--page-size', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--workers', type=int, default=8, help='threads for the sync client')
+    args = parser.parse_args(argv)
+
+    with QuickBooksStub(entity_count=args.entities, latency=args.latency) as stub:
+        for name, run in [
+            (f'sync ({args.workers} threads)', lambda: run_sync(stub, args.realms, args.page_size, args.workers)),
+            ('async', lambda: asyncio.run(run_async(stub, args.realms, args.page_size))),
+        ]:
+            start = time.perf_counter()
+            rows = run()
+            elapsed = time.perf_counter() - start
+            print(f'{name:>18}: {rows} rows from {args.realms} realms in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
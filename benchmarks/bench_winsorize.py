@@ -0,0 +1,68 @@
+"""
+Compares winsorizing many columns within groups with groupby-apply and with winsorize_frame(df, by=...).
+
+Usage:
+    python benchmarks/bench_winsorize.py [--rows N] [--columns N] [--groups N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from byu_accounting.outliers import winsorize, winsorize_frame  # noqa: E402
+
+
+def make_panel(rows, columns, groups, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'fiscal_year': rng.integers(2000, 2000 + max(1, groups // 20), rows),
+        'industry': rng.integers(0, 20, rows),
+    })
+    for j in range(columns):
+        values = rng.standard_t(3, rows)
+        values[rng.random(rows) < 0.01] = np.nan
+        df[f'x{j}'] = values
+    return df
+
+
+def groupby_apply(df, value_columns, by, lower, upper):
+    def clip_group(group):
+        return group.apply(lambda s: pd.Series(winsorize(s.to_numpy(), lower, upper), index=s.index))
+    return df.groupby(by, group_keys=False)[value_columns].apply(clip_group)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--columns', type=int, default=10)
+    parser.add_argument('--groups', type=int, default=400, help='approximate fiscal year x industry groups')
+    args = parser.parse_args(argv)
+
+    df = make_panel(args.rows, args.columns, args.groups)
+    value_columns = [f'x{j}' for j in range(args.columns)]
+    by = ['fiscal_year', 'industry']
+    n_groups = df.groupby(by).ngroups
+    print(f'{args.rows:,} rows, {args.columns} columns, {n_groups} groups')
+
+    start = time.perf_counter()
+    expected = groupby_apply(df, value_columns, by, 0.01, 0.99)
+    naive = time.perf_counter() - start
+    print(f'{"groupby-apply":>30}: {naive:.2f}s')
+
+    start = time.perf_counter()
+    result = winsorize_frame(df, 0.01, 0.99, columns=value_columns, by=by)
+    vectorized = time.perf_counter() - start
+    print(f'{"winsorize_frame(df, by=...)":>30}: {vectorized:.2f}s ({naive / vectorized:.1f}x)')
+
+    expected = expected.reindex(df.index)
+    assert np.allclose(result[value_columns].to_numpy(), expected.to_numpy(), equal_nan=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
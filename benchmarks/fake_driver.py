@@ -0,0 +1,148 @@
+"""
+In-process stand-in for a Selenium WebDriver, used by the benchmarks.
+
+Every element "appears" a fixed time after the page is loaded (:meth:`FakeDriver.load`),
+and every WebDriver command takes a fixed round-trip latency, so the Selenium helpers
+can be timed for how quickly they notice an element without a browser. The tests also
+use it to make elements stale, navigate, and end sessions.
+"""
+import time
+
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+
+
+class FakeElement:
+    def __init__(self, driver, value):
+        self._driver = driver
+        self._render = driver.renders
+        self.value = value
+        self.text = ''
+
+    def _command(self):
+        self._driver._command()
+        if self._render != self._driver.renders:
+            raise StaleElementReferenceException(f'{self.value} is no longer attached to the page')
+
+    def is_displayed(self):
+        self._command()
+        return self.value not in self._driver.hidden
+
+    def is_enabled(self):
+        self._command()
+        return True
+
+    def click(self):
+        self._command()
+        self._driver.clicks += 1
+
+    def clear(self):
+        self._command()
+        self.text = ''
+
+    def send_keys(self, *keys):
+        self._command()
+        self.text += ''.join(str(key) for key in keys)
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def frame(self, element):
+        self._driver._command()
+        self._driver.frames.append(element.value)
+
+    def default_content(self):
+        self._driver._command()
+        self._driver.frames.clear()
+
+
+class FakeDriver:
+    """
+    A page whose elements all exist from ``appear_after`` seconds after :meth:`load`.
+
+    Args:
+        appear_after (float, optional): Seconds before elements can be found. Defaults to 0.02.
+        latency (float, optional): Seconds each WebDriver command takes. Defaults to 0.0005.
+        hidden (iterable, optional): Locator values whose elements exist but are not displayed. Defaults to none.
+    """
+
+    def __init__(self, appear_after=0.02, latency=0.0005, hidden=()):
+        self.appear_after = appear_after
+        self.latency = latency
+        self.hidden = set(hidden)
+        self.switch_to = _SwitchTo(self)
+        self.commands = 0
+        self.finds = 0
+        self.clicks = 0
+        self.renders = 0
+        self.frames = []
+        self.alive = True
+        self._url = 'about:blank'
+        self.load()
+
+    @property
+    def current_url(self):
+        # Free, unlike other commands, so the cached-lookup benchmarks time only element lookups
+        if not self.alive:
+            raise InvalidSessionIdException('the session has ended')
+        return self._url
+
+    def get(self, url):
+        """
+        Navigates to ``url``: a new page whose elements appear ``appear_after`` seconds from now.
+        """
+        self._command()
+        self._url = url
+        self.frames.clear()
+        self.rerender()
+        self.load()
+
+    def rerender(self):
+        """
+        Replaces every element on the page, so elements found before are stale.
+        """
+        self.renders += 1
+
+    def quit(self):
+        self.alive = False
+
+    def load(self):
+        """
+        Starts a new page load; elements appear ``appear_after`` seconds from now.
+        """
+        self._ready_at = time.perf_counter() + self.appear_after
+
+    def _command(self):
+        if not self.alive:
+            raise InvalidSessionIdException('the session has ended')
+        self.commands += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _ready(self):
+        return time.perf_counter() >= self._ready_at
+
+    def find_element(self, by, value):
+        self._command()
+        self.finds += 1
+        if not self._ready():
+            raise NoSuchElementException(f'{by}={value}')
+        return FakeElement(self, value)
+
+    def find_elements(self, by, value):
+        self._command()
+        self.finds += 1
+        return [FakeElement(self, value) for _ in range(3)] if self._ready() else []
+
+    def execute_script(self, script, fields):
+        """
+        Answers ``fill_form``'s script: every field is filled once the page is ready.
+        """
+        self._command()
+        status = 'ok' if self._ready() else 'missing'
+        return [[status, None] for _ in fields]
@@ -0,0 +1,64 @@
+"""
+Generates AcroForm PDF templates for the PDF benchmarks.
+"""
+from pypdf import PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DictionaryObject,
+    FloatObject,
+    NameObject,
+    TextStringObject,
+)
+
+FIELDS_PER_PAGE = 60
+
+
+def make_form_pdf(path, n_fields=10, values=None, fields_per_page=FIELDS_PER_PAGE):
+    """
+    Writes a PDF with ``n_fields`` text fields named 'field_0', 'field_1', ...
+
+    Args:
+        path (str): Where to write the PDF.
+        n_fields (int, optional): Number of text fields. Defaults to 10.
+        values (dict, optional): Initial field values. Defaults to None (empty fields).
+        fields_per_page (int, optional): Fields laid out on each page. Defaults to 60.
+
+    Returns:
+        str: ``path``.
+    """
+    values = values or {}
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject('/Type'): NameObject('/Font'),
+        NameObject('/Subtype'): NameObject('/Type1'),
+        NameObject('/BaseFont'): NameObject('/Helvetica'),
+    }))
+    fields = ArrayObject()
+    page = None
+    for i in range(n_fields):
+        if i % fields_per_page == 0:
+            page = writer.add_blank_page(612, 792)
+            page[NameObject('/Annots')] = ArrayObject()
+        y = 760 - (i % fields_per_page) * 12
+        name = f'field_{i}'
+        field = writer._add_object(DictionaryObject({
+            NameObject('/Type'): NameObject('/Annot'),
+            NameObject('/Subtype'): NameObject('/Widget'),
+            NameObject('/FT'): NameObject('/Tx'),
+            NameObject('/T'): TextStringObject(name),
+            NameObject('/V'): TextStringObject(str(values.get(name, ''))),
+            NameObject('/Rect'): ArrayObject([FloatObject(50), FloatObject(y), FloatObject(300), FloatObject(y + 10)]),
+            NameObject('/DA'): TextStringObject('/Helv 8 Tf 0 g'),
+            NameObject('/P'): page.indirect_reference,
+        }))
+        page['/Annots'].append(field)
+        fields.append(field)
+    if page is None:
+        writer.add_blank_page(612, 792)
+    writer._root_object[NameObject('/AcroForm')] = DictionaryObject({
+        NameObject('/Fields'): fields,
+        NameObject('/DA'): TextStringObject('/Helv 8 Tf 0 g'),
+        NameObject('/DR'): DictionaryObject({NameObject('/Font'): DictionaryObject({NameObject('/Helv'): font})}),
+    })
+    writer.write(path)
+    return path
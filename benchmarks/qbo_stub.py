@@ -0,0 +1,111 @@
+"""
+Local stand-in for the QuickBooks Online token and API endpoints, used by the benchmarks.
+
+Serves ``/token`` (OAuth refresh), ``/v3/company/<realm>/query`` and
+``/v3/company/<realm>/batch`` with a fixed per-request latency and an optional
+share of HTTP 429 responses.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_PAGE = re.compile(r'STARTPOSITION (\d+) MAXRESULTS (\d+)')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+    # Headers and body are written separately; without this, Nagle's algorithm and the
+    # client's delayed ACK add ~40 ms to every response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload, headers=()):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _throttled(self):
+        stub = self.server.stub
+        stub.requests += 1
+        time.sleep(stub.latency)
+        if random.random() < stub.throttle_rate:
+            self._send(429, {'Fault': {'type': 'ThrottleExceeded'}}, [('Retry-After', '0')])
+            return True
+        return False
+
+    def do_GET(self):
+        if self._throttled():
+            return
+        query = parse_qs(urlparse(self.path).query)['query'][0]
+        start, count = (int(x) for x in _PAGE.search(query).groups())
+        stop = min(self.server.stub.entity_count + 1, start + count)
+        rows = [{'Id': str(i), 'TotalAmt': i * 1.5, 'CustomerRef': {'value': str(i % 50)}} for i in range(start, stop)]
+        self._send(200, {'QueryResponse': {'Invoice': rows, 'startPosition': start, 'maxResults': len(rows)}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.startswith('/token'):
+            self.server.stub.requests += 1
+            time.sleep(self.server.stub.latency)
+            self._send(200, {
+                'access_token': f'access-{time.time()}',
+                'refresh_token': 'refresh',
+                'expires_in': 3600,
+                'x_refresh_token_expires_in': 8726400,
+            })
+            return
+        if self._throttled():
+            return
+        items = json.loads(body)['BatchItemRequest']
+        self._send(200, {'BatchItemResponse': [{'bId': item['bId'], 'Invoice': {'Id': item['bId']}} for item in items]})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients cancel prefetched pages past the end of a query; that is expected.
+        pass
+
+
+class QuickBooksStub:
+    """
+    Starts the stub server on a free localhost port in a background thread.
+
+    Args:
+        entity_count (int, optional): Number of entities every query returns in total. Defaults to 5000.
+        latency (float, optional): Seconds each request takes. Defaults to 0.01.
+        throttle_rate (float, optional): Share of API requests answered with HTTP 429. Defaults to 0.
+    """
+
+    def __init__(self, entity_count=5000, latency=0.01, throttle_rate=0.0):
+        self.entity_count = entity_count
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.requests = 0
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.stub = self
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}'
+        self.token_url = f'{self.base_url}/token'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,115 @@
+"""
+Local SMTP sink used by the mail benchmarks.
+
+Speaks enough SMTP (EHLO/HELO, AUTH PLAIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT) for
+``smtplib``, counts connections, logins and delivered messages, and can answer a share of
+messages with a transient 451 reply or drop the connection after accepting a message.
+``python -m aiosmtpd -n -l localhost:8025`` works as well.
+"""
+import base64
+import random
+import socketserver
+import threading
+import time
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def _reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        stub = self.server.stub
+        with stub.lock:
+            stub.connections += 1
+        time.sleep(stub.connect_latency)
+        self._reply('220 stub ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().split(' ', 1)[0].upper()
+            if command in ('EHLO', 'HELO'):
+                self._reply('250-stub')
+                if stub.password is not None:
+                    self._reply('250-AUTH PLAIN')
+                self._reply('250 8BITMIME')
+            elif command == 'AUTH':
+                with stub.lock:
+                    stub.logins += 1
+                credentials = base64.b64decode(line.split()[-1]).split(b'\0')
+                if credentials[-1].decode() == stub.password:
+                    self._reply('235 Authentication successful')
+                else:
+                    self._reply('535 Authentication credentials invalid')
+            elif command in ('MAIL', 'RCPT', 'RSET', 'NOOP'):
+                self._reply('250 OK')
+            elif command == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                size = 0
+                for data_line in self.rfile:
+                    if data_line == b'.\r\n':
+                        break
+                    size += len(data_line)
+                time.sleep(stub.latency)
+                if random.random() < stub.failure_rate:
+                    self._reply('451 Try again later')
+                    continue
+                with stub.lock:
+                    stub.messages += 1
+                    stub.bytes += size
+                    drop = stub.drop_replies > 0
+                    stub.drop_replies -= drop
+                if drop:
+                    return  # Accepted, but the client never hears so
+                self._reply('250 Queued')
+            elif command == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Not implemented')
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SmtpStub:
+    """
+    Starts the SMTP sink on a free localhost port in a background thread.
+
+    Args:
+        latency (float, optional): Seconds the server takes to accept each message. Defaults to 0.005.
+        connect_latency (float, optional): Seconds before the greeting, like a TLS handshake and login. Defaults to 0.05.
+        failure_rate (float, optional): Share of messages answered with a transient 451 reply. Defaults to 0.
+        password (str, optional): Require AUTH PLAIN with this password. Defaults to None (no login).
+        drop_replies (int, optional): Close the connection instead of replying after accepting this many
+            messages. Defaults to 0.
+    """
+
+    def __init__(self, latency=0.005, connect_latency=0.05, failure_rate=0.0, password=None, drop_replies=0):
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.failure_rate = failure_rate
+        self.password = password
+        self.drop_replies = drop_replies
+        self.connections = 0
+        self.logins = 0
+        self.messages = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.stub = self
+        self.host, self.port = self.server.server_address
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
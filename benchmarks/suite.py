@@ -0,0 +1,432 @@
+"""
+Benchmark suite for the package's hot paths, compared against a saved baseline.
+
+Each case is timed as the median of ``--repeat`` samples (fast cases are looped so every
+sample takes at least 20 ms), and the whole suite is run ``--runs`` times (3 by default),
+each in a new process, keeping the median of the runs. Results are compared with
+``benchmarks/baseline.json``, which holds medians recorded the same way.
+
+Every case has its own allowed slowdown: its group's tolerance, widened to twice the
+run-to-run spread (slowest minus fastest run, relative to the median) seen for that case
+when the baseline was recorded. ``--threshold`` replaces it with one value for every case.
+A case slower than its baseline by more than that, and by at least ``--min-delta`` seconds,
+is reported as a regression and the run exits with status 1.
+
+Baselines are machine-specific: record them on the machine that runs the comparison with
+``--save-baseline`` and commit the file together with intended performance changes.
+
+Groups (select with --group), with their minimum tolerance:
+    outliers      25%  winsorize/truncate on 1e3-1e7 values (1e8 with --full) at 0%, 10% and 50% NaN,
+                       allocating the result and writing to ``out=``
+    pdf           25%  get_pdf/create_pdf on generated AcroForm templates with 10-1,000 fields
+    mail          50%  add_attachment with 1 KB, 1 MB and 50 MB files
+    web           25%  click_button/send_text/fill_form against a fake driver whose elements appear after 20 ms
+    quickbooks    50%  token refresh against the local stub server
+    import        50%  cold ``import byu_accounting``
+    instrument    50%  overhead of an instrumented call with instrumentation off
+
+Usage:
+    python benchmarks/suite.py [--group NAME] [--filter TEXT] [--quick | --full] [--repeat N] [--runs N]
+                               [--threshold FRACTION] [--save-baseline] [--baseline PATH]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from email.message import EmailMessage
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import numpy as np  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+# A case this much slower than its baseline (0.25 = 25%) is a regression, unless its group sets its own tolerance.
+DEFAULT_TOLERANCE = 0.25
+
+# The allowed slowdown is at least this many times the case's run-to-run spread in the baseline.
+SPREAD_FACTOR = 2.0
+
+# Runs of the whole suite; each case's result is its median over the runs.
+DEFAULT_RUNS = 3
+
+# Differences smaller than this many seconds are treated as noise.
+DEFAULT_MIN_DELTA = 0.0005
+
+DEFAULT_REPEAT = 7
+
+MIN_SAMPLE_SECONDS = 0.02
+
+_CASES = []
+
+
+def case(group, tolerance=DEFAULT_TOLERANCE):
+    """
+    Registers a benchmark group: a function taking the parsed options and yielding
+    ``(name, seconds)`` pairs. ``tolerance`` is the slowdown (as a fraction) allowed for its cases.
+    """
+    def register(function):
+        _CASES.append((group, function, tolerance))
+        return function
+    return register
+
+
+def median_time(function, repeat):
+    """
+    Returns the median time of one ``function()`` call over ``repeat`` samples.
+
+    Fast functions are called several times per sample so each sample takes at least 20 ms;
+    the calls that find that number also warm up caches and are not counted.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SAMPLE_SECONDS or number >= 1 << 20:
+            break
+        number *= 2
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return statistics.median(samples)
+
+
+def _label(n):
+    return f'1e{int(round(np.log10(n)))}'
+
+
+def _kb(size):
+    return f'{size // 1024}KB' if size < 1 << 20 else f'{size >> 20}MB'
+
+
+# ----- Cases -----
+
+@case('outliers')
+def outlier_cases(options):
+    from byu_accounting import truncate, winsorize
+
+    sizes = [10 ** 3, 10 ** 5] if options.quick else [10 ** 3, 10 ** 5, 10 ** 6, 10 ** 7]
+    if options.full:
+        sizes.append(10 ** 8)
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        values = rng.standard_t(3, n)
+        for nan_share in (0.0, 0.1, 0.5):
+            data = values.copy()
+            if nan_share:
+                data[rng.random(n) < nan_share] = np.nan
+            out = np.empty_like(data)
+            repeat = options.repeat if n <= 10 ** 7 else 1
+            for function in (winsorize, truncate):
+                label = f'n={_label(n)},nan={nan_share:.0%}'
+                yield f'{function.__name__}[{label}]', median_time(lambda: function(data, 0.01, 0.99), repeat)
+                yield f'{function.__name__}[{label},out=]', median_time(lambda: function(data, 0.01, 0.99, out=out),
+                                                                        repeat)
+            del data, out
+
+
+@case('pdf')
+def pdf_cases(options):
+    from byu_accounting import create_pdf, get_pdf
+    from pdf_fixtures import make_form_pdf
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n_fields in ([10, 100] if options.quick else [10, 100, 1000]):
+            template = make_form_pdf(os.path.join(directory, f'form_{n_fields}.pdf'), n_fields,
+                                     values={f'field_{i}': f'value {i}' for i in range(n_fields)})
+            output = os.path.join(directory, 'out.pdf')
+            updates = {f'field_{i}': f'new {i}' for i in range(0, n_fields, 2)}
+            yield f'get_pdf[fields={n_fields}]', median_time(lambda: get_pdf(template), options.repeat)
+            yield f'create_pdf[fields={n_fields}]', median_time(lambda: create_pdf(template, output, updates),
+                                                              options.repeat)
+
+
+@case('mail', tolerance=0.5)
+def mail_cases(options):
+    from byu_accounting import add_attachment
+
+    sizes = [1 << 10, 1 << 20] if options.quick else [1 << 10, 1 << 20, 50 << 20]
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, f'attachment_{size}.pdf')
+            with open(path, 'wb') as f:
+                f.write(os.urandom(size))
+            repeat = options.repeat if size < 50 << 20 else min(options.repeat, 3)
+            yield f'add_attachment[{_kb(size)}]', median_time(lambda: add_attachment(path, EmailMessage()), repeat)
+            os.remove(path)
+
+
+@case('web')
+def web_cases(options):
+    from fake_driver import FakeDriver
+
+    from byu_accounting import click_button, fill_form, send_text
+
+    driver = FakeDriver(appear_after=0.02, latency=0.0005)
+    fields = {f'//input[@name="field_{i}"]': f'value {i}' for i in range(10)}
+
+    def appear_then(action):
+        def run():
+            driver.load()
+            action()
+        return run
+
+    yield 'click_button[appear=20ms]', median_time(appear_then(lambda: click_button('//button', driver)),
+                                                 options.repeat)
+    yield 'send_text[appear=20ms]', median_time(appear_then(lambda: send_text('text', '//input', driver)),
+                                              options.repeat)
+    yield 'fill_form[fields=10,appear=20ms]', median_time(appear_then(lambda: fill_form(driver, fields)),
+                                                        options.repeat)
+
+
+@case('quickbooks', tolerance=0.5)
+def quickbooks_cases(options):
+    from qbo_stub import QuickBooksStub
+
+    from byu_accounting.quickbooks import QuickBooksTokenManager
+
+    # refresh_quickbooks_access_token always posts to the production endpoint; the token
+    # manager it uses is pointed at the stub instead.
+    with QuickBooksStub(latency=0.0) as stub:
+        manager = QuickBooksTokenManager('id', 'secret', tokens={'accessToken': None, 'refreshToken': 'refresh'},
+                                         token_url=stub.token_url)
+        manager.refresh(force=True)  # open the pooled connection outside the timing
+        yield 'token_refresh[stub]', median_time(lambda: manager.refresh(force=True), options.repeat)
+
+
+@case('import', tolerance=0.5)
+def import_cases(options):
+    from bench_import import measure_import
+
+    yield 'import byu_accounting', measure_import(options.repeat)['seconds']
+
+
+@case('instrument', tolerance=0.5)
+def instrument_cases(options):
+    from byu_accounting.instrumentation import instrumented, is_enabled
+
+    if is_enabled():
+        return
+
+    @instrumented()
+    def noop(value):
+        return value
+
+    yield 'instrumented call, disabled', median_time(lambda: noop(1), options.repeat)
+    yield 'plain call', median_time(lambda: noop.__wrapped__(1), options.repeat)
+
+
+# ----- Running and comparing -----
+
+def run(options):
+    """
+    Runs the selected cases once.
+
+    Returns:
+        tuple: ``(results, tolerances)``: case name -> seconds, and case name -> its group's tolerance.
+    """
+    results = {}
+    tolerances = {}
+    for group, function, tolerance in _CASES:
+        if options.group and group not in options.group:
+            continue
+        for name, seconds in function(options):
+            if options.filter and not any(text in name for text in options.filter):
+                continue
+            results[name] = seconds
+            tolerances[name] = tolerance
+            print(f'  {name:<44}{_format(seconds):>12}', flush=True)
+    return results, tolerances
+
+
+def run_in_subprocess(options):
+    """
+    Runs the selected cases once in a new Python process; returns what :func:`run` returns.
+    """
+    argv = [sys.executable, os.path.abspath(__file__), '--repeat', str(options.repeat)]
+    for group in options.group or []:
+        argv += ['--group', group]
+    for text in options.filter or []:
+        argv += ['--filter', text]
+    if options.quick:
+        argv.append('--quick')
+    if options.full:
+        argv.append('--full')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'results.json')
+        subprocess.run(argv + ['--results-json', path], check=True)
+        with open(path) as f:
+            data = json.load(f)
+    return data['results'], data['tolerances']
+
+
+def run_many(options, runs):
+    """
+    Runs the selected cases ``runs`` times.
+
+    Several runs each get a new process. In one process, later runs would find the memory
+    allocator and caches warmed up by the larger cases of the runs before, and time the
+    allocating cases differently from a single run.
+
+    Returns:
+        tuple: ``(results, spreads, tolerances)``: the median seconds of each case over the runs,
+        its spread ((slowest - fastest) / median; 0.0 for a single run) and its group's tolerance.
+    """
+    all_results = []
+    for i in range(runs):
+        if runs > 1:
+            print(f'run {i + 1} of {runs}')
+        results, tolerances = run(options) if runs == 1 else run_in_subprocess(options)
+        all_results.append(results)
+    medians, spreads = {}, {}
+    for name in all_results[0]:
+        times = [results[name] for results in all_results]
+        medians[name] = statistics.median(times)
+        spreads[name] = (max(times) - min(times)) / medians[name] if medians[name] else 0.0
+    return medians, spreads, tolerances
+
+
+def allowed_slowdown(tolerance, spread):
+    """
+    Returns the slowdown allowed for a case: its group's tolerance, or more if the case was that noisy.
+    """
+    return max(tolerance, SPREAD_FACTOR * spread)
+
+
+def _format(seconds):
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.1f} us'
+    if seconds < 1:
+        return f'{seconds * 1e3:.2f} ms'
+    return f'{seconds:.3f} s'
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, allowed, min_delta):
+    """
+    Compares results with baseline timings, allowing each case a slowdown of ``allowed[name]``.
+
+    Returns:
+        list: ``(name, baseline seconds, seconds, ratio)`` for every regression.
+    """
+    regressions = []
+    print(f'\n  {"case":<44}{"baseline":>12}{"now":>12}{"change":>9}{"allowed":>9}')
+    for name, seconds in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f'  {name:<44}{"-":>12}{_format(seconds):>12}{"new":>9}')
+            continue
+        ratio = seconds / previous if previous else float('inf')
+        regressed = ratio > 1 + allowed[name] and seconds - previous > min_delta
+        marker = '  REGRESSION' if regressed else ''
+        print(f'  {name:<44}{_format(previous):>12}{_format(seconds):>12}{ratio - 1:>+9.0%}'
+              f'{allowed[name]:>+9.0%}{marker}')
+        if regressed:
+            regressions.append((name, previous, seconds, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--group', action='append', choices=[group for group, _, _ in _CASES],
+                        help='Only run this group of cases (repeatable).')
+    parser.add_argument('--filter', action='append', help='Only report cases whose name contains this text (repeatable).')
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--quick', action='store_true', help='Smaller inputs, for a fast check.')
+    size.add_argument('--full', action='store_true', help='Add the largest inputs (1e8 values needs ~3 GB of memory).')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'Samples per case; the median is used. Defaults to {DEFAULT_REPEAT}.')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS,
+                        help=f'Runs of the whole suite, each in a new process; the median is used. '
+                             f'Defaults to {DEFAULT_RUNS}.')
+    parser.add_argument('--threshold', type=float,
+                        help="Allowed slowdown as a fraction of the baseline for every case, instead of each "
+                             "case's own tolerance.")
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help='Ignore slowdowns smaller than this many seconds. Defaults to 0.0005.')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Write these results into the baseline file instead of comparing.')
+    parser.add_argument('--results-json', help=argparse.SUPPRESS)  # used by run_in_subprocess
+    args = parser.parse_args(argv)
+
+    if args.results_json:
+        results, tolerances = run(args)
+        with open(args.results_json, 'w') as f:
+            json.dump({'results': results, 'tolerances': tolerances}, f)
+        return 0
+
+    print(f'running benchmarks ({"quick" if args.quick else "full" if args.full else "default"} sizes, '
+          f'median of {args.repeat} samples, {args.runs} run{"s" if args.runs > 1 else ""})')
+    results, spreads, tolerances = run_many(args, args.runs)
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+
+    if args.save_baseline:
+        # Merge, so a filtered run only replaces the cases it ran
+        stored['machine'] = machine_info()
+        stored['repeat'] = args.repeat
+        stored['runs'] = args.runs
+        stored.setdefault('results', {}).update(results)
+        stored.setdefault('spread', {}).update(spreads)
+        with open(args.baseline, 'w') as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'\nsaved {len(results)} results to {args.baseline}')
+        return 0
+
+    if not stored:
+        print(f'\nno baseline at {args.baseline}; run with --save-baseline to create one')
+        return 0
+    if stored.get('machine') != machine_info():
+        print('\nnote: the baseline was recorded on a different machine or Python; timings may not be comparable')
+    if (stored.get('repeat'), stored.get('runs')) != (args.repeat, args.runs):
+        print(f'\nnote: the baseline holds medians of {stored.get("repeat")} samples and {stored.get("runs")} runs, '
+              f'not {args.repeat} and {args.runs}')
+
+    stored_spreads = stored.get('spread', {})
+    allowed = {
+        name: args.threshold if args.threshold is not None else allowed_slowdown(tolerance, stored_spreads.get(name, 0.0))
+        for name, tolerance in tolerances.items()
+    }
+    regressions = compare(results, stored.get('results', {}), allowed, args.min_delta)
+    if regressions:
+        print(f'\n{len(regressions)} regression(s) over the allowed slowdown')
+        return 1
+    print('\nno regressions over the allowed slowdown')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,20 +1,48 @@
-from .byu_accounting import (
-    click_button,
-    send_text,
-    switch_to_iframe,
-    switch_to_default_frame,
-    refresh_quickbooks_access_token,
-    get_pdf,
-    create_pdf,
-    add_attachment,
-    single_input,
-    input_form,
-    show_message,
-    select_file,
-    single_input_alt,
-    input_form_alt,
-    show_message_alt,
-    select_file_alt,
-    winsorize,
-    truncate,
-)
\ No newline at end of file
+"""
+Functions used by BYU Accounting students in their data analytics courses.
+
+Every public function is imported from its subpackage on first access, so
+``import byu_accounting`` does not load Selenium, tkinter, pypdf, pandas or
+numpy until a function that needs them is used.
+"""
+from ._lazy import attach
+
+_EXPORTS = {
+    # Web automation (Selenium)
+    'click_button': '.web',
+    'send_text': '.web',
+    'fill_form': '.web',
+    'switch_to_iframe': '.web',
+    'switch_to_default_frame': '.web',
+    # QuickBooks Online
+    'refresh_quickbooks_access_token': '.quickbooks',
+    # PDF forms
+    'get_pdf': '.pdf',
+    'get_pdfs': '.pdf',
+    'create_pdf': '.pdf',
+    # Email
+    'add_attachment': '.mail',
+    # Dialogs
+    'single_input': '.dialogs',
+    'input_form': '.dialogs',
+    'show_message': '.dialogs',
+    'select_file': '.dialogs',
+    'single_input_alt': '.dialogs',
+    'input_form_alt': '.dialogs',
+    'show_message_alt': '.dialogs',
+    'select_file_alt': '.dialogs',
+    'set_theme': '.dialogs',
+    # Outlier handling
+    'winsorize': '.outliers',
+    'truncate': '.outliers',
+    'winsorize_frame': '.outliers',
+    'truncate_frame': '.outliers',
+    'winsorize_chunked': '.outliers',
+    'truncate_chunked': '.outliers',
+    # Instrumentation
+    'stats': '.instrumentation',
+}
+
+_SUBPACKAGES = ('web', 'quickbooks', 'pdf', 'mail', 'dialogs', 'outliers', 'instrumentation')
+
+__getattr__, __dir__, __all__ = attach(__name__, _EXPORTS, _SUBPACKAGES)
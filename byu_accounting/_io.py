@@ -0,0 +1,76 @@
+import io
+import os
+
+BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+
+def is_path(source):
+    """
+    Returns True if ``source`` is a filesystem path rather than in-memory data or a file object.
+    """
+    return isinstance(source, (str, os.PathLike))
+
+
+def as_buffer(source):
+    """
+    Returns the contents of ``source`` as a bytes-like object, copying only when unavoidable.
+
+    Args:
+        source: Bytes, a bytearray, a memoryview, a ``BytesIO`` or another readable binary file object.
+
+    Returns:
+        bytes, bytearray or memoryview: The data. ``BytesIO`` contents are shared, not copied.
+    """
+    if isinstance(source, memoryview):
+        return source.cast('B') if source.format != 'B' or source.ndim != 1 else source
+    if isinstance(source, (bytes, bytearray)):
+        return source
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer()
+    return source.read()
+
+
+def as_stream(source):
+    """
+    Returns something ``pypdf.PdfReader`` can open: the path itself, or a binary stream.
+
+    Args:
+        source: A path, bytes-like data, or a readable binary file object.
+    """
+    if is_path(source) or hasattr(source, 'read'):
+        return source
+    if isinstance(source, memoryview) and isinstance(source.obj, bytes) and source.nbytes == len(source.obj):
+        # A view over a whole bytes object: BytesIO can share the bytes without copying.
+        return io.BytesIO(source.obj)
+    return io.BytesIO(source)
+
+
+def source_size(source):
+    """
+    Returns the size in bytes of a path, bytes-like data or seekable file object, or None if unknown.
+    """
+    if is_path(source):
+        return os.path.getsize(source)
+    if isinstance(source, BUFFER_TYPES):
+        return memoryview(source).nbytes
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer().nbytes
+    try:
+        position = source.tell()
+        size = source.seek(0, io.SEEK_END)
+        source.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+
+def source_name(source, default=None):
+    """
+    Returns a file name for ``source``: the base name of a path, the ``name`` of a file object, or ``default``.
+    """
+    if is_path(source):
+        return os.path.basename(os.fspath(source))
+    name = getattr(source, 'name', None)
+    if isinstance(name, str):
+        return os.path.basename(name)
+    return default
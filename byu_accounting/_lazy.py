@@ -0,0 +1,35 @@
+import importlib
+
+
+def attach(package_name, exports, submodules=()):
+    """
+    Builds module-level ``__getattr__``/``__dir__`` hooks that import names on first access.
+
+    Args:
+        package_name (str): The ``__name__`` of the package installing the hooks.
+        exports (dict): Maps each public attribute name to the (relative) module that defines it.
+        submodules (iterable, optional): Subpackage/module names that can be accessed as attributes. Defaults to ().
+
+    Returns:
+        tuple: ``(__getattr__, __dir__, __all__)`` ready to be assigned in the package namespace.
+    """
+    exports = dict(exports)
+    submodules = set(submodules)
+    package = importlib.import_module(package_name)
+
+    def __getattr__(name):
+        if name in exports:
+            module = importlib.import_module(exports[name], package_name)
+            value = getattr(module, name)
+        elif name in submodules:
+            value = importlib.import_module(f'.{name}', package_name)
+        else:
+            raise AttributeError(f"module '{package_name}' has no attribute '{name}'")
+        # Cache the resolved value so later lookups skip this hook entirely.
+        setattr(package, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(package)) | set(exports) | submodules)
+
+    return __getattr__, __dir__, list(exports)
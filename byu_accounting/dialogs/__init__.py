@@ -0,0 +1,37 @@
+"""
+Input dialogs and messages.
+
+``single_input``, ``input_form``, ``show_message`` and ``select_file`` ask
+the current backend (tkinter windows, the console, or preset answers for
+unattended runs), chosen automatically or with :func:`set_backend`. The
+tkinter windows and their console ``_alt`` counterparts live in separate
+modules so the console versions can be used without importing tkinter. The
+windows are shown by a :class:`DialogManager` that keeps one hidden Tk root
+for the whole program.
+"""
+from .._lazy import attach
+
+_EXPORTS = {
+    'is_dark_mode': '.theme',
+    'set_theme': '.theme',
+    'single_input': '.backends',
+    'input_form': '.backends',
+    'show_message': '.backends',
+    'select_file': '.backends',
+    'set_backend': '.backends',
+    'get_backend': '.backends',
+    'register_backend': '.backends',
+    'DialogBackend': '.backends',
+    'TkBackend': '.backends',
+    'ConsoleBackend': '.backends',
+    'NonInteractiveBackend': '.backends',
+    'MissingAnswerError': '.backends',
+    'DialogManager': '.manager',
+    'get_manager': '.manager',
+    'single_input_alt': '.console',
+    'input_form_alt': '.console',
+    'show_message_alt': '.console',
+    'select_file_alt': '.console',
+}
+
+__getattr__, __dir__, __all__ = attach(__name__, _EXPORTS)
@@ -0,0 +1,372 @@
+"""
+Dialog backends and the functions that dispatch to them.
+
+``single_input``, ``input_form``, ``show_message`` and ``select_file`` from
+``byu_accounting`` ask the current backend:
+
+- ``'tk'``: tkinter windows (see :class:`~byu_accounting.dialogs.manager.DialogManager`).
+- ``'console'``: prompts in the terminal, like the ``_alt`` functions.
+- ``'noninteractive'``: answers from a dict, environment variables or a JSON file, for
+  scheduled jobs, containers and tests.
+
+The backend is chosen from the ``BYU_ACCOUNTING_DIALOGS`` environment variable or
+:func:`set_backend`; otherwise ``'auto'`` picks tk when a display is available, the
+console when stdin is a terminal, and the non-interactive backend otherwise. tkinter is
+only imported when the tk backend shows a window.
+"""
+import abc
+import importlib.util
+import json
+import logging
+import os
+import re
+import sys
+import threading
+
+from ..instrumentation import instrumented
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ENV_VAR = 'BYU_ACCOUNTING_DIALOGS'
+ANSWERS_FILE_ENV_VAR = 'BYU_ACCOUNTING_ANSWERS'
+ANSWER_ENV_PREFIX = 'BYU_ACCOUNTING_ANSWER_'
+
+
+class MissingAnswerError(LookupError):
+    """
+    Raised by the non-interactive backend when no answer is configured for a prompt.
+    """
+
+
+def _check_inputs(inputs, masks):
+    if inputs is None:
+        raise Exception("inputs must be declared.")
+    if masks is not None and len(masks) != len(inputs):
+        raise Exception("The length of masks does not match the length of inputs.")
+
+
+class DialogBackend(abc.ABC):
+    """
+    Base class for dialog backends. Subclasses implement the four dialogs with the
+    signatures of :func:`single_input`, :func:`input_form`, :func:`show_message` and
+    :func:`select_file`; a subclass missing one cannot be instantiated.
+    """
+    name = None
+
+    @abc.abstractmethod
+    def single_input(self, prompt, mask=False, width=300, height=150):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def input_form(self, prompt=None, inputs=None, masks=None, width=0, height=0):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def show_message(self, title, message, width=0, height=0):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def select_file(self, title, filetypes=None):
+        raise NotImplementedError
+
+
+class TkBackend(DialogBackend):
+    """
+    Shows tkinter windows through the calling thread's shared dialog manager.
+    """
+    name = 'tk'
+
+    @staticmethod
+    def _manager():
+        from .manager import get_manager
+        return get_manager()
+
+    def single_input(self, prompt, mask=False, width=300, height=150):
+        return self._manager().single_input(prompt, mask=mask, width=width, height=height)
+
+    def input_form(self, prompt=None, inputs=None, masks=None, width=0, height=0):
+        return self._manager().input_form(prompt=prompt, inputs=inputs, masks=masks, width=width, height=height)
+
+    def show_message(self, title, message, width=0, height=0):
+        return self._manager().show_message(title, message, width=width, height=height)
+
+    def select_file(self, title, filetypes=None):
+        return self._manager().select_file(title, filetypes=filetypes)
+
+
+class ConsoleBackend(DialogBackend):
+    """
+    Prompts in the terminal with ``input()`` and ``getpass()``.
+    """
+    name = 'console'
+
+    def single_input(self, prompt, mask=False, width=300, height=150):
+        from .console import single_input_alt
+        return single_input_alt(prompt, mask=mask)
+
+    def input_form(self, prompt=None, inputs=None, masks=None, width=0, height=0):
+        from .console import input_form_alt
+        return input_form_alt(prompt=prompt, inputs=inputs, masks=masks)
+
+    def show_message(self, title, message, width=0, height=0):
+        from .console import show_message_alt
+        return show_message_alt(title, message)
+
+    def select_file(self, title, filetypes=None):
+        from .console import select_file_alt
+        return select_file_alt(title, filetypes=filetypes)
+
+
+def answer_env_var(prompt):
+    """
+    Returns the environment variable the non-interactive backend reads for a prompt,
+    e.g. 'BYU_ACCOUNTING_ANSWER_CLIENT_ID' for 'Client ID:'.
+    """
+    return ANSWER_ENV_PREFIX + re.sub(r'[^0-9A-Za-z]+', '_', prompt).strip('_').upper()
+
+
+class NonInteractiveBackend(DialogBackend):
+    """
+    Answers dialogs without a user, for unattended runs and tests.
+
+    Each prompt (or input label, or file selection title) is looked up in ``answers``, then
+    in its environment variable (see :func:`answer_env_var`), then in the JSON answers file.
+    A prompt without an answer raises :class:`MissingAnswerError` instead of waiting for input.
+    Messages are logged and kept in :attr:`messages`.
+
+    Args:
+        answers (dict, optional): Prompt -> answer. For :func:`input_form`, an answer may also be
+            keyed by the form's prompt and hold a dict of label -> answer. Defaults to None.
+        path (str, optional): A JSON file of answers in the same format. Defaults to the
+            ``BYU_ACCOUNTING_ANSWERS`` environment variable.
+
+    Attributes:
+        messages (list): ``(title, message)`` of every message shown.
+
+    Example:
+        ```python
+        set_backend('noninteractive', answers={'Username': 'cosmo', 'Password': 'secret'})
+        username = single_input('Username')
+        ```
+    """
+    name = 'noninteractive'
+
+    def __init__(self, answers=None, path=None):
+        self.answers = dict(answers or {})
+        self.path = path or os.environ.get(ANSWERS_FILE_ENV_VAR)
+        self.file_answers = {}
+        if self.path:
+            with open(self.path) as f:
+                self.file_answers = json.load(f)
+        self.messages = []
+
+    def answer(self, prompt, form=None):
+        """
+        Returns the configured answer to a prompt as a string.
+
+        Args:
+            prompt (str): The prompt, input label or file selection title.
+            form (str, optional): The prompt of the form the input belongs to. Defaults to None.
+
+        Raises:
+            MissingAnswerError: If no answer is configured.
+        """
+        value = self._lookup(self.answers, prompt, form)
+        if value is None:
+            value = os.environ.get(answer_env_var(prompt))
+        if value is None:
+            value = self._lookup(self.file_answers, prompt, form)
+        if value is not None:
+            return str(value)
+        raise MissingAnswerError(
+            f'No answer for {prompt!r}. Pass it in answers=, set {answer_env_var(prompt)}, '
+            f'or add it to the {ANSWERS_FILE_ENV_VAR} file.'
+        )
+
+    @staticmethod
+    def _lookup(answers, prompt, form):
+        form_answers = answers.get(form) if form is not None else None
+        if isinstance(form_answers, dict) and prompt in form_answers:
+            return form_answers[prompt]
+        value = answers.get(prompt)
+        return None if isinstance(value, dict) else value
+
+    def single_input(self, prompt, mask=False, width=300, height=150):
+        return self.answer(prompt)
+
+    def input_form(self, prompt=None, inputs=None, masks=None, width=0, height=0):
+        _check_inputs(inputs, masks)
+        return {label: self.answer(label, form=prompt) for label in inputs}
+
+    def show_message(self, title, message, width=0, height=0):
+        self.messages.append((title, message))
+        logger.info('%s: %s', title, message)
+
+    def select_file(self, title, filetypes=None):
+        path = self.answer(title)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'The answer to {title!r} is not an existing file: {path}')
+        return path
+
+
+# ----- Registry -----
+
+_BACKENDS = {
+    'tk': TkBackend,
+    'console': ConsoleBackend,
+    'noninteractive': NonInteractiveBackend,
+}
+
+_lock = threading.Lock()
+_current = None
+
+
+def register_backend(name, factory):
+    """
+    Registers a dialog backend so it can be chosen by name.
+
+    Args:
+        name (str): The name used with :func:`set_backend` and ``BYU_ACCOUNTING_DIALOGS``.
+        factory (callable): A :class:`DialogBackend` subclass, or a function returning a backend
+            and accepting the keyword options passed to :func:`set_backend`.
+    """
+    _BACKENDS[name] = factory
+
+
+def has_display():
+    """
+    Returns True if windows can be shown: on Windows and macOS, or with ``$DISPLAY``/``$WAYLAND_DISPLAY`` set.
+    """
+    if sys.platform in ('win32', 'darwin'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def auto_backend():
+    """
+    Returns the backend name ``'auto'`` resolves to in this process.
+    """
+    if os.environ.get(ANSWERS_FILE_ENV_VAR):
+        return 'noninteractive'
+    if has_display() and importlib.util.find_spec('tkinter') is not None:
+        return 'tk'
+    if sys.stdin is not None and sys.stdin.isatty():
+        return 'console'
+    return 'noninteractive'
+
+
+def _create(name, **options):
+    if name == 'auto':
+        name = auto_backend()
+    try:
+        factory = _BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown dialog backend {name!r}; choose 'auto' or one of {sorted(_BACKENDS)}.") from None
+    return factory(**options)
+
+
+def set_backend(backend='auto', **options):
+    """
+    Chooses the backend used by the dialog functions in this process.
+
+    Args:
+        backend (str or DialogBackend, optional): 'auto', 'tk', 'console', 'noninteractive', another
+            registered name, or a backend instance. Defaults to 'auto'.
+        **options: Passed to the backend, e.g. ``answers=`` for 'noninteractive'.
+
+    Returns:
+        DialogBackend: The backend now in use.
+    """
+    global _current
+    instance = backend if isinstance(backend, DialogBackend) else _create(backend, **options)
+    with _lock:
+        _current = instance
+    logger.debug('dialog backend: %s', instance.name)
+    return instance
+
+
+def get_backend():
+    """
+    Returns the backend in use, choosing it from ``BYU_ACCOUNTING_DIALOGS`` (default 'auto') on first use.
+    """
+    global _current
+    with _lock:
+        if _current is None:
+            _current = _create(os.environ.get(BACKEND_ENV_VAR, 'auto').strip().lower() or 'auto')
+            logger.debug('dialog backend: %s', _current.name)
+        return _current
+
+
+# ----- Dialogs -----
+
+@instrumented()
+def single_input(prompt: str, mask: bool = False, width: int = 300, height: int = 150):
+    """
+    Asks the user for one value using the current dialog backend.
+
+    Args:
+        prompt (str): The prompt text displayed in the dialog.
+        mask (bool, optional): Whether to mask the input (e.g., for passwords). Defaults to False.
+        width (int, optional): Minimum width of the dialog window. Defaults to 300.
+        height (int, optional): Minimum height of the dialog window. Defaults to 150.
+
+    Returns:
+        str: The user input as a string.
+    """
+    return get_backend().single_input(prompt, mask=mask, width=width, height=height)
+
+
+@instrumented()
+def input_form(prompt: str = None, inputs: list = None, masks: list = None, width: int = 0, height: int = 0):
+    """
+    Asks the user for several labeled values using the current dialog backend.
+
+    Args:
+        prompt (str, optional): Text to display at the top of the form. Defaults to None.
+        inputs (list): Labels for each input field. This argument is required.
+        masks (list, optional): Booleans indicating whether each input field should be masked.
+            If provided, the length of `masks` must match the length of `inputs`. Defaults to None.
+        width (int, optional): The minimum width of the form window in pixels. Defaults to 0.
+        height (int, optional): The minimum height of the form window in pixels. Defaults to 0.
+
+    Raises:
+        Exception: If the `inputs` argument is not provided.
+        Exception: If the lengths of `inputs` and `masks` (if provided) do not match.
+
+    Returns:
+        dict: The input labels and the user-entered responses as strings.
+    """
+    _check_inputs(inputs, masks)
+    return get_backend().input_form(prompt=prompt, inputs=inputs, masks=masks, width=width, height=height)
+
+
+@instrumented()
+def show_message(title: str, message: str, width: int = 0, height: int = 0):
+    """
+    Shows a message using the current dialog backend.
+
+    Args:
+        title (str): The title of the message.
+        message (str): The message to display.
+        width (int, optional): The minimum width of the message window in pixels. Defaults to 0.
+        height (int, optional): The minimum height of the message window in pixels. Defaults to 0.
+
+    Returns:
+        None
+    """
+    return get_backend().show_message(title, message, width=width, height=height)
+
+
+@instrumented()
+def select_file(title: str, filetypes: list = None):
+    """
+    Asks the user to select a file using the current dialog backend.
+
+    Args:
+        title (str): The title for the file selection.
+        filetypes (list, optional): File type filters (e.g., [("Text files", "*.txt")]). Defaults to None.
+
+    Returns:
+        str: The path of the selected file.
+    """
+    return get_backend().select_file(title, filetypes=filetypes)
@@ -0,0 +1,437 @@
+import threading
+import tkinter as tk
+from tkinter import filedialog
+from tkinter import ttk
+
+from .theme import is_dark_mode
+
+# ----- Color Schemes -----
+# A footer_bg of None uses the platform's default window color.
+PALETTES = {
+    'light': {
+        'footer_bg': None,
+        'body_bg': 'white',
+        'input_border_color': '#d9d9d9',
+        'entry_bg': 'white',
+        'text_color': 'black',
+        'button_bg': '#f0f0f0',
+        'button_fg': 'black',
+        'button_style': 'TButton',
+    },
+    'dark': {
+        'footer_bg': '#252526',
+        'body_bg': '#1E1E1E',
+        'input_border_color': '#3E3E3E',
+        'entry_bg': '#2D2D2D',
+        'text_color': '#FFFFFF',
+        'button_bg': '#3A3A3A',
+        'button_fg': '#FFFFFF',
+        'button_style': 'Dark.TButton',
+    },
+}
+
+
+class DialogManager:
+    """
+    Shows dialogs as windows of one hidden, long-lived Tk root.
+
+    Starting a Tk interpreter and setting up the ttk theme takes longer than drawing a
+    dialog, so the manager creates its root on the first dialog and keeps it for the
+    rest of the program. Each dialog is a ``Toplevel`` window that blocks until it is
+    closed, and the ttk styles are only rebuilt when the light/dark theme changes.
+
+    Tk can only be used from the thread that created the root, so use one manager per
+    thread (the module-level functions share the one returned by :func:`get_manager`).
+
+    Example:
+        ```python
+        dialogs = DialogManager()
+        username = dialogs.single_input('Username')
+        password = dialogs.single_input('Password', mask=True)
+        dialogs.close()
+        ```
+    """
+
+    def __init__(self):
+        self._root = None
+        self._style = None
+        self._styled_theme = None
+        self._default_ttk_theme = None
+        self._default_bg = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ----- Root window and styles -----
+
+    @property
+    def root(self):
+        """
+        The hidden root window, created on first use and again if it was destroyed.
+        """
+        if self._root is not None:
+            try:
+                self._root.winfo_exists()
+            except tk.TclError:
+                self._root = None
+        if self._root is None:
+            self._root = tk.Tk()
+            self._root.withdraw()
+            self._style = ttk.Style(self._root)
+            self._default_ttk_theme = self._style.theme_use()
+            self._default_bg = self._root.cget('bg')
+            self._styled_theme = None
+        return self._root
+
+    def palette(self):
+        """
+        Returns the colors for the current theme, building its ttk styles the first time it is used.
+        """
+        root = self.root
+        theme = 'dark' if is_dark_mode() else 'light'
+        if theme != self._styled_theme:
+            self._build_styles(theme)
+        colors = dict(PALETTES[theme])
+        if colors['footer_bg'] is None:
+            colors['footer_bg'] = self._default_bg or root.cget('bg')
+        colors['dark'] = theme == 'dark'
+        return colors
+
+    def _build_styles(self, theme):
+        if theme == 'dark':
+            colors = PALETTES['dark']
+            self._style.theme_use('clam')  # Base theme that supports custom colors
+            self._style.configure(
+                "Dark.TButton",
+                background=colors['button_bg'],
+                foreground=colors['button_fg'],
+                borderwidth=1,
+                focusthickness=3,
+                focuscolor='none'
+            )
+            self._style.map(
+                "Dark.TButton",
+                background=[("active", "#505050")],  # hover color
+                foreground=[("active", "#FFFFFF")]
+            )
+        else:
+            self._style.theme_use(self._default_ttk_theme)
+        self._styled_theme = theme
+
+    def close(self):
+        """
+        Destroys the root window. The next dialog starts a new one.
+        """
+        if self._root is not None:
+            try:
+                self._root.destroy()
+            except tk.TclError:
+                pass
+            self._root = None
+
+    # ----- Windows -----
+
+    def _window(self, title, colors):
+        """
+        Creates a hidden dialog window; :meth:`_show` displays it once its contents are laid out.
+        """
+        window = tk.Toplevel(self.root)
+        window.withdraw()
+        window.title(title)
+        window.attributes('-topmost', True)
+        if colors['dark']:
+            window.configure(bg=colors['body_bg'])
+        return window
+
+    @staticmethod
+    def _center(window, width, height):
+        x = (window.winfo_screenwidth() - width) // 2
+        y = (window.winfo_screenheight() - height) // 2
+        window.geometry(f'{width}x{height}+{x}+{y}')
+
+    def _show(self, window, focus=None):
+        """
+        Displays a dialog window and blocks until it is closed.
+        """
+        window.deiconify()
+        window.lift()
+        window.focus_force()
+        if focus is not None:
+            def set_focus():
+                if focus.winfo_exists():
+                    focus.focus_force()
+                    window.attributes('-topmost', False)
+            window.after(50, set_focus)
+        window.wait_window()
+
+    # ----- Dialogs -----
+
+    def single_input(self, prompt: str, mask: bool = False, width: int = 300, height: int = 150):
+        """
+        Displays an input dialog box and retrieves a user input.
+
+        Args:
+            prompt (str): The prompt text displayed in the dialog.
+            mask (bool, optional): Whether to mask the input (e.g., for passwords). Defaults to False.
+            width (int, optional): Minimum width of the dialog. Defaults to 300.
+            height (int, optional): Minimum height of the dialog. Defaults to 150.
+
+        Returns:
+            str: The user input as a string.
+        """
+        colors = self.palette()
+        window = self._window("Input", colors)
+        var = tk.StringVar(window)
+        body_bg, text_color = colors['body_bg'], colors['text_color']
+
+        # ----- Body -----
+        body_frame = tk.Frame(window, bg=body_bg)
+        body_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        prompt_label = tk.Label(body_frame, text=prompt, bg=body_bg, fg=text_color, wraplength=width - 20,
+                                font=("Helvetica", 12))
+        prompt_label.pack(pady=10)
+
+        input_row_frame = tk.Frame(body_frame, bg=body_bg)
+        input_row_frame.pack(fill=tk.X, pady=10)
+
+        entry_frame = tk.Frame(input_row_frame, bg=colors['input_border_color'], padx=1, pady=1)
+        entry_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        entry = tk.Entry(entry_frame, textvariable=var, font=("Helvetica", 12),
+                         bg=colors['entry_bg'], fg=text_color, insertbackground=text_color,
+                         show='*' if mask else '')
+        entry.pack(fill=tk.X)
+
+        # ----- Footer -----
+        footer_frame = tk.Frame(window, bg=colors['footer_bg'])
+        footer_frame.pack(fill=tk.X, side=tk.BOTTOM)
+
+        def save_close():
+            window.destroy()
+
+        entry.bind('<Return>', lambda event: save_close())
+        confirm_button = ttk.Button(footer_frame, text='Confirm', command=save_close, style=colors['button_style'])
+        confirm_button.pack(side=tk.RIGHT, padx=10, pady=10)
+
+        window.update_idletasks()
+        content_width = max(window.winfo_reqwidth(), width)
+        content_height = max(window.winfo_reqheight(), height)
+        self._center(window, content_width, content_height)
+
+        self._show(window, focus=entry)
+        return var.get()
+
+    def input_form(self, prompt: str = None, inputs: list = None, masks: list = None, width: int = 0,
+                   height: int = 0):
+        """
+        Displays a form with one labeled input field per entry in ``inputs``.
+
+        Args:
+            prompt (str, optional): Text to display at the top of the form. Defaults to None.
+            inputs (list): Labels for each input field. This argument is required.
+            masks (list, optional): Booleans indicating whether each input field should be masked.
+                If provided, the length of `masks` must match the length of `inputs`. Defaults to None.
+            width (int, optional): The minimum width of the form in pixels. Defaults to 0.
+            height (int, optional): The minimum height of the form in pixels. Defaults to 0.
+
+        Raises:
+            Exception: If the `inputs` argument is not provided.
+            Exception: If the lengths of `inputs` and `masks` (if provided) do not match.
+
+        Returns:
+            dict: The input labels and the user-entered responses as strings.
+        """
+        if inputs is None:
+            raise Exception("inputs must be declared.")
+        if masks is not None and inputs is not None:
+            if len(masks) != len(inputs):
+                raise Exception("The length of masks does not match the length of inputs.")
+
+        colors = self.palette()
+        window = self._window('Input Form', colors)
+        body_bg, text_color = colors['body_bg'], colors['text_color']
+
+        # ----- Layout Setup -----
+        label_width = max(len(x) for x in inputs) * 8
+        input_field_height = 30
+        padding = 20
+        footer_height = 50
+        prompt_height = 60
+
+        required_width = max(width, label_width + 220)
+        required_height = max(height, prompt_height + footer_height + len(inputs) * input_field_height + padding + 40)
+        self._center(window, required_width, required_height)
+        window.minsize(required_width, required_height)
+
+        # ----- Main Body -----
+        body_frame = tk.Frame(window, bg=body_bg)
+        body_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        if prompt:
+            tk.Label(
+                body_frame,
+                text=prompt,
+                bg=body_bg,
+                fg=text_color,
+                wraplength=required_width - 20,
+                font=("Helvetica", 12)
+            ).pack(pady=10)
+
+        input_fields_frame = tk.Frame(body_frame, bg=body_bg)
+        input_fields_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+
+        # ----- Input Fields -----
+        entries = {}
+        last_entry = None
+        first_entry = None
+
+        for i, label_text in enumerate(inputs):
+            try:
+                is_masked = masks[i]
+            except Exception:
+                is_masked = False
+
+            input_frame = tk.Frame(input_fields_frame, bg=body_bg)
+            input_frame.pack(fill=tk.X, pady=5)
+
+            tk.Label(
+                input_frame,
+                text=label_text + ":",
+                bg=body_bg,
+                fg=text_color,
+                font=("Helvetica", 12),
+                anchor='e',
+                width=15
+            ).pack(side=tk.LEFT, padx=5)
+
+            entry_frame = tk.Frame(input_frame, bg=colors['input_border_color'], padx=0, pady=3)
+            entry_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+            entry = tk.Entry(
+                entry_frame,
+                show='*' if is_masked else '',
+                font=("Helvetica", 12),
+                bg=colors['entry_bg'],
+                fg=text_color,
+                insertbackground=text_color
+            )
+            entry.pack(fill=tk.X, padx=5)
+
+            entries[label_text] = entry
+            last_entry = entry
+            if first_entry is None:
+                first_entry = entry
+
+        # ----- Footer -----
+        footer_frame = tk.Frame(window, bg=colors['footer_bg'], height=footer_height)
+        footer_frame.pack(fill=tk.X, side=tk.BOTTOM)
+        footer_frame.grid_propagate(False)
+
+        user_input_values = {}
+
+        def save_close():
+            user_input_values.update({key: entry.get() for key, entry in entries.items()})
+            window.destroy()
+
+        confirm_button = ttk.Button(footer_frame, text='Confirm', command=save_close, style=colors['button_style'])
+        confirm_button.pack(side=tk.RIGHT, padx=20, pady=10)
+
+        if last_entry:
+            last_entry.bind('<Return>', lambda event: save_close())
+
+        self._show(window, focus=first_entry)
+        return user_input_values
+
+    def show_message(self, title: str, message: str, width: int = 0, height: int = 0):
+        """
+        Displays a message window, sized to fit the message and centered on the screen.
+
+        Args:
+            title (str): The title of the message window.
+            message (str): The message to display in the window.
+            width (int, optional): The minimum width of the window in pixels. Defaults to 0.
+            height (int, optional): The minimum height of the window in pixels. Defaults to 0.
+
+        Returns:
+            None
+        """
+        colors = self.palette()
+        window = self._window(title, colors)
+        body_bg = colors['body_bg']
+
+        # Measure the message to size the window
+        temp_label = tk.Label(window, text=message, font=('Helvetica', 12), wraplength=width - 20)
+        temp_label.update_idletasks()  # Update geometry calculations
+        required_width = temp_label.winfo_reqwidth() + 20
+        required_height = temp_label.winfo_reqheight() + 80  # Add space for padding and buttons
+        temp_label.destroy()
+
+        final_width = max(width, required_width)
+        final_height = max(height, required_height)
+        self._center(window, final_width, final_height)
+        window.minsize(width, height)
+
+        # ----- Message Frame -----
+        message_frame = tk.Frame(window, bg=body_bg)
+        message_frame.pack(fill='both', expand=True)
+
+        message_label = tk.Label(
+            message_frame,
+            text=message,
+            bg=body_bg,
+            fg=colors['text_color'],
+            wraplength=final_width - 20,
+            font=('Helvetica', 12)
+        )
+        message_label.place(relx=0.5, rely=0.5, anchor='center')
+
+        # ----- Footer -----
+        footer_frame = tk.Frame(window, bg=colors['footer_bg'])
+        footer_frame.pack(fill='x', side='bottom')
+
+        ok_button = ttk.Button(footer_frame, text="OK", command=window.destroy, style=colors['button_style'])
+        ok_button.pack(pady=10, side='right', padx=10)
+
+        # Bind the Enter key to close the window
+        window.bind('<Return>', lambda event: window.destroy())
+
+        self._show(window)
+
+    def select_file(self, title: str, filetypes: list = None):
+        """
+        Shows ``title`` in a message, then opens a file dialog for the user to select a file.
+
+        Args:
+            title (str): The title for the file selection dialog.
+            filetypes (list, optional): File type filters (e.g., [("Text files", "*.txt")]). Defaults to None.
+
+        Returns:
+            str: The path of the selected file or an empty string if no file is selected.
+        """
+        self.show_message("Select File", title, width=4, height=5)
+
+        root = self.root
+        root.attributes('-topmost', True)  # Ensure the dialog appears on top
+        try:
+            if filetypes is not None:
+                return filedialog.askopenfilename(parent=root, title=title, filetypes=filetypes)
+            return filedialog.askopenfilename(parent=root, title=title)
+        finally:
+            root.attributes('-topmost', False)
+
+
+_managers = threading.local()
+
+
+def get_manager():
+    """
+    Returns the calling thread's shared :class:`DialogManager`, creating it on first use.
+    """
+    manager = getattr(_managers, 'manager', None)
+    if manager is None:
+        manager = _managers.manager = DialogManager()
+    return manager
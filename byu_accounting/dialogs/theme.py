@@ -0,0 +1,199 @@
+"""
+Light/dark theme detection for the dialog windows.
+
+Detecting the system theme can be slow (on macOS it runs the ``defaults`` command), so
+the result is detected once per process and cached. Set the ``BYU_ACCOUNTING_THEME``
+environment variable to 'dark' or 'light', or call :func:`set_theme`, to skip detection.
+"""
+import configparser
+import os
+import platform
+import subprocess
+import threading
+import time
+
+from ..instrumentation import instrumented
+
+THEME_ENV_VAR = 'BYU_ACCOUNTING_THEME'
+
+THEMES = ('dark', 'light')
+
+
+def _detect_windows():
+    try:
+        import winreg
+        # Registry path for app theme preference
+        registry = winreg.ConnectRegistry(None, winreg.HKEY_CURRENT_USER)
+        key_path = r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize"
+        key = winreg.OpenKey(registry, key_path)
+        # 0 = Dark, 1 = Light
+        value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
+        winreg.CloseKey(key)
+        return value == 0
+    except Exception:
+        return False
+
+
+def _detect_macos():
+    try:
+        # The macOS 'defaults' command prints "Dark" in dark mode and fails in light mode
+        result = subprocess.run(
+            ["defaults", "read", "-g", "AppleInterfaceStyle"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=2,
+        )
+        return "Dark" in result.stdout
+    except Exception:
+        return False  # Defaults to light if key not found
+
+
+def _detect_linux():
+    """
+    Reads the GTK theme from the environment and the GTK settings files, without starting a process.
+    """
+    gtk_theme = os.environ.get('GTK_THEME', '')
+    if gtk_theme:
+        return 'dark' in gtk_theme.lower()
+    config_home = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config')
+    for version in ('gtk-4.0', 'gtk-3.0'):
+        parser = configparser.ConfigParser()
+        try:
+            if not parser.read(os.path.join(config_home, version, 'settings.ini')):
+                continue
+        except configparser.Error:
+            continue
+        settings = parser['Settings'] if parser.has_section('Settings') else {}
+        if settings.get('gtk-application-prefer-dark-theme', '').strip().lower() in ('1', 'true'):
+            return True
+        if 'dark' in settings.get('gtk-theme-name', '').lower():
+            return True
+    return False
+
+
+def detect_dark_mode() -> bool:
+    """
+    Detects the system theme without caching.
+
+    Windows reads the registry, macOS runs ``defaults``, and Linux reads ``$GTK_THEME`` and the GTK
+    ``settings.ini`` files. Other systems are treated as light.
+
+    Returns:
+        bool: True if the OS is in dark mode, False if in light mode or undetectable.
+    """
+    system = platform.system()
+    if system == "Windows":
+        return _detect_windows()
+    if system == "Darwin":
+        return _detect_macos()
+    if system == "Linux":
+        return _detect_linux()
+    return False
+
+
+class ThemeService:
+    """
+    Caches the detected theme, with an optional override and time-to-live.
+
+    Args:
+        theme (str, optional): 'dark' or 'light' to use without detecting. Defaults to the
+            ``BYU_ACCOUNTING_THEME`` environment variable, then to detecting.
+        ttl (float, optional): Seconds before the detected theme is checked again, for long-running
+            programs that should follow a theme change. Defaults to None (detect once).
+    """
+
+    def __init__(self, theme=None, ttl=None):
+        self._lock = threading.Lock()
+        self._theme = None
+        self.ttl = ttl
+        self._detected = None
+        self._detected_at = 0.0
+        self.set_theme(theme)
+
+    def set_theme(self, theme=None, ttl=None):
+        """
+        Sets or clears the theme override.
+
+        Args:
+            theme (str, optional): 'dark', 'light', or None/'auto' to detect the system theme.
+            ttl (float, optional): New time-to-live for detected themes. Defaults to None (keep the current one).
+        """
+        if theme is not None:
+            theme = theme.strip().lower()
+            if theme == 'auto':
+                theme = None
+            elif theme not in THEMES:
+                raise ValueError(f"theme must be one of {THEMES} or 'auto', not {theme!r}.")
+        with self._lock:
+            self._theme = theme
+            if ttl is not None:
+                self.ttl = ttl
+
+    def theme(self, refresh=False):
+        """
+        Returns 'dark' or 'light'.
+
+        Args:
+            refresh (bool, optional): Detect the system theme again even if a result is cached. Defaults to False.
+        """
+        if self._theme is not None:
+            return self._theme
+        environment = os.environ.get(THEME_ENV_VAR, '').strip().lower()
+        if environment in THEMES:
+            return environment
+
+        with self._lock:
+            expired = self.ttl is not None and time.monotonic() - self._detected_at > self.ttl
+            if refresh or expired or self._detected is None:
+                self._detected = 'dark' if detect_dark_mode() else 'light'
+                self._detected_at = time.monotonic()
+            return self._detected
+
+    def is_dark_mode(self, refresh=False):
+        return self.theme(refresh) == 'dark'
+
+    def clear(self):
+        """
+        Forgets the detected theme so the next call detects it again.
+        """
+        with self._lock:
+            self._detected = None
+
+
+_service = ThemeService()
+
+
+@instrumented()
+def set_theme(theme=None, ttl=None):
+    """
+    Overrides the theme used by every dialog in this process.
+
+    Args:
+        theme (str, optional): 'dark', 'light', or None/'auto' to go back to the
+            ``BYU_ACCOUNTING_THEME`` environment variable and system detection.
+        ttl (float, optional): Seconds to cache the detected system theme. Defaults to None (keep the current setting).
+
+    Example:
+        ```python
+        set_theme('dark')   # no detection, dark windows
+        set_theme('auto', ttl=300)   # detect, and check again every five minutes
+        ```
+    """
+    _service.set_theme(theme, ttl)
+
+
+def is_dark_mode(refresh: bool = False) -> bool:
+    """
+    Returns whether dialogs should use the dark theme.
+
+    Uses the override from :func:`set_theme` or ``BYU_ACCOUNTING_THEME`` if set; otherwise
+    detects the system theme on the first call and reuses the result.
+
+    Args:
+        refresh (bool, optional): Detect the system theme again. Defaults to False.
+
+    Returns:
+        bool: True if the OS is in dark mode, False if in light mode, or False by default if undetectable.
+    """
+    return _service.is_dark_mode(refresh)
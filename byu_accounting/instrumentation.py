@@ -0,0 +1,347 @@
+"""
+Timing and tracing for the package's public functions.
+
+Every exported function is wrapped with :func:`instrumented`. While instrumentation
+is off (the default) the wrapper only checks a flag and calls the function. Turn it
+on with :func:`enable` or the ``BYU_ACCOUNTING_INSTRUMENT=1`` environment variable to
+record, per function, call and error counts, retries, bytes processed and a latency
+histogram, readable with :func:`stats` (``byu_accounting.stats()``).
+
+Each finished call is logged at DEBUG level on the ``byu_accounting.instrumentation``
+logger (failures at INFO). Pass an OpenTelemetry tracer, or any object with the same
+``start_as_current_span`` method, to :func:`enable` to also export every call as a span.
+
+Example:
+    ```python
+    import byu_accounting
+    from byu_accounting import instrumentation
+
+    instrumentation.enable()
+    df = byu_accounting.get_pdfs('forms/')
+    print(byu_accounting.stats()['get_pdfs'])
+    ```
+"""
+import bisect
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+INSTRUMENT_ENV_VAR = 'BYU_ACCOUNTING_INSTRUMENT'
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is unbounded.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_enabled = os.environ.get(INSTRUMENT_ENV_VAR, '').strip().lower() in ('1', 'true', 'yes', 'on')
+_tracer = None
+_lock = threading.Lock()
+_metrics = {}
+_current = contextvars.ContextVar('byu_accounting_span', default=None)
+
+
+# ----- Configuration -----
+
+def enable(tracer=None):
+    """
+    Starts recording calls.
+
+    Args:
+        tracer (optional): An OpenTelemetry tracer (``opentelemetry.trace.get_tracer(...)``) or another
+            object whose ``start_as_current_span(name, attributes=...)`` returns a context manager
+            yielding a span with ``set_attribute``. Defaults to None (statistics and logging only).
+    """
+    global _enabled, _tracer
+    _tracer = tracer
+    _enabled = True
+
+
+def disable():
+    """
+    Stops recording calls. Statistics recorded so far are kept.
+    """
+    global _enabled, _tracer
+    _enabled = False
+    _tracer = None
+
+
+def is_enabled():
+    return _enabled
+
+
+# ----- Metrics -----
+
+class _Metric:
+    __slots__ = ('calls', 'errors', 'retries', 'bytes', 'total', 'minimum', 'maximum', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, elapsed, failed, retries, nbytes):
+        self.calls += 1
+        self.errors += failed
+        self.retries += retries
+        self.bytes += nbytes
+        self.total += elapsed
+        self.minimum = elapsed if self.minimum is None else min(self.minimum, elapsed)
+        self.maximum = max(self.maximum, elapsed)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    def quantile(self, q):
+        """
+        Estimates a latency quantile by interpolating within the histogram bucket that holds it.
+        """
+        if not self.calls:
+            return 0.0
+        rank = q * self.calls
+        seen = 0
+        lower_bound = 0.0
+        for upper_bound, count in zip(LATENCY_BUCKETS + (self.maximum,), self.buckets):
+            if count and seen + count >= rank:
+                estimate = lower_bound + (upper_bound - lower_bound) * (rank - seen) / count
+                return min(max(estimate, self.minimum), self.maximum)
+            seen += count
+            lower_bound = upper_bound
+        return self.maximum
+
+    def snapshot(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'bytes': self.bytes,
+            'total_seconds': self.total,
+            'mean_seconds': self.total / self.calls if self.calls else 0.0,
+            'min_seconds': self.minimum or 0.0,
+            'max_seconds': self.maximum,
+            'p50_seconds': self.quantile(0.5),
+            'p95_seconds': self.quantile(0.95),
+            'histogram': dict(zip(LATENCY_BUCKETS + (float('inf'),), self.buckets)),
+        }
+
+def stats(reset=False):
+    """
+    Returns what has been recorded since instrumentation was enabled (or last reset).
+
+    Args:
+        reset (bool, optional): Clear the statistics after reading them. Defaults to False.
+
+    Returns:
+        dict: Function name -> dict with 'calls', 'errors', 'retries', 'bytes', 'total_seconds',
+        'mean_seconds', 'min_seconds', 'max_seconds', estimated 'p50_seconds' and 'p95_seconds',
+        and 'histogram' (bucket upper bound in seconds -> calls).
+    """
+    with _lock:
+        snapshot = {name: metric.snapshot() for name, metric in sorted(_metrics.items())}
+        if reset:
+            _metrics.clear()
+    return snapshot
+
+
+def reset_stats():
+    """
+    Clears the recorded statistics.
+    """
+    with _lock:
+        _metrics.clear()
+
+
+# ----- Spans -----
+
+class Span:
+    """
+    One timed call, created by :func:`span` or :func:`instrumented`.
+
+    Attributes:
+        name (str): The operation name, e.g. 'get_pdf'.
+        attributes (dict): Extra attributes passed to the tracer.
+        retries (int): Retries recorded with :func:`record_retry`.
+        bytes (int): Bytes recorded with :func:`record_bytes`.
+        failed (bool): True if the call raised or :func:`record_failure` was called.
+        error (Exception or str): The error passed to :func:`record_failure`, if any.
+    """
+    __slots__ = ('name', 'attributes', 'retries', 'bytes', 'failed', 'error', '_start', '_token', '_otel_context',
+                 '_otel_span')
+
+    def __init__(self, name, attributes=None):
+        self.name = name
+        self.attributes = attributes or {}
+        self.retries = 0
+        self.bytes = 0
+        self.failed = False
+        self.error = None
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        self._otel_context = self._otel_span = None
+        if _tracer is not None:
+            self._otel_context = _tracer.start_as_current_span(self.name, attributes=self.attributes)
+            self._otel_span = self._otel_context.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        _current.reset(self._token)
+        failed = self.failed or exc_type is not None
+        with _lock:
+            metric = _metrics.get(self.name)
+            if metric is None:
+                metric = _metrics[self.name] = _Metric()
+            metric.add(elapsed, failed, self.retries, self.bytes)
+
+        if self._otel_context is not None:
+            self._otel_span.set_attribute('byu_accounting.retries', self.retries)
+            self._otel_span.set_attribute('byu_accounting.bytes', self.bytes)
+            self._otel_span.set_attribute('byu_accounting.failed', failed)
+            if exc_type is None and self.failed:
+                # Raised exceptions are recorded by the tracer itself; reported failures are not
+                _mark_error(self._otel_span, self.error)
+            self._otel_context.__exit__(exc_type, exc, tb)
+
+        if failed:
+            error = exc if exc is not None else self.error if self.error is not None else 'reported failure'
+            logger.info('%s failed after %.3fs (retries=%d, bytes=%d): %s', self.name, elapsed, self.retries,
+                        self.bytes, error)
+        else:
+            logger.debug('%s took %.3fs (retries=%d, bytes=%d)', self.name, elapsed, self.retries, self.bytes)
+        return False
+
+
+def _mark_error(otel_span, error):
+    """
+    Records a failure reported with :func:`record_failure` on a tracer span.
+    """
+    description = None if error is None else str(error)
+    if description:
+        otel_span.set_attribute('byu_accounting.error', description)
+    if isinstance(error, BaseException) and hasattr(otel_span, 'record_exception'):
+        otel_span.record_exception(error)
+    if hasattr(otel_span, 'set_status'):
+        try:
+            from opentelemetry.trace import Status, StatusCode
+        except ImportError:
+            return
+        otel_span.set_status(Status(StatusCode.ERROR, description))
+
+
+class _NullSpan:
+    """
+    Stands in for :class:`Span` while instrumentation is off.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, **attributes):
+    """
+    Times a block of code as one call of ``name``.
+
+    Args:
+        name (str): The name the call is recorded under in :func:`stats`.
+        **attributes: Extra attributes passed to the tracer.
+
+    Returns:
+        A context manager; it does nothing while instrumentation is off.
+
+    Example:
+        ```python
+        with instrumentation.span('load_ledger'):
+            ledger = pd.read_parquet('ledger.parquet')
+        ```
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, attributes)
+
+
+def instrumented(name=None):
+    """
+    Decorator that records every call of a function as a :func:`span`.
+
+    Args:
+        name (str, optional): The name calls are recorded under. Defaults to the function's qualified name.
+    """
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def current_span():
+    """
+    Returns the innermost active :class:`Span`, or None.
+    """
+    return _current.get() if _enabled else None
+
+
+def record_retry(count=1):
+    """
+    Adds retries (re-polls, re-sent requests) to the current call.
+    """
+    if _enabled:
+        active = _current.get()
+        if active is not None:
+            active.retries += count
+
+
+def record_bytes(nbytes):
+    """
+    Adds bytes processed to the current call.
+
+    Args:
+        nbytes (int or callable): The byte count, or a function returning it (or None), which is
+            only called while a call is being recorded.
+    """
+    if _enabled:
+        active = _current.get()
+        if active is not None:
+            if callable(nbytes):
+                nbytes = nbytes()
+            active.bytes += nbytes or 0
+
+
+def record_failure(error=None):
+    """
+    Marks the current call as failed without raising, for functions that report failure by return value.
+
+    The failure is counted in :func:`stats`, logged, and recorded on the tracer span as an error
+    (status, ``byu_accounting.error`` attribute and, for exceptions, an exception event).
+
+    Args:
+        error (Exception or str, optional): What went wrong. Defaults to None.
+    """
+    if _enabled:
+        active = _current.get()
+        if active is not None:
+            active.failed = True
+            if error is not None:
+                active.error = error
+
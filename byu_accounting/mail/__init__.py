@@ -0,0 +1,3 @@
+"""Email message helpers."""
+from .attachments import add_attachment
+from .bulk import BulkMailer, MailReport, SendResult
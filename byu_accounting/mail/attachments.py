@@ -0,0 +1,64 @@
+import functools
+import mimetypes
+import os
+import pathlib
+
+from .._io import as_buffer, is_path, source_name
+from ..instrumentation import instrumented, record_bytes
+
+
+@functools.lru_cache(maxsize=256)
+def _mime_type(suffixes):
+    """
+    Returns ``(maintype, subtype)`` for a file's suffixes (e.g. '.pdf' or '.tar.gz').
+
+    Cached because bulk runs attach the same kinds of file over and over.
+    """
+    mime_type, _ = mimetypes.guess_type('file' + suffixes)
+    # Fallback for unknown types
+    if mime_type is None:
+        return 'application', 'octet-stream'
+    maintype, subtype = mime_type.split('/')
+    return maintype, subtype
+
+
+# Add attachment to a GMAIL email
+
+@instrumented()
+def add_attachment(path_to_file, message, filename=None):
+    """
+    Adds an attachment to an email message.
+
+    The attachment can be a file on disk or data already in memory, such as a PDF
+    written by ``create_pdf`` into a ``BytesIO``. In-memory data is attached without
+    being written to disk; bytes, memoryviews and ``BytesIO`` buffers are not copied.
+
+    Args:
+        path_to_file (str, bytes or file object): The path to the file to attach, its contents
+            (bytes, bytearray, memoryview) or a readable binary file object.
+        message (email.message.EmailMessage): The email message object.
+        filename (str, optional): The attachment's file name. Defaults to the base name of the path
+            or the file object's ``name``.
+
+    Raises:
+        ValueError: If in-memory data is attached without a file name.
+
+    Returns:
+        email.message.EmailMessage: The updated email message object with the attachment.
+    """
+
+    # Extract filename cross-platform
+    filename = filename or source_name(path_to_file)
+    if filename is None:
+        raise ValueError('A filename is required when attaching in-memory data.')
+
+    mime_type, mime_subtype = _mime_type(''.join(pathlib.PurePath(filename).suffixes).lower())
+
+    if is_path(path_to_file):
+        with open(path_to_file, 'rb') as file:
+            data = file.read()
+    else:
+        data = as_buffer(path_to_file)
+    record_bytes(len(data))
+    message.add_attachment(data, maintype=mime_type, subtype=mime_subtype, filename=filename)
+    return message
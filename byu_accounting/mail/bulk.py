@@ -0,0 +1,385 @@
+import contextvars
+import logging
+import os
+import smtplib
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Any, Dict, List, Optional
+
+from ..instrumentation import instrumented, record_retry
+from .attachments import add_attachment
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SendResult:
+    """
+    Outcome of sending one message with a :class:`BulkMailer`.
+
+    Attributes:
+        name: The message name (the key or position it was submitted with).
+        error (Exception): The last error if the message was not sent.
+        refused (dict): Recipients the server refused while accepting the others, as returned by ``smtplib``.
+        attempts (int): Delivery attempts made.
+        elapsed (float): Wall time spent on the message, including retries, in seconds.
+        maybe_sent (bool): The connection failed after the message data was sent, so the server may
+            have delivered it. Check before sending it again.
+    """
+    name: Any
+    error: Optional[BaseException] = None
+    refused: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    elapsed: float = 0.0
+    maybe_sent: bool = False
+
+    @property
+    def success(self):
+        return self.error is None
+
+
+@dataclass
+class MailReport:
+    """
+    Results and throughput for one :meth:`BulkMailer.send` call.
+
+    Attributes:
+        results (list): One :class:`SendResult` per message, in submission order.
+        elapsed (float): Wall time for the whole run, in seconds.
+        connections_opened (int): SMTP connections opened during the run.
+    """
+    results: List[SendResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    connections_opened: int = 0
+
+    @property
+    def sent(self):
+        return [r for r in self.results if r.success]
+
+    @property
+    def failed(self):
+        return [r for r in self.results if not r.success]
+
+    @property
+    def messages_per_second(self):
+        return len(self.sent) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (f'{len(self.sent)} sent, {len(self.failed)} failed in {self.elapsed:.1f}s '
+                f'({self.messages_per_second:.2f} msgs/s, {self.connections_opened} connections opened)')
+
+
+class _RateLimiter:
+    """
+    Spaces calls at least ``1 / rate`` seconds apart across all threads.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def is_transient(error):
+    """
+    Returns True if an SMTP error is worth retrying: dropped connections, timeouts and 4xx replies.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    # SMTPServerDisconnected, refused connections and timeouts are all OSErrors
+    return isinstance(error, OSError)
+
+
+class _DataTracking:
+    """
+    Notes when the DATA command is sent; after that, a failed delivery may still have been accepted.
+    """
+    data_started = False
+
+    def data(self, msg):
+        self.data_started = True
+        return super().data(msg)
+
+
+class _SMTP(_DataTracking, smtplib.SMTP):
+    pass
+
+
+class _SMTP_SSL(_DataTracking, smtplib.SMTP_SSL):
+    pass
+
+
+class BulkMailer:
+    """
+    Builds and sends many emails over a small pool of persistent SMTP connections.
+
+    Each worker thread keeps its own connection open from message to message, so a run
+    of thousands of statements logs in ``connections`` times instead of once per email.
+    Dropped connections, timeouts and 4xx replies are retried with exponential backoff on
+    a fresh connection; 5xx replies fail the message without stopping the others. A
+    message is not retried once its data has been sent without a reply, since the server
+    may have accepted it: it fails with ``maybe_sent`` set instead of risking a duplicate.
+    A rejected login stops the run, failing the remaining messages with the same error.
+    Attachment files are read once and shared by every message that attaches them.
+
+    Args:
+        host (str): The SMTP server, e.g. 'smtp.gmail.com'.
+        port (int, optional): The SMTP port. Defaults to 587.
+        username (str, optional): Login user. Defaults to None (no login).
+        password (str, optional): Login password, e.g. a Gmail app password. Defaults to None.
+        sender (str, optional): Default From address. Defaults to ``username``.
+        starttls (bool, optional): Upgrade the connection with STARTTLS. Defaults to True.
+        use_ssl (bool, optional): Connect with implicit TLS (port 465) instead. Defaults to False.
+        connections (int, optional): Number of SMTP connections (and worker threads). Defaults to 2.
+        rate_limit (float, optional): Most messages sent per second across all connections. Defaults to None (no limit).
+        max_retries (int, optional): Retries per message for transient errors. Defaults to 3.
+        retry_delay (float, optional): Seconds before the first retry; doubles after each one. Defaults to 1.
+        max_messages_per_connection (int, optional): Reconnect after this many messages. Defaults to None (never).
+        timeout (float, optional): Socket timeout in seconds. Defaults to 30.
+
+    Example:
+        ```python
+        with BulkMailer('smtp.gmail.com', username=user, password=app_password, rate_limit=5) as mailer:
+            messages = {
+                row.email: mailer.build_message(row.email, 'Your statement', body, attachments=[row.pdf_path])
+                for row in statements.itertuples()
+            }
+            report = mailer.send(messages)
+        print(report.summary())
+        ```
+    """
+
+    def __init__(self, host, port=587, username=None, password=None, sender=None, starttls=True, use_ssl=False,
+                 connections=2, rate_limit=None, max_retries=3, retry_delay=1.0, max_messages_per_connection=None,
+                 timeout=30):
+        if connections < 1:
+            raise ValueError('connections must be at least 1.')
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender or username
+        self.starttls = starttls
+        self.use_ssl = use_ssl
+        self.connections = connections
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+        self._rate_limiter = _RateLimiter(rate_limit) if rate_limit else None
+        self._executor = ThreadPoolExecutor(max_workers=connections, thread_name_prefix='byu-smtp')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._smtps = set()
+        self._connections_opened = 0
+        self._attachments = {}
+        self._login_error = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ----- Building messages -----
+
+    def _attachment_data(self, path):
+        key = os.fspath(path)
+        stat = os.stat(key)
+        with self._lock:
+            cached = self._attachments.get(key)
+        if cached is not None and cached[0] == (stat.st_size, stat.st_mtime_ns):
+            return cached[1]
+        with open(key, 'rb') as f:
+            data = f.read()
+        with self._lock:
+            self._attachments[key] = ((stat.st_size, stat.st_mtime_ns), data)
+        return data
+
+    def build_message(self, to, subject, body, attachments=(), sender=None, html=None, cc=None, reply_to=None):
+        """
+        Builds an email, attaching files or in-memory data with :func:`~byu_accounting.mail.add_attachment`.
+
+        Args:
+            to (str or list): Recipient address(es).
+            subject (str): The subject line.
+            body (str): The plain-text body.
+            attachments (iterable, optional): Paths, or ``(filename, data)`` pairs for in-memory files
+                such as PDFs written to a ``BytesIO``. Files are read once per mailer. Defaults to ().
+            sender (str, optional): The From address. Defaults to the mailer's ``sender``.
+            html (str, optional): An HTML alternative to ``body``. Defaults to None.
+            cc (str or list, optional): Cc address(es). Defaults to None.
+            reply_to (str, optional): The Reply-To address. Defaults to None.
+
+        Returns:
+            email.message.EmailMessage: The message, ready for :meth:`send`.
+        """
+        message = EmailMessage()
+        message['From'] = sender or self.sender
+        message['To'] = to if isinstance(to, str) else ', '.join(to)
+        if cc:
+            message['Cc'] = cc if isinstance(cc, str) else ', '.join(cc)
+        if reply_to:
+            message['Reply-To'] = reply_to
+        message['Subject'] = subject
+        message.set_content(body)
+        if html is not None:
+            message.add_alternative(html, subtype='html')
+        for attachment in attachments:
+            if isinstance(attachment, tuple):
+                filename, data = attachment
+                add_attachment(data, message, filename=filename)
+            else:
+                add_attachment(self._attachment_data(attachment), message, filename=os.path.basename(attachment))
+        return message
+
+    # ----- Connections -----
+
+    def connect(self):
+        """
+        Opens and logs in a new SMTP connection.
+
+        Returns:
+            smtplib.SMTP: The connection.
+        """
+        if self.use_ssl:
+            smtp = _SMTP_SSL(self.host, self.port, timeout=self.timeout, context=ssl.create_default_context())
+        else:
+            smtp = _SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+        if self.username:
+            smtp.login(self.username, self.password)
+        return smtp
+
+    def _acquire(self):
+        smtp = getattr(self._local, 'smtp', None)
+        if smtp is None:
+            smtp = self.connect()
+            self._local.smtp = smtp
+            self._local.messages = 0
+            with self._lock:
+                self._smtps.add(smtp)
+                self._connections_opened += 1
+        return smtp
+
+    def _discard(self, smtp, polite=True):
+        self._local.smtp = None
+        with self._lock:
+            self._smtps.discard(smtp)
+        try:
+            smtp.quit() if polite else smtp.close()
+        except Exception:
+            smtp.close()
+
+    # ----- Sending -----
+
+    def _send_one(self, name, message):
+        start_time = time.perf_counter()
+        result = SendResult(name)
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            if self._login_error is not None:
+                # Every connection would be rejected the same way; do not log in once per message.
+                result.error = self._login_error
+                break
+            if self._rate_limiter is not None:
+                self._rate_limiter.wait()
+            result.attempts += 1
+            smtp = None
+            try:
+                smtp = self._acquire()
+                if isinstance(smtp, _DataTracking):
+                    smtp.data_started = False
+                result.refused = smtp.send_message(message)
+                result.error = None
+            except Exception as e:
+                result.error = e
+                if smtp is not None:
+                    self._discard(smtp, polite=False)
+                if isinstance(e, smtplib.SMTPAuthenticationError):
+                    if self._login_error is None:
+                        self._login_error = e
+                        logger.error('SMTP login failed; not sending the remaining messages: %s', e)
+                    break
+                if (smtp is not None and not isinstance(e, smtplib.SMTPResponseException)
+                        and getattr(smtp, 'data_started', True)):
+                    # The message was sent but its reply was lost: resending could deliver it twice.
+                    result.maybe_sent = True
+                    logger.warning('sending %r failed after its data was sent; it may have been delivered: %s',
+                                   name, e)
+                    break
+                if attempt < self.max_retries and is_transient(e):
+                    logger.info('sending %r failed (%s); retrying in %.1fs', name, e, delay)
+                    time.sleep(delay)
+                    delay = min(delay * 2, 30.0)
+                    continue
+                logger.warning('sending %r failed: %s', name, e)
+                break
+
+            self._local.messages += 1
+            if self.max_messages_per_connection is not None and self._local.messages >= self.max_messages_per_connection:
+                self._discard(smtp)
+            break
+        result.elapsed = time.perf_counter() - start_time
+        return result
+
+    @instrumented()
+    def send(self, messages):
+        """
+        Sends messages concurrently over the connection pool and waits for all of them.
+
+        A failed message does not raise; see each result's ``error``. If the server rejects the
+        login, the messages not yet sent fail with that error without further login attempts.
+
+        Args:
+            messages (dict or iterable): ``EmailMessage`` objects. Pass a dict to name each message
+                (e.g. by recipient); otherwise messages are named by position.
+
+        Returns:
+            MailReport: The per-message results and throughput.
+        """
+        named_messages = messages.items() if hasattr(messages, 'items') else enumerate(messages)
+        self._login_error = None
+        with self._lock:
+            opened_before = self._connections_opened
+        start_time = time.perf_counter()
+
+        # Each message is sent in a copy of the caller's context, so it is traced under the caller's span
+        futures = [self._executor.submit(contextvars.copy_context().run, self._send_one, name, message)
+                   for name, message in named_messages]
+        report = MailReport(results=[future.result() for future in futures])
+
+        report.elapsed = time.perf_counter() - start_time
+        record_retry(sum(max(result.attempts - 1, 0) for result in report.results))
+        with self._lock:
+            report.connections_opened = self._connections_opened - opened_before
+        logger.info('bulk mail run: %s', report.summary())
+        return report
+
+    def close(self):
+        """
+        Waits for messages being sent, then closes every connection.
+        """
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            smtps, self._smtps = self._smtps, set()
+        for smtp in smtps:
+            try:
+                smtp.quit()
+            except Exception:
+                smtp.close()
@@ -0,0 +1,4 @@
+"""Winsorizing and truncating extreme values."""
+from .clipping import winsorize, truncate, winsorize_frame, truncate_frame
+from .streaming import chunked_thresholds, winsorize_chunked, truncate_chunked
+from .fitted import Winsorizer
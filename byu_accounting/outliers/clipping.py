@@ -0,0 +1,130 @@
+import numpy as np
+
+from ..instrumentation import instrumented, record_bytes
+from .groups import percentiles
+
+
+def _prepare(data, out):
+    """
+    Returns the data as a float array (copied only if it is not one already), its NaN mask
+    and the output array.
+    """
+    data = np.asarray(data, dtype=float)
+    record_bytes(data.nbytes)
+    if out is None:
+        out = np.empty_like(data)
+    elif out.shape != data.shape or out.dtype.kind != 'f':
+        raise ValueError(f'out must be a float array of shape {data.shape}.')
+    return data, np.isnan(data), out
+
+
+def _thresholds(data, nan_mask, lower_percentile, upper_percentile):
+    """
+    Both thresholds from one partition of the non-NaN values, or None if every value is NaN.
+    """
+    if nan_mask.all():
+        return None
+    # Boolean indexing already copies, so the copy can be partitioned in place.
+    valid = data[~nan_mask] if nan_mask.any() else data.ravel().copy()
+    return percentiles(valid, (lower_percentile, upper_percentile), overwrite_input=True)
+
+
+@instrumented()
+def winsorize(data, lower_percentile, upper_percentile, out=None):
+    """
+    Winsorize a numeric array or list by handling extreme values.
+    Missing values (NaN) are ignored in percentile calculations and preserved in output.
+
+    The result is always a float ndarray; pandas objects are converted like any other
+    array, with one pair of thresholds over all their values. Use :func:`winsorize_frame`
+    to winsorize DataFrame columns separately or within groups and keep the index.
+
+    For arrays, ``out`` is a float array to write the result to; pass the input array
+    itself to winsorize in place without a full-size copy.
+    """
+    data, nan_mask, out = _prepare(data, out)
+    thresholds = _thresholds(data, nan_mask, lower_percentile, upper_percentile)
+
+    # Handle case where all values are NaN
+    if thresholds is None:
+        out[...] = data
+        return out
+
+    # Clip to the thresholds; NaNs stay NaN
+    return np.clip(data, thresholds[0], thresholds[1], out=out)
+
+
+@instrumented()
+def truncate(data, lower_percentile, upper_percentile, out=None):
+    """
+    Truncate a numeric array or list by handling extreme values.
+    Missing values (NaN) are ignored in percentile calculations and preserved in output.
+
+    The result is always a float ndarray; pandas objects are converted like any other
+    array, with one pair of thresholds over all their values. Use :func:`truncate_frame`
+    to truncate DataFrame columns separately or within groups and keep the index.
+
+    For arrays, ``out`` is a float array to write the result to; pass the input array
+    itself to truncate in place without a full-size copy.
+    """
+    data, nan_mask, out = _prepare(data, out)
+    thresholds = _thresholds(data, nan_mask, lower_percentile, upper_percentile)
+    if out is not data:
+        out[...] = data
+
+    # Handle case where all values are NaN
+    if thresholds is None:
+        return out
+
+    # Replace outliers with NaN, keep existing NaNs as is (the NaN mask is reused as scratch space)
+    outliers = np.less(data, thresholds[0], out=nan_mask)
+    outliers |= data > thresholds[1]
+    out[outliers] = np.nan
+    return out
+
+
+@instrumented()
+def winsorize_frame(data, lower_percentile, upper_percentile, columns=None, by=None):
+    """
+    Winsorizes each column of a DataFrame (or a Series) separately, optionally within groups.
+
+    Thresholds are computed per column (and per group with ``by``) in one vectorized pass,
+    ignoring NaNs. Rows whose group key is missing are left unchanged.
+
+    Args:
+        data (pandas.DataFrame or pandas.Series): The data.
+        lower_percentile (float): Lower percentile as a fraction, e.g. 0.01.
+        upper_percentile (float): Upper percentile as a fraction, e.g. 0.99.
+        columns (list, optional): Columns to winsorize; they are converted to float whatever their dtype.
+            Defaults to every numeric (non-boolean) column not used in ``by``.
+        by (optional): Group keys, as accepted by ``DataFrame.groupby``, e.g. ['fiscal_year', 'industry'].
+            Defaults to None (one group).
+
+    Returns:
+        pandas.DataFrame or pandas.Series: A copy with the same index; winsorized columns are float.
+    """
+    from .frame import clip_pandas
+    return clip_pandas(data, lower_percentile, upper_percentile, 'winsorize', columns=columns, by=by)
+
+
+@instrumented()
+def truncate_frame(data, lower_percentile, upper_percentile, columns=None, by=None):
+    """
+    Truncates each column of a DataFrame (or a Series) separately, optionally within groups.
+
+    Values outside their column's (and group's) thresholds become NaN. Rows whose group key
+    is missing are left unchanged.
+
+    Args:
+        data (pandas.DataFrame or pandas.Series): The data.
+        lower_percentile (float): Lower percentile as a fraction, e.g. 0.01.
+        upper_percentile (float): Upper percentile as a fraction, e.g. 0.99.
+        columns (list, optional): Columns to truncate; they are converted to float whatever their dtype.
+            Defaults to every numeric (non-boolean) column not used in ``by``.
+        by (optional): Group keys, as accepted by ``DataFrame.groupby``. Defaults to None (one group).
+
+    Returns:
+        pandas.DataFrame or pandas.Series: A copy with the same index; truncated columns are float.
+    """
+    from .frame import clip_pandas
+    return clip_pandas(data, lower_percentile, upper_percentile, 'truncate', columns=columns, by=by)
@@ -0,0 +1,232 @@
+import json
+
+import numpy as np
+
+from .groups import GroupOrder, group_percentiles
+
+MODES = ('winsorize', 'truncate')
+
+
+class Winsorizer:
+    """
+    Percentile thresholds fitted once and applied to any number of later batches.
+
+    ``fit`` computes the lower and upper threshold of every column (and every group, with
+    ``by``) and stores them in one ``(n_groups, n_columns, 2)`` array. ``transform`` then
+    only looks up each row's group and clips, so a daily batch costs one vectorized clip
+    instead of a percentile scan. Fitted winsorizers can be saved to JSON and loaded back.
+
+    Args:
+        lower_percentile (float): Lower percentile as a fraction, e.g. 0.01.
+        upper_percentile (float): Upper percentile as a fraction, e.g. 0.99.
+        columns (list, optional): DataFrame columns to fit. Defaults to every numeric column not in ``by``.
+        by (str or list, optional): Group key column(s), e.g. ['fiscal_year', 'industry']. Defaults to None.
+        mode (str, optional): 'winsorize' (clip to the thresholds) or 'truncate' (set values outside
+            them to NaN). Defaults to 'winsorize'.
+
+    Attributes:
+        columns_ (list): The fitted columns (None for a 1-D array, positions for a 2-D array).
+        groups_ (pandas.Index or None): The group keys seen by ``fit``, in threshold order.
+        thresholds_ (numpy.ndarray): Shape ``(n_groups, n_columns, 2)``; NaN where a group had no values.
+
+    Example:
+        ```python
+        winsorizer = Winsorizer(0.01, 0.99, columns=['amount'], by='industry').fit(training_df)
+        winsorizer.save('cutoffs.json')
+        daily = Winsorizer.load('cutoffs.json').transform(daily_df)
+        ```
+    """
+
+    def __init__(self, lower_percentile, upper_percentile, columns=None, by=None, mode='winsorize'):
+        if mode not in MODES:
+            raise ValueError(f'mode must be one of {MODES}.')
+        self.lower_percentile = lower_percentile
+        self.upper_percentile = upper_percentile
+        self.columns = columns
+        self.by = by
+        self.mode = mode
+        self.columns_ = None
+        self.groups_ = None
+        self.thresholds_ = None
+
+    def __repr__(self):
+        fitted = '' if self.thresholds_ is None else f', fitted on {len(self.columns_)} columns'
+        return (f'Winsorizer({self.lower_percentile}, {self.upper_percentile}, by={self.by!r}, '
+                f'mode={self.mode!r}{fitted})')
+
+    @property
+    def _keys(self):
+        return self.by if isinstance(self.by, list) else [self.by]
+
+    # ----- Fitting -----
+
+    def fit(self, data):
+        """
+        Computes and stores the thresholds.
+
+        Args:
+            data (pandas.DataFrame, pandas.Series or numpy.ndarray): The reference data. Arrays may be
+                1-D, or 2-D with one set of thresholds per column.
+
+        Returns:
+            Winsorizer: ``self``.
+        """
+        quantiles = (self.lower_percentile, self.upper_percentile)
+        columns, matrix = self._columns_and_values(data, fitting=True)
+
+        if self.by is None:
+            self.groups_ = None
+            codes, n_groups = np.zeros(matrix.shape[0], dtype=np.intp), 1
+        else:
+            codes, self.groups_ = self._fit_groups(data)
+            n_groups = len(self.groups_)
+
+        groups = GroupOrder(codes, n_groups)
+        self.columns_ = columns
+        self.thresholds_ = np.empty((n_groups, len(columns), 2))
+        for j in range(len(columns)):
+            self.thresholds_[:, j, :] = group_percentiles(matrix[:, j], groups, quantiles)
+        return self
+
+    def _fit_groups(self, data):
+        import pandas as pd
+
+        keys = data[self._keys]
+        codes = data.groupby(self._keys, sort=False).ngroup().to_numpy()
+        if codes.dtype.kind == 'f':
+            codes = np.where(np.isnan(codes), -1, codes).astype(np.intp)
+        _, first_rows = np.unique(codes, return_index=True)
+        if codes.size and codes[first_rows[0]] < 0:
+            first_rows = first_rows[1:]
+        first = keys.iloc[first_rows]
+        if len(self._keys) == 1:
+            groups = pd.Index(first.iloc[:, 0].to_numpy(), name=self._keys[0])
+        else:
+            groups = pd.MultiIndex.from_frame(first)
+        return codes, groups
+
+    # ----- Applying -----
+
+    def transform(self, data):
+        """
+        Applies the fitted thresholds to new data.
+
+        Rows whose group was not seen by ``fit``, or whose group key is missing, are left unchanged.
+
+        Args:
+            data (pandas.DataFrame, pandas.Series or numpy.ndarray): Data shaped like the data passed to ``fit``.
+
+        Returns:
+            The same type as ``data`` (pandas objects keep their index); processed values are float.
+        """
+        from .frame import apply_thresholds
+
+        if self.thresholds_ is None:
+            raise ValueError('This Winsorizer has not been fitted yet; call fit first.')
+        codes = None if self.groups_ is None else self.group_codes(data)
+        _, matrix = self._columns_and_values(data, fitting=False)
+
+        processed = [apply_thresholds(matrix[:, j], self.thresholds_[:, j, :], codes, self.mode)
+                     for j in range(len(self.columns_))]
+
+        if isinstance(data, np.ndarray) or not hasattr(data, 'index'):
+            result = np.column_stack(processed) if processed else matrix.copy()
+            return result[:, 0] if self.columns_ == [None] else result
+        if hasattr(data, 'columns'):
+            result = data.copy()
+            for column, values in zip(self.columns_, processed):
+                result[column] = values
+            return result
+        return data._constructor(processed[0], index=data.index, name=data.name)
+
+    def fit_transform(self, data):
+        """
+        Fits the thresholds on ``data`` and applies them to it.
+        """
+        return self.fit(data).transform(data)
+
+    def group_codes(self, data):
+        """
+        Returns the position in ``groups_`` of each row's group, or -1 for unseen or missing groups.
+        """
+        import pandas as pd
+
+        keys = data[self._keys]
+        if len(self._keys) == 1:
+            return self.groups_.get_indexer(keys.iloc[:, 0])
+        return self.groups_.get_indexer(pd.MultiIndex.from_frame(keys))
+
+    def _columns_and_values(self, data, fitting):
+        """
+        Returns the column labels and an ``(n_rows, n_columns)`` float matrix of the values to process.
+        """
+        if hasattr(data, 'columns'):
+            from .frame import select_columns
+
+            columns = select_columns(data, self.columns, self.by) if fitting else self.columns_
+            matrix = np.column_stack([data[column].to_numpy(dtype=float, na_value=np.nan) for column in columns]) \
+                if columns else np.empty((len(data), 0))
+            return columns, matrix
+        if hasattr(data, 'index'):
+            return [data.name], data.to_numpy(dtype=float, na_value=np.nan)[:, None]
+        if self.by is not None:
+            raise ValueError('by= needs a DataFrame with the group key columns.')
+        values = np.asarray(data, dtype=float)
+        if values.ndim == 1:
+            return [None], values[:, None]
+        return list(range(values.shape[1])), values
+
+    # ----- Serialization -----
+
+    def to_dict(self):
+        """
+        Returns the settings and fitted thresholds as plain Python values (JSON-compatible for
+        string and number column names and group keys).
+        """
+        return {
+            'lower_percentile': self.lower_percentile,
+            'upper_percentile': self.upper_percentile,
+            'columns': self.columns,
+            'by': self.by,
+            'mode': self.mode,
+            'columns_': self.columns_,
+            'groups_': None if self.groups_ is None else [
+                list(key) if isinstance(key, tuple) else key for key in self.groups_.tolist()
+            ],
+            'thresholds_': None if self.thresholds_ is None else self.thresholds_.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuilds a winsorizer from :meth:`to_dict` output.
+        """
+        winsorizer = cls(state['lower_percentile'], state['upper_percentile'], columns=state['columns'],
+                         by=state['by'], mode=state['mode'])
+        winsorizer.columns_ = state['columns_']
+        if state['thresholds_'] is not None:
+            winsorizer.thresholds_ = np.array(state['thresholds_'], dtype=float).reshape(-1, len(state['columns_']), 2)
+        if state['groups_'] is not None:
+            import pandas as pd
+
+            if len(winsorizer._keys) == 1:
+                winsorizer.groups_ = pd.Index(state['groups_'], name=winsorizer._keys[0])
+            else:
+                winsorizer.groups_ = pd.MultiIndex.from_tuples([tuple(key) for key in state['groups_']],
+                                                              names=winsorizer._keys)
+        return winsorizer
+
+    def save(self, path):
+        """
+        Writes the winsorizer to a JSON file.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a winsorizer written by :meth:`save`.
+        """
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from ..instrumentation import record_bytes
+from .groups import GroupOrder, group_codes, group_percentiles
+
+
+def numeric_columns(df):
+    return [column for column in df.columns if pd.api.types.is_numeric_dtype(df[column])
+            and not pd.api.types.is_bool_dtype(df[column])]
+
+
+def select_columns(data, columns, by):
+    """
+    Returns ``columns``, or by default every numeric column of ``data`` that is not a group key.
+    """
+    if columns is not None:
+        return list(columns)
+    keys = by if isinstance(by, list) else [by]
+    return [column for column in numeric_columns(data)
+            if not any(isinstance(key, str) and key == column for key in keys)]
+
+
+def apply_thresholds(values, thresholds, codes, mode):
+    """
+    Clips (or truncates) each value to its group's thresholds, leaving rows with code -1 unchanged.
+
+    Args:
+        values (numpy.ndarray): 1-D float values.
+        thresholds (numpy.ndarray): Shape ``(n_groups, 2)``: lower and upper threshold of each group.
+        codes (numpy.ndarray or None): Group of each value; None for a single group.
+        mode (str): 'winsorize' or 'truncate'.
+
+    Returns:
+        numpy.ndarray: A new array.
+    """
+    if codes is None:
+        lower, upper = thresholds[0]
+    else:
+        lower = thresholds[codes, 0]
+        upper = thresholds[codes, 1]
+    if mode == 'winsorize':
+        processed = np.clip(values, lower, upper)
+    else:
+        processed = np.where((values < lower) | (values > upper), np.nan, values)
+    if codes is not None:
+        ungrouped = codes < 0
+        if ungrouped.any():
+            processed[ungrouped] = values[ungrouped]
+    return processed
+
+
+def clip_pandas(data, lower_percentile, upper_percentile, mode, columns=None, by=None):
+    """
+    Winsorizes or truncates the columns of a DataFrame (or a Series), optionally within groups.
+
+    Rows are laid out by group once; each column's thresholds for every group then come
+    from one vectorized pass (:func:`~byu_accounting.outliers.groups.group_percentiles`).
+    Rows whose group key is missing are left unchanged.
+
+    Args:
+        data (pandas.DataFrame or pandas.Series): The data.
+        lower_percentile (float): Lower percentile as a fraction, e.g. 0.01.
+        upper_percentile (float): Upper percentile as a fraction, e.g. 0.99.
+        mode (str): 'winsorize' (clip to the thresholds) or 'truncate' (set values outside them to NaN).
+        columns (list, optional): Columns to process, converted to float whatever their dtype. Defaults to
+            every numeric (non-boolean) column not used in ``by``.
+        by (optional): Group keys, as accepted by ``DataFrame.groupby``. Defaults to None (one group).
+
+    Returns:
+        pandas.DataFrame or pandas.Series: A copy with the same index; processed columns are float.
+    """
+    if isinstance(data, pd.Series):
+        # A Series is always processed, whatever its dtype
+        frame = data.to_frame()
+        return clip_pandas(frame, lower_percentile, upper_percentile, mode, columns=frame.columns, by=by).iloc[:, 0]
+
+    if by is None:
+        codes, n_groups = np.zeros(len(data), dtype=np.intp), 1
+    else:
+        codes, n_groups = group_codes(data, by)
+    columns = select_columns(data, columns, by)
+
+    groups = GroupOrder(codes, n_groups)
+    result = data.copy()
+    for column in columns:
+        values = data[column].to_numpy(dtype=float, na_value=np.nan)
+        record_bytes(values.nbytes)
+        thresholds = group_percentiles(values, groups, (lower_percentile, upper_percentile))
+        result[column] = apply_thresholds(values, thresholds, None if by is None else codes, mode)
+    return result
@@ -0,0 +1,145 @@
+import numpy as np
+
+# Below this many values per group, sorting everything at once beats partitioning group by group.
+_MIN_PARTITION_GROUP_SIZE = 32
+
+
+def _lerp(a, b, t):
+    # Same formula as numpy's percentile interpolation, so results match np.nanpercentile.
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+def as_fractions(quantiles):
+    """
+    Returns quantile fractions as an array, round-tripped through percent like
+    ``np.nanpercentile(data, q * 100)`` so thresholds match it bit for bit.
+    """
+    return np.asarray(quantiles, dtype=float) * 100 / 100
+
+
+def percentiles(values, quantiles, overwrite_input=False):
+    """
+    Computes several percentiles of NaN-free values with a single ``np.partition`` call.
+
+    Args:
+        values (numpy.ndarray): 1-D float values without NaNs.
+        quantiles (sequence): Fractions between 0 and 1, e.g. ``(0.01, 0.99)``.
+        overwrite_input (bool, optional): Partition ``values`` itself instead of a copy. Defaults to False.
+
+    Returns:
+        numpy.ndarray: One value per quantile, interpolated like ``np.nanpercentile``.
+    """
+    quantiles = as_fractions(quantiles)
+    if not overwrite_input:
+        values = values.copy()
+    positions = (values.size - 1) * quantiles
+    below = np.floor(positions).astype(np.intp)
+    above = np.minimum(below + 1, values.size - 1)
+    values.partition(np.unique(np.concatenate((below, above))))
+    return _lerp(values[below], values[above], positions - below)
+
+
+class GroupOrder:
+    """
+    The rows of each group, laid out contiguously; computed once and shared by every column.
+
+    Args:
+        codes (numpy.ndarray): 1-D integer group of each row, from 0 to ``n_groups - 1``; -1 excludes the row.
+        n_groups (int): Number of groups.
+
+    Attributes:
+        order (numpy.ndarray or None): Row positions sorted by group (None when there is a single group
+            and no excluded rows).
+        starts (numpy.ndarray): Where each group begins in ``order``.
+        counts (numpy.ndarray): Rows in each group.
+    """
+
+    def __init__(self, codes, n_groups):
+        self.codes = codes
+        self.n_groups = n_groups
+        self.counts = np.bincount(codes[codes >= 0], minlength=n_groups)
+        excluded = codes.size - int(self.counts.sum())
+        self.starts = np.cumsum(self.counts) - self.counts + excluded
+        if n_groups == 1 and not excluded:
+            self.order = None
+        else:
+            # A stable sort on small integers is a radix sort; excluded rows (-1) come first.
+            self.order = np.argsort(codes, kind='stable')
+
+    def gather(self, values):
+        """
+        Returns ``values`` reordered group by group (always a new array).
+        """
+        return values.copy() if self.order is None else values[self.order]
+
+
+def group_percentiles(values, groups, quantiles):
+    """
+    Computes percentiles of ``values`` within every group without looping over the data per group.
+
+    Values are gathered group by group, then each group is partitioned just enough to read
+    off the requested order statistics (``np.partition``); when groups are tiny, one sort of
+    all values is used instead. Results use the same linear interpolation as ``np.nanpercentile``.
+
+    Args:
+        values (numpy.ndarray): 1-D float values. NaNs are ignored.
+        groups (GroupOrder): The group layout of the rows.
+        quantiles (sequence): Fractions between 0 and 1, e.g. ``(0.01, 0.99)``.
+
+    Returns:
+        numpy.ndarray: Shape ``(n_groups, len(quantiles))``; NaN for groups without values.
+    """
+    quantiles = as_fractions(quantiles)
+    n_groups = groups.n_groups
+    result = np.full((n_groups, quantiles.size), np.nan)
+
+    grouped = groups.gather(values)
+    nan_mask = np.isnan(values)
+    if nan_mask.any():
+        in_group = groups.codes >= 0
+        nan_counts = np.bincount(groups.codes[in_group], weights=nan_mask[in_group], minlength=n_groups)
+        counts = groups.counts - nan_counts.astype(np.intp)
+    else:
+        counts = groups.counts
+
+    nonempty = np.flatnonzero(counts > 0)
+    if nonempty.size == 0:
+        return result
+    positions = (counts[nonempty, None] - 1) * quantiles[None, :]
+    below = np.floor(positions).astype(np.intp)
+    above = np.minimum(below + 1, counts[nonempty, None] - 1)
+    starts = groups.starts[nonempty]
+
+    if nonempty.size * _MIN_PARTITION_GROUP_SIZE > grouped.size:
+        # Many small groups: sort by value within group in one go (NaNs sort last in each group).
+        codes = groups.codes if groups.order is None else groups.codes[groups.order]
+        grouped = grouped[np.lexsort((grouped, codes))]
+    else:
+        # NaNs partition to the end of each group, after every real value.
+        for i, group in enumerate(nonempty):
+            start = starts[i]
+            segment = grouped[start:start + groups.counts[group]]
+            segment.partition(np.unique(np.concatenate((below[i], above[i]))))
+
+    offsets = starts[:, None]
+    result[nonempty] = _lerp(grouped[offsets + below], grouped[offsets + above], positions - below)
+    return result
+
+
+def group_codes(data, by):
+    """
+    Numbers the groups of a pandas object.
+
+    Args:
+        data (pandas.DataFrame or pandas.Series): The data being grouped.
+        by: Anything ``data.groupby`` accepts: column name(s), a Series, an array or a list of them.
+
+    Returns:
+        tuple: An integer array with each row's group (-1 where a key is missing) and the number of groups.
+    """
+    codes = data.groupby(by, sort=False).ngroup().to_numpy()
+    if codes.dtype.kind == 'f':
+        codes = np.where(np.isnan(codes), -1, codes).astype(np.intp)
+    n_groups = int(codes.max()) + 1 if codes.size else 0
+    return codes, n_groups
@@ -0,0 +1,349 @@
+"""
+Winsorizing and truncating data that does not fit in memory.
+
+Thresholds are found exactly by reading the data a few times in chunks: one pass
+counts the values and finds their range, then each pass histograms the range that
+holds every wanted rank into ``bins`` bins and narrows it to one bin, until a bin is
+small enough (``max_buffer`` values) to be collected and sorted. Memory stays
+bounded by ``chunksize``, ``bins`` and ``max_buffer`` whatever the size of the input;
+typical data needs three passes. A final pass clips or truncates chunk by chunk.
+
+Sources can be NumPy arrays or memory maps, ``.npy`` files (memory-mapped), CSV files,
+Parquet files (requires pyarrow), or a function returning an iterable of DataFrames
+or arrays.
+"""
+import logging
+import os
+
+import numpy as np
+
+from ..instrumentation import instrumented, record_bytes
+from .groups import _lerp, as_fractions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+# ----- Reading chunks -----
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            'Reading and writing Parquet requires pyarrow. Install it with: pip install "byu_accounting[parquet]"'
+        ) from e
+    return pyarrow
+
+
+def _open_source(source):
+    """
+    Resolves ``.npy`` paths to memory maps; returns other sources unchanged.
+    """
+    if isinstance(source, (str, os.PathLike)) and os.fspath(source).endswith('.npy'):
+        return np.load(source, mmap_mode='r')
+    return source
+
+
+def _iter_chunks(source, chunksize, columns=None):
+    """
+    Yields the source in chunks: array slices for arrays, DataFrames for tables.
+    """
+    if isinstance(source, np.ndarray):
+        flat = source.reshape(-1)
+        for start in range(0, flat.size, chunksize):
+            yield flat[start:start + chunksize]
+    elif callable(source):
+        yield from source()
+    else:
+        path = os.fspath(source)
+        if path.endswith('.parquet'):
+            _require_pyarrow()
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+        else:
+            import pandas as pd
+
+            yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+
+
+def _column_values(chunk, column):
+    if isinstance(chunk, np.ndarray):
+        return np.asarray(chunk, dtype=float).reshape(-1)
+    return chunk[column].to_numpy(dtype=float, na_value=np.nan)
+
+
+def _default_columns(source, chunksize):
+    if isinstance(source, np.ndarray):
+        return [None]
+    from .frame import numeric_columns
+
+    for chunk in _iter_chunks(source, chunksize):
+        if isinstance(chunk, np.ndarray):
+            return [None]
+        return numeric_columns(chunk)
+    return []
+
+
+# ----- Exact thresholds -----
+
+class _RankSearch:
+    """
+    Narrows down the value at one 0-based rank among a column's finite values.
+    """
+
+    def __init__(self, rank, low, high):
+        self.rank = rank
+        self.low = low
+        # Half-open interval [low, high): start just above the maximum
+        self.high = np.nextafter(high, np.inf)
+        self.value = None
+        self.collect = False
+        self._reset()
+
+    def _reset(self):
+        self.below = 0
+        self.counts = None
+        self.collected = []
+
+    def edges(self, bins):
+        return np.unique(np.linspace(self.low, self.high, bins + 1))
+
+    def observe(self, values, edges):
+        self.below += int(np.count_nonzero(values < self.low))
+        inside = values[(values >= self.low) & (values < self.high)]
+        if self.collect:
+            self.collected.append(inside)
+        else:
+            counts = np.bincount(np.searchsorted(edges, inside, side='right') - 1, minlength=edges.size - 1)
+            self.counts = counts if self.counts is None else self.counts + counts
+
+    def finish_pass(self, edges, max_buffer):
+        if self.collect:
+            values = np.sort(np.concatenate(self.collected))
+            self.value = values[self.rank - self.below]
+            return
+        cumulative = self.below + np.cumsum(self.counts)
+        i = int(np.searchsorted(cumulative, self.rank, side='right'))
+        self.low, self.high = edges[i], edges[i + 1]
+        if np.nextafter(self.low, np.inf) >= self.high:
+            # Only one representable value is left in the interval
+            self.value = self.low
+        self.collect = int(self.counts[i]) <= max_buffer
+        self._reset()
+
+
+def chunked_thresholds(source, lower_percentile, upper_percentile, columns=None, chunksize=DEFAULT_CHUNKSIZE,
+                       bins=4096, max_buffer=DEFAULT_CHUNKSIZE):
+    """
+    Computes exact percentile thresholds of data too large for memory by reading it in chunks.
+
+    Results equal ``np.nanpercentile`` on the whole column (same interpolation). Infinite
+    values are counted in the first pass and kept out of the histograms; ranks that fall on
+    them are resolved directly and interpolated exactly as ``np.nanpercentile`` does.
+
+    Args:
+        source: An array or memory map, a '.npy', '.csv' or '.parquet' path, or a function returning
+            an iterable of DataFrames or arrays (called once per pass).
+        lower_percentile (float): Lower percentile as a fraction, e.g. 0.01.
+        upper_percentile (float): Upper percentile as a fraction, e.g. 0.99.
+        columns (list, optional): Table columns to process. Defaults to every numeric column.
+        chunksize (int, optional): Rows read at a time. Defaults to 1,000,000.
+        bins (int, optional): Histogram bins used to narrow each threshold per pass. Defaults to 4096.
+        max_buffer (int, optional): Most values collected in memory to finish a threshold. Defaults to 1,000,000.
+
+    Returns:
+        dict: Column -> ``(lower threshold, upper threshold)``; NaNs for columns without values.
+        Arrays use the key None.
+    """
+    source = _open_source(source)
+    if columns is None:
+        columns = _default_columns(source, chunksize)
+    read_columns = None if columns == [None] else list(columns)
+    quantiles = as_fractions([lower_percentile, upper_percentile])
+
+    # Pass 1: count the values and the infinities, and find the range of the finite values
+    counts = dict.fromkeys(columns, 0)
+    negative_infinities = dict.fromkeys(columns, 0)
+    positive_infinities = dict.fromkeys(columns, 0)
+    minimums = dict.fromkeys(columns, np.inf)
+    maximums = dict.fromkeys(columns, -np.inf)
+    for chunk in _iter_chunks(source, chunksize, read_columns):
+        for column in columns:
+            values = _column_values(chunk, column)
+            values = values[~np.isnan(values)]
+            if values.size:
+                counts[column] += values.size
+                finite = values[np.isfinite(values)]
+                if finite.size < values.size:
+                    negative_infinities[column] += int(np.count_nonzero(values == -np.inf))
+                    positive_infinities[column] += int(np.count_nonzero(values == np.inf))
+                if finite.size:
+                    minimums[column] = min(minimums[column], finite.min())
+                    maximums[column] = max(maximums[column], finite.max())
+    passes = 1
+
+    def ranks_of(column):
+        positions = (counts[column] - 1) * quantiles
+        below = np.floor(positions)
+        return positions, below, np.minimum(below + 1, counts[column] - 1)
+
+    # Infinities sort first and last, so ranks that fall on them are known already; the
+    # others are searched for among the finite values only, which keeps the histogram
+    # edges finite.
+    searches = {}
+    for column in columns:
+        if counts[column]:
+            _, below, above = ranks_of(column)
+            first_finite = negative_infinities[column]
+            end_finite = counts[column] - positive_infinities[column]
+            searches[column] = {
+                int(rank): _RankSearch(int(rank) - first_finite, minimums[column], maximums[column])
+                for rank in np.unique(np.concatenate((below, above))) if first_finite <= rank < end_finite
+            }
+
+    # Further passes: narrow every unresolved rank until it is known exactly
+    while any(search.value is None for ranks in searches.values() for search in ranks.values()):
+        pending = [(column, search, search.edges(bins)) for column, ranks in searches.items()
+                   for search in ranks.values() if search.value is None]
+        for chunk in _iter_chunks(source, chunksize, read_columns):
+            by_column = {}
+            for column, search, edges in pending:
+                if column not in by_column:
+                    values = _column_values(chunk, column)
+                    by_column[column] = values[np.isfinite(values)]
+                search.observe(by_column[column], edges)
+        for _, search, edges in pending:
+            search.finish_pass(edges, max_buffer)
+        passes += 1
+    logger.info('computed thresholds for %d columns in %d passes', len(columns), passes)
+
+    thresholds = {}
+    for column in columns:
+        if not counts[column]:
+            thresholds[column] = (np.nan, np.nan)
+            continue
+        positions, below, above = ranks_of(column)
+        ranks = searches[column]
+
+        def value_at(rank):
+            rank = int(rank)
+            if rank < negative_infinities[column]:
+                return -np.inf
+            if rank >= counts[column] - positive_infinities[column]:
+                return np.inf
+            return ranks[rank].value
+
+        low_values = np.array([value_at(rank) for rank in below])
+        high_values = np.array([value_at(rank) for rank in above])
+        with np.errstate(invalid='ignore'):  # inf - inf next to infinities gives NaN, like np.nanpercentile
+            lower, upper = _lerp(low_values, high_values, positions - below)
+        thresholds[column] = (float(lower), float(upper))
+    return thresholds
+
+
+# ----- Clipping chunk by chunk -----
+
+def _apply(values, lower, upper, mode):
+    if not values.flags.writeable:
+        # Columns converted from Arrow can be read-only views
+        values = values.copy()
+    if mode == 'winsorize':
+        return np.clip(values, lower, upper, out=values)
+    values[(values < lower) | (values > upper)] = np.nan
+    return values
+
+
+def _process_chunked(source, destination, lower_percentile, upper_percentile, mode, columns, chunksize, thresholds):
+    source = _open_source(source)
+    if thresholds is None:
+        thresholds = chunked_thresholds(source, lower_percentile, upper_percentile, columns=columns,
+                                        chunksize=chunksize)
+
+    if isinstance(source, np.ndarray):
+        lower, upper = thresholds[None]
+        if isinstance(destination, np.ndarray):
+            out = destination
+        else:
+            out = np.lib.format.open_memmap(os.fspath(destination), mode='w+', dtype=float, shape=source.shape)
+        flat_out = out.reshape(-1)
+        start = 0
+        for chunk in _iter_chunks(source, chunksize):
+            values = np.array(chunk, dtype=float)
+            record_bytes(values.nbytes)
+            flat_out[start:start + values.size] = _apply(values, lower, upper, mode)
+            start += values.size
+        if isinstance(out, np.memmap):
+            out.flush()
+        return thresholds
+
+    path = os.fspath(destination)
+    parquet_writer = None
+    try:
+        for i, chunk in enumerate(_iter_chunks(source, chunksize)):
+            for column, (lower, upper) in thresholds.items():
+                values = _column_values(chunk, column)
+                record_bytes(values.nbytes)
+                chunk[column] = _apply(values, lower, upper, mode)
+            if path.endswith('.parquet'):
+                pyarrow = _require_pyarrow()
+                table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+                if parquet_writer is None:
+                    parquet_writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+                parquet_writer.write_table(table)
+            else:
+                chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+    return thresholds
+
+
+@instrumented()
+def winsorize_chunked(source, destination, lower_percentile, upper_percentile, columns=None,
+                      chunksize=DEFAULT_CHUNKSIZE, thresholds=None):
+    """
+    Winsorizes data too large for memory, writing the result chunk by chunk.
+
+    Args:
+        source: An array or memory map, a '.npy', '.csv' or '.parquet' path, or a function returning
+            an iterable of DataFrames (called once per pass).
+        destination: For array sources, a '.npy' path (written as a memory map) or an array to fill,
+            which may be ``source`` itself. For tables, a '.parquet' or '.csv' path; every column is
+            written and winsorized columns become float.
+        lower_percentile (float): Lower percentile as a fraction, e.g. 0.01.
+        upper_percentile (float): Upper percentile as a fraction, e.g. 0.99.
+        columns (list, optional): Table columns to winsorize. Defaults to every numeric column.
+        chunksize (int, optional): Rows read at a time. Defaults to 1,000,000.
+        thresholds (dict, optional): Thresholds from :func:`chunked_thresholds` to reuse instead of
+            computing them. Defaults to None.
+
+    Returns:
+        dict: The thresholds used, column -> ``(lower, upper)`` (key None for arrays).
+
+    Example:
+        ```python
+        winsorize_chunked('transactions.parquet', 'transactions_w.parquet', 0.01, 0.99, columns=['amount'])
+        ```
+    """
+    return _process_chunked(source, destination, lower_percentile, upper_percentile, 'winsorize', columns,
+                            chunksize, thresholds)
+
+
+@instrumented()
+def truncate_chunked(source, destination, lower_percentile, upper_percentile, columns=None,
+                     chunksize=DEFAULT_CHUNKSIZE, thresholds=None):
+    """
+    Truncates data too large for memory, writing the result chunk by chunk.
+
+    Takes the same arguments as :func:`winsorize_chunked`; values outside the thresholds become NaN.
+
+    Returns:
+        dict: The thresholds used, column -> ``(lower, upper)`` (key None for arrays).
+    """
+    return _process_chunked(source, destination, lower_percentile, upper_percentile, 'truncate', columns,
+                            chunksize, thresholds)
@@ -0,0 +1,6 @@
+"""PDF form field extraction and filling."""
+from .forms import get_pdf, create_pdf, read_fields
+from .bulk import get_pdfs, resolve_paths
+from .cache import ExtractionCache
+from .fields import FieldIndex
+from .template import PdfTemplate
@@ -0,0 +1,191 @@
+import contextlib
+import functools
+import glob
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from ..instrumentation import instrumented, record_bytes
+from .cache import content_digest, file_digest, plain_fields
+from .forms import read_fields
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_paths(source, pattern='*.pdf', recursive=False):
+    """
+    Expands a directory, glob pattern or iterable of paths into a sorted list of PDF paths.
+
+    Args:
+        source (str or iterable): A directory, a glob pattern such as 'forms/**/*.pdf', or an iterable of paths.
+        pattern (str, optional): File pattern used when ``source`` is a directory. Defaults to '*.pdf'.
+        recursive (bool, optional): Also search subdirectories of a directory ``source``. Defaults to False.
+
+    Returns:
+        list: The matching paths.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = os.fspath(source)
+        if os.path.isdir(source):
+            parts = [source, '**', pattern] if recursive else [source, pattern]
+            return sorted(glob.glob(os.path.join(*parts), recursive=recursive))
+        if glob.has_magic(source):
+            return sorted(glob.glob(source, recursive=True))
+        return [source]
+    return [os.fspath(path) for path in source]
+
+
+def _extract(path, digest=False):
+    """
+    Worker for :func:`get_pdfs`: returns ``(path, names, types, values, error, digest)``.
+
+    With ``digest`` the file's :func:`~byu_accounting.pdf.cache.content_digest` is returned and
+    values are converted to plain strings, ready for an extraction cache.
+    """
+    try:
+        if digest:
+            with open(path, 'rb') as f:
+                data = f.read()
+            names, types, values = plain_fields(read_fields(data))
+            return path, names, types, values, None, content_digest(data)
+        names, types, values = read_fields(path)
+    except Exception as e:
+        return path, None, None, None, f'{type(e).__name__}: {e}', None
+    # Field types are NameObjects; plain strings pickle smaller and compare the same.
+    return path, names, [str(t) for t in types], values, None, None
+
+
+@instrumented()
+def get_pdfs(source, pattern='*.pdf', recursive=False, processes=None, wide=False, skip_errors=True, chunksize=16,
+             cache=None):
+    """
+    Extracts form fields from many PDFs into a single Pandas DataFrame.
+
+    Files are parsed in a process pool. The result is in long format, one row per
+    file and field, with categorical 'file', 'name' and 'type' columns. Parse errors
+    are skipped by default and listed in ``df.attrs['failed']``; throughput figures are
+    in ``df.attrs['stats']``. With a ``cache``, files whose contents it already holds are answered
+    from it, including copies and renamed files, and only new contents are parsed.
+
+    Args:
+        source (str or iterable): A directory, a glob pattern, or an iterable of paths.
+        pattern (str, optional): File pattern used when ``source`` is a directory. Defaults to '*.pdf'.
+        recursive (bool, optional): Also search subdirectories of a directory ``source``. Defaults to False.
+        processes (int, optional): Worker processes. Defaults to the number of CPUs; 1 parses in this process.
+        wide (bool, optional): Pivot to one row per file and one column per field name. Defaults to False.
+        skip_errors (bool, optional): Skip files that fail to parse instead of raising. Defaults to True.
+        chunksize (int, optional): Files sent to a worker at a time. Defaults to 16.
+        cache (ExtractionCache, optional): Where to look up and save extracted fields
+            (see :class:`~byu_accounting.pdf.cache.ExtractionCache`). Defaults to None.
+
+    Raises:
+        ValueError: If a file fails to parse and ``skip_errors`` is False.
+
+    Returns:
+        pandas.DataFrame: Columns 'file', 'name', 'type' and 'value' (or one row per file if ``wide``).
+
+    Example:
+        ```python
+        df = get_pdfs('w2_forms/', processes=8)
+        print(df.attrs['stats'])
+        wages = get_pdfs('w2_forms/*.pdf', wide=True)['box1_wages']
+        ```
+    """
+    paths = resolve_paths(source, pattern, recursive)
+    start_time = time.perf_counter()
+
+    # Files the cache can answer are not parsed: first by size and modification time, then by a
+    # digest of their contents (copies, renames and touched files). Files with the same contents
+    # are parsed once.
+    cached = {}
+    same_as = {}
+    new_entries = []
+    if cache is not None:
+        first_with = {}
+        for path in paths:
+            fields = cache.lookup(path)
+            if fields is not None:
+                cached[path] = fields
+                continue
+            try:
+                digest = file_digest(path)
+            except OSError:
+                continue  # the worker reports the error
+            fields = cache.lookup_digest(digest)
+            if fields is not None:
+                cached[path] = fields
+                new_entries.append((digest, None, path))
+            elif digest in first_with:
+                same_as[path] = first_with[digest]
+            else:
+                first_with[digest] = path
+    todo = [path for path in paths if path not in cached and path not in same_as]
+    extract = functools.partial(_extract, digest=cache is not None)
+
+    parallel = processes != 1 and len(todo) > 1
+    files, names, types, values = [], [], [], []
+    failed = {}
+    parsed = {}
+    # Worker processes cannot see this call's span (context variables do not cross processes), so the
+    # bytes they parsed are recorded below from their results rather than inside the workers.
+    with ProcessPoolExecutor(max_workers=processes) if parallel else contextlib.nullcontext() as executor:
+        extracted = executor.map(extract, todo, chunksize=chunksize) if parallel else map(extract, todo)
+        for path in paths:
+            if path in cached:
+                field_names, field_types, field_values = cached[path]
+            elif path in same_as:
+                first = same_as[path]
+                if first in failed:
+                    failed[path] = failed[first]
+                    continue
+                cache.hits += 1
+                digest, (field_names, field_types, field_values) = parsed[first]
+                new_entries.append((digest, None, path))
+            else:
+                _, field_names, field_types, field_values, error, digest = next(extracted)
+                if error is not None:
+                    if not skip_errors:
+                        raise ValueError(f'Could not read {path}: {error}')
+                    failed[path] = error
+                    continue
+                if cache is not None:
+                    cache.misses += 1
+                    parsed[path] = digest, (field_names, field_types, field_values)
+                    new_entries.append((digest, (field_names, field_types, field_values), path))
+            files.extend([path] * len(field_names))
+            names.extend(field_names)
+            types.extend(field_types)
+            values.extend(field_values)
+    if cache is not None:
+        cache.store_many(new_entries)
+        cache.flush()
+
+    df = pd.DataFrame({
+        'file': pd.Categorical(files, categories=[p for p in paths if p not in failed]),
+        'name': pd.Categorical(names),
+        'type': pd.Categorical(types),
+        'value': pd.Series(values, dtype=object),
+    })
+
+    record_bytes(lambda: sum(os.path.getsize(path) for path in todo if path not in failed))
+    elapsed = time.perf_counter() - start_time
+    stats = {
+        'files': len(paths) - len(failed),
+        'failed': len(failed),
+        'cached': len(cached) + sum(1 for path in same_as if path not in failed),
+        'fields': len(df),
+        'seconds': elapsed,
+        'files_per_second': len(paths) / elapsed if elapsed else 0.0,
+    }
+    logger.info('extracted %(fields)d fields from %(files)d PDFs (%(failed)d failed) in %(seconds).2fs', stats)
+
+    if wide:
+        df = df.pivot(index='file', columns='name', values='value')
+        df.columns = df.columns.astype(str)
+        df.columns.name = None
+    df.attrs['stats'] = stats
+    df.attrs['failed'] = failed
+    return df
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+
+from .._io import as_buffer, is_path
+from .forms import read_fields
+
+logger = logging.getLogger(__name__)
+
+
+def content_digest(data):
+    """
+    Returns the hex digest that identifies a PDF's contents in an :class:`ExtractionCache`.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(path, chunk_size=2**20):
+    """
+    Returns the :func:`content_digest` of a file, reading it in chunks.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def plain_fields(fields):
+    """
+    Converts the pypdf objects returned by ``read_fields`` to plain strings (and lists of strings).
+    """
+    names, types, values = fields
+    return (
+        [str(name) for name in names],
+        [str(field_type) for field_type in types],
+        [[str(item) for item in value] if isinstance(value, list) else str(value) for value in values],
+    )
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extracted PDF form fields, keyed by a digest of each file's contents.
+
+    A path whose size and modification time match the last time it was seen is answered
+    without opening the file. Otherwise the file is read and hashed, so renamed or copied
+    files still hit the cache; only new contents are parsed. The least recently used
+    extractions are evicted once the cache grows past ``max_bytes``.
+
+    Cached values are plain strings (lists of strings for multi-select fields) rather than
+    pypdf objects, whether they came from the cache or were just parsed.
+
+    Args:
+        path (str): The SQLite database file. Use ':memory:' for a throwaway cache.
+        max_bytes (int, optional): Size limit for stored extractions. Defaults to 256 MB.
+        trust_mtime (bool, optional): Skip hashing files whose size and modification time are unchanged.
+            Defaults to True.
+
+    Example:
+        ```python
+        with ExtractionCache('pdf_fields.sqlite') as cache:
+            df = get_pdf('w2.pdf', cache=cache)
+            all_forms = get_pdfs('w2_forms/', cache=cache)
+        ```
+    """
+
+    def __init__(self, path, max_bytes=256 * 2**20, trust_mtime=True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.trust_mtime = trust_mtime
+        self.hits = 0
+        self.misses = 0
+        self._touched = {}
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS extractions (
+                digest TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                nbytes INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS extractions_last_used ON extractions (last_used);
+        """)
+        self._total = self.connection.execute('SELECT COALESCE(SUM(nbytes), 0) FROM extractions').fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM extractions').fetchone()[0]
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def flush(self):
+        """
+        Writes pending last-used times, which are kept in memory so cache hits do not write to disk.
+        """
+        if self._touched:
+            with self.connection:
+                self.connection.executemany(
+                    'UPDATE extractions SET last_used = ? WHERE digest = ?',
+                    [(last_used, digest) for digest, last_used in self._touched.items()],
+                )
+            self._touched.clear()
+
+    @property
+    def stats(self):
+        """dict: Hits, misses, stored extractions and their total size in bytes."""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self), 'bytes': self._total}
+
+    def lookup(self, path):
+        """
+        Returns the cached fields of a file whose size and modification time are unchanged, without reading it.
+
+        Returns:
+            tuple or None: Lists of field names, types and values, or None if the file must be read.
+        """
+        if not self.trust_mtime:
+            return None
+        try:
+            size, mtime_ns = _stat_key(path)
+        except OSError:
+            return None
+        row = self.connection.execute(
+            'SELECT e.digest, e.data FROM files f JOIN extractions e ON e.digest = f.digest '
+            'WHERE f.path = ? AND f.size = ? AND f.mtime_ns = ?',
+            (os.fspath(path), size, mtime_ns),
+        ).fetchone()
+        if row is None:
+            return None
+        self.hits += 1
+        self._touched[row[0]] = time.time()
+        return tuple(json.loads(row[1]))
+
+    def lookup_digest(self, digest):
+        """
+        Returns the cached fields of a PDF by the :func:`content_digest` of its contents.
+
+        Returns:
+            tuple or None: Lists of field names, types and values, or None if those contents were never extracted.
+        """
+        row = self.connection.execute('SELECT data FROM extractions WHERE digest = ?', (digest,)).fetchone()
+        if row is None:
+            return None
+        self.hits += 1
+        self._touched[digest] = time.time()
+        return tuple(json.loads(row[0]))
+
+    def read_fields(self, source):
+        """
+        Returns the form fields of a PDF, from the cache when possible.
+
+        Args:
+            source (str, bytes or file object): A path, the PDF's contents, or a readable binary file object.
+
+        Returns:
+            tuple: Lists of field names, field types and field values.
+        """
+        if is_path(source):
+            cached = self.lookup(source)
+            if cached is not None:
+                return cached
+            with open(source, 'rb') as f:
+                data = f.read()
+        else:
+            data = as_buffer(source)
+
+        digest = content_digest(data)
+        fields = self.lookup_digest(digest)
+        new = fields is None
+        if new:
+            self.misses += 1
+            fields = plain_fields(read_fields(data))
+        self.store(digest, fields, path=source if is_path(source) else None, new=new)
+        return fields
+
+    def store(self, digest, fields, path=None, new=True):
+        """
+        Saves the fields extracted from a PDF and, if given, records which file had that digest.
+
+        Args:
+            digest (str): The :func:`content_digest` of the PDF's contents.
+            fields (tuple): Lists of field names, types and values, as plain strings.
+            path (str, optional): The file the PDF was read from. Defaults to None.
+            new (bool, optional): False if the extraction is already stored. Defaults to True.
+        """
+        self.store_many([(digest, fields if new else None, path)])
+
+    def store_many(self, entries):
+        """
+        Saves many extractions in one transaction.
+
+        Args:
+            entries (iterable): ``(digest, fields, path)`` tuples; ``fields`` may be None to only record
+                the path, and ``path`` may be None for in-memory PDFs.
+        """
+        now = time.time()
+        with self.connection:
+            for digest, fields, path in entries:
+                if fields is not None:
+                    data = json.dumps(list(fields), separators=(',', ':'))
+                    # Equal digests mean equal contents, so an existing extraction is kept as is.
+                    cursor = self.connection.execute(
+                        'INSERT OR IGNORE INTO extractions (digest, data, nbytes, last_used) VALUES (?, ?, ?, ?)',
+                        (digest, data, len(data), now),
+                    )
+                    self._total += len(data) * cursor.rowcount
+                if path is not None:
+                    size, mtime_ns = _stat_key(path)
+                    self.connection.execute(
+                        'INSERT OR REPLACE INTO files (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)',
+                        (os.fspath(path), size, mtime_ns, digest),
+                    )
+        if self._total > self.max_bytes:
+            self.evict()
+
+    def evict(self, max_bytes=None):
+        """
+        Removes the least recently used extractions until the cache is at most ``max_bytes``.
+
+        Args:
+            max_bytes (int, optional): The target size. Defaults to the cache's ``max_bytes``.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        self.flush()
+        removed = []
+        with self.connection:
+            cursor = self.connection.execute('SELECT digest, nbytes FROM extractions ORDER BY last_used')
+            for digest, nbytes in cursor:
+                if self._total <= max_bytes:
+                    break
+                removed.append((digest,))
+                self._total -= nbytes
+            self.connection.executemany('DELETE FROM extractions WHERE digest = ?', removed)
+            self.connection.executemany('DELETE FROM files WHERE digest = ?', removed)
+        if removed:
+            logger.info('evicted %d PDF extractions from %s', len(removed), self.path)
+
+    def invalidate(self, paths=None):
+        """
+        Forgets cached extractions so the files are parsed again.
+
+        Args:
+            paths (str or iterable, optional): The files to forget. Defaults to None (clear the whole cache).
+        """
+        self._touched.clear()
+        with self.connection:
+            if paths is None:
+                self.connection.execute('DELETE FROM files')
+                self.connection.execute('DELETE FROM extractions')
+            else:
+                paths = [paths] if is_path(paths) else paths
+                for path in paths:
+                    path = os.fspath(path)
+                    self.connection.execute(
+                        'DELETE FROM extractions WHERE digest IN (SELECT digest FROM files WHERE path = ?)', (path,)
+                    )
+                    self.connection.execute('DELETE FROM files WHERE path = ?', (path,))
+        self._total = self.connection.execute('SELECT COALESCE(SUM(nbytes), 0) FROM extractions').fetchone()[0]
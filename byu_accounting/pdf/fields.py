@@ -0,0 +1,134 @@
+def _qualified_name(field):
+    """
+    Returns the fully qualified name of a form field ('parent.child'), following /Parent links.
+    """
+    parts = []
+    while field is not None:
+        if '/T' in field:
+            parts.append(str(field['/T']))
+        parent = field.get('/Parent')
+        field = parent.get_object() if parent is not None else None
+    return '.'.join(reversed(parts))
+
+
+class FieldIndex:
+    """
+    Index from form field names to the pages and widget annotations that hold them.
+
+    Fields are indexed under both their fully qualified name and their own /T, matching how
+    ``PdfWriter.update_page_form_field_values`` looks fields up. Annotations are recorded as
+    ``(page index, position in the page's /Annots array)``, which stays valid in a
+    ``PdfWriter`` cloned or appended from the same document.
+
+    Args:
+        reader (pypdf.PdfReader): The parsed template.
+
+    Attributes:
+        pages (dict): Field name -> sorted list of page indexes.
+        annotations (dict): Field name -> list of ``(page index, annotation position)`` tuples.
+        qualified (dict): Field name -> list of the fully qualified names it refers to.
+        page_fields (dict): Page index -> fully qualified names of the fields on that page.
+        blank (set): Fully qualified names of text and choice fields with no value in the template.
+    """
+
+    def __init__(self, reader):
+        self.pages = {}
+        self.annotations = {}
+        self.qualified = {}
+        self.page_fields = {}
+        self.blank = set()
+        for page_index, page in enumerate(reader.pages):
+            for position, annotation in enumerate(page.get('/Annots') or ()):
+                annotation = annotation.get_object()
+                if annotation.get('/Subtype') != '/Widget':
+                    continue
+                if '/FT' in annotation and '/T' in annotation:
+                    field = annotation
+                else:
+                    field = annotation.get('/Parent')
+                    if field is None:
+                        continue
+                    field = field.get_object()
+                qualified_name = _qualified_name(field)
+                if not qualified_name:
+                    continue
+                if field.get('/FT') in ('/Tx', '/Ch') and not field.get('/V'):
+                    self.blank.add(qualified_name)
+                page_fields = self.page_fields.setdefault(page_index, [])
+                if qualified_name not in page_fields:
+                    page_fields.append(qualified_name)
+                for name in {qualified_name, str(field.get('/T', ''))}:
+                    if not name:
+                        continue
+                    qualified = self.qualified.setdefault(name, [])
+                    if qualified_name not in qualified:
+                        qualified.append(qualified_name)
+                    self.annotations.setdefault(name, []).append((page_index, position))
+                    pages = self.pages.setdefault(name, [])
+                    if not pages or pages[-1] != page_index:
+                        pages.append(page_index)
+
+    def __contains__(self, name):
+        return name in self.pages
+
+    def __len__(self):
+        return len(self.pages)
+
+    @property
+    def names(self):
+        return list(self.pages)
+
+    def updates_by_page(self, values):
+        """
+        Splits field values by the page they belong on.
+
+        Args:
+            values (dict): Field names and values; values are converted with ``str``.
+
+        Returns:
+            tuple: A dict of page index -> ``{name: str(value)}`` for only the fields on that page,
+            and a list of the names that match no field.
+        """
+        updates = {}
+        unmatched = []
+        for name, value in values.items():
+            pages = self.pages.get(name)
+            if pages is None:
+                unmatched.append(name)
+                continue
+            text = str(value)
+            for page_index in pages:
+                updates.setdefault(page_index, {})[name] = text
+        return updates, unmatched
+
+    def flatten_updates_by_page(self, values):
+        """
+        Like :meth:`updates_by_page`, but lists every field on every page that has fields.
+
+        Fields are keyed by their fully qualified name so each widget is drawn once. Fields
+        without a new value map to None, which tells ``PdfWriter.update_page_form_field_values``
+        to flatten their current value; blank text fields without a new value are left out,
+        since they would draw nothing.
+
+        Args:
+            values (dict): Field names and values; values are converted with ``str``.
+
+        Returns:
+            tuple: A dict of page index -> ``{qualified name: str(value) or None}``, and a list of
+            the names that match no field.
+        """
+        updates = {
+            page_index: dict.fromkeys(name for name in names if name not in self.blank)
+            for page_index, names in self.page_fields.items()
+        }
+        unmatched = []
+        for name, value in values.items():
+            qualified = self.qualified.get(name)
+            if qualified is None:
+                unmatched.append(name)
+                continue
+            text = str(value)
+            for qualified_name in qualified:
+                for page_index in self.pages[qualified_name]:
+                    updates[page_index][qualified_name] = text
+        return updates, unmatched
@@ -0,0 +1,32 @@
+from pypdf.generic import NameObject
+
+
+def flatten_pages(writer, updates, first_page=0):
+    """
+    Fills fields and draws them into the page content, then removes their widgets.
+
+    Args:
+        writer (pypdf.PdfWriter): The document being written.
+        updates (dict): Page index -> ``{qualified name: value or None}``, as returned by
+            :meth:`~byu_accounting.pdf.fields.FieldIndex.flatten_updates_by_page`.
+        first_page (int, optional): Offset of the template's first page in ``writer``. Defaults to 0.
+    """
+    for page_index, fields in updates.items():
+        page = writer.pages[first_page + page_index]
+        writer.update_page_form_field_values(page, fields=fields, auto_regenerate=False, flatten=True)
+        annotations = page.get('/Annots')
+        if annotations is None:
+            continue
+        remaining = [annotation for annotation in annotations if annotation.get_object().get('/Subtype') != '/Widget']
+        if remaining:
+            annotations[:] = remaining
+        else:
+            del page[NameObject('/Annots')]
+
+
+def finish_flattened(writer):
+    """
+    Drops the interactive form and merges identical objects (fonts, images, content streams).
+    """
+    writer.root_object.pop(NameObject('/AcroForm'), None)
+    writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
@@ -0,0 +1,95 @@
+from pypdf import PdfReader, PdfWriter
+import pandas as pd
+
+from .._io import as_stream, is_path, source_size
+from ..instrumentation import instrumented, record_bytes
+from .fields import FieldIndex
+from .flatten import finish_flattened, flatten_pages
+
+def read_fields(filepath):
+    """
+    Reads the form fields of a PDF into parallel lists.
+
+    Args:
+        filepath (str, bytes or file object): The path to the PDF file, its contents (bytes, bytearray,
+            memoryview) or a readable binary file object such as ``BytesIO``.
+
+    Returns:
+        tuple: Lists of field names, field types and field values.
+    """
+    reader = PdfReader(as_stream(filepath))
+
+    # get_fields() returns None for a PDF without a form
+    fields = reader.get_fields() or {}
+
+    field_names = list(fields)
+    field_types = [field.get('/FT', '') for field in fields.values()]
+    field_values = [field.get('/V', '') for field in fields.values()]
+    return field_names, field_types, field_values
+
+@instrumented()
+def get_pdf(filepath, cache=None):
+    """
+    Extracts form fields from a PDF and returns them as a Pandas DataFrame.
+
+    Args:
+        filepath (str, bytes or file object): The path to the PDF file, its contents (bytes, bytearray,
+            memoryview) or a readable binary file object such as ``BytesIO``.
+        cache (ExtractionCache, optional): Reuse fields already extracted from the same contents
+            (see :class:`~byu_accounting.pdf.cache.ExtractionCache`). Defaults to None.
+
+    Returns:
+        pandas.DataFrame: A DataFrame containing field names, types, and values.
+    """
+    if cache is not None:
+        field_names, field_types, field_values = cache.read_fields(filepath)
+    else:
+        field_names, field_types, field_values = read_fields(filepath)
+    record_bytes(lambda: source_size(filepath))
+    return pd.DataFrame({'name': field_names, 'type': field_types, 'value': field_values}, columns=['name', 'type', 'value'])
+
+@instrumented()
+def create_pdf(templatepath, topath, update_dict, flatten=False):
+    """
+    Creates a new PDF by updating fields in a template PDF.
+
+    Only the pages that hold the requested fields are updated, and each page only
+    receives its own fields. To keep the result in memory, pass a ``BytesIO`` as
+    ``topath`` and hand ``topath.getbuffer()`` to the next step (e.g. ``add_attachment``).
+
+    Args:
+        templatepath (str, bytes or file object): The path to the template PDF, its contents
+            (bytes, bytearray, memoryview) or a readable binary file object.
+        topath (str or file object): The path to save the updated PDF, or a writable binary file object.
+        update_dict (dict): A dictionary of field names and values to update.
+        flatten (bool, optional): Draw every field into the page content, remove the interactive form
+            and merge duplicate fonts and images. The result is smaller but can no longer be edited.
+            Defaults to False.
+
+    Returns:
+        list: The keys of ``update_dict`` that did not match any field in the template.
+    """
+    # Open the PDF
+    reader = PdfReader(as_stream(templatepath))
+    record_bytes(lambda: source_size(templatepath))
+    index = FieldIndex(reader)
+    writer = PdfWriter()
+    writer.append(reader)
+
+    # Write data to the pages that hold each field
+    if flatten:
+        updates, unmatched = index.flatten_updates_by_page(update_dict)
+        flatten_pages(writer, updates)
+        finish_flattened(writer)
+    else:
+        updates, unmatched = index.updates_by_page(update_dict)
+        for page_index, fields in updates.items():
+            writer.update_page_form_field_values(writer.pages[page_index], fields=fields, auto_regenerate=False)
+
+    # Save the updated PDF
+    if is_path(topath):
+        with open(topath, "wb") as pdf_output:
+            writer.write(pdf_output)
+    else:
+        writer.write(topath)
+    return unmatched
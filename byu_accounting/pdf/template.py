@@ -0,0 +1,192 @@
+import io
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import NameObject
+
+from .._io import as_buffer, is_path
+from ..instrumentation import instrumented
+from .fields import FieldIndex
+from .flatten import finish_flattened, flatten_pages
+
+logger = logging.getLogger(__name__)
+
+
+class PdfTemplate:
+    """
+    A PDF form parsed once and filled many times.
+
+    The template file is read and parsed when the object is created, and a
+    :class:`~byu_accounting.pdf.fields.FieldIndex` of its fields is built up front. Each fill clones the parsed document and only updates the
+    pages that hold the requested fields. :meth:`fill_merged` writes every row into one
+    flattened PDF whose pages share the template's fonts and images.
+
+    Args:
+        templatepath (str, bytes or file object): The path to the template PDF, its contents
+            (bytes, bytearray, memoryview) or a readable binary file object.
+
+    Example:
+        ```python
+        template = PdfTemplate('w2_template.pdf')
+        template.fill({'employee_name': 'Cosmo Cougar'}, 'cosmo.pdf')
+        paths = template.fill_rows(employees_df, 'w2s/{EmployeeID}.pdf', processes=8)
+        template.fill_merged(employees_df, 'all_w2s.pdf')
+        ```
+    """
+
+    def __init__(self, templatepath):
+        if is_path(templatepath):
+            with open(templatepath, 'rb') as f:
+                self._load(f.read())
+        else:
+            self._load(as_buffer(templatepath))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Builds a template from the bytes of a PDF file.
+        """
+        template = cls.__new__(cls)
+        template._load(data)
+        return template
+
+    def _load(self, data):
+        # Keep an immutable copy: worker processes receive it and clones read from it.
+        self.data = data if isinstance(data, bytes) else bytes(data)
+        self.reader = PdfReader(io.BytesIO(self.data))
+        self.fields = FieldIndex(self.reader)
+
+    @property
+    def field_names(self):
+        return self.fields.names
+
+    def fill(self, values, topath, flatten=False):
+        """
+        Writes a copy of the template with the given field values.
+
+        Args:
+            values (dict): Field names and values; values are converted with ``str``. Unknown names are ignored.
+            topath (str or file object): The path to save the filled PDF, or a writable binary file object.
+                Pass None to get the PDF back as bytes.
+            flatten (bool, optional): Draw the fields into the page content and remove the interactive
+                form, as in :func:`~byu_accounting.pdf.create_pdf`. Defaults to False.
+
+        Returns:
+            str, file object or bytes: ``topath``, or the PDF bytes if ``topath`` is None.
+        """
+        writer = PdfWriter(clone_from=self.reader)
+        if flatten:
+            updates, _ = self.fields.flatten_updates_by_page(values)
+            flatten_pages(writer, updates)
+            finish_flattened(writer)
+        else:
+            updates, _ = self.fields.updates_by_page(values)
+            for page_index, fields in updates.items():
+                writer.update_page_form_field_values(writer.pages[page_index], fields=fields, auto_regenerate=False)
+        return _write(writer, topath)
+
+    @instrumented()
+    def fill_merged(self, df, topath=None):
+        """
+        Fills the template once per DataFrame row into a single flattened PDF.
+
+        Each row adds a copy of the template's pages with its values drawn into the page
+        content. Fields are always flattened, since every copy would otherwise share the same
+        field names. Fonts, images and unchanged content streams are stored once for the whole
+        document instead of once per row.
+
+        Args:
+            df (pandas.DataFrame): One row per copy of the template; columns matching field names are filled.
+            topath (str or file object, optional): The path to save the combined PDF, or a writable binary
+                file object. Defaults to None (return the PDF as bytes).
+
+        Returns:
+            str, file object or bytes: ``topath``, or the PDF bytes if ``topath`` is None.
+        """
+        start_time = time.perf_counter()
+        writer = PdfWriter()
+        # Flattening reads the default appearance and fonts from the form dictionary, if there is one.
+        if '/AcroForm' in self.reader.root_object:
+            writer.root_object[NameObject('/AcroForm')] = self.reader.root_object['/AcroForm'].clone(writer)
+        rows = df.to_dict('records')
+        for row in rows:
+            values = {name: value for name, value in row.items() if name in self.fields}
+            updates, _ = self.fields.flatten_updates_by_page(values)
+            # Copy the pages and their widgets afresh for every row; finish_flattened merges the copies
+            # of objects that did not change (fonts, images, page content) back into one.
+            writer.reset_translation(self.reader)
+            first_page = len(writer.pages)
+            for page in self.reader.pages:
+                writer.add_page(page)
+            flatten_pages(writer, updates, first_page)
+        finish_flattened(writer)
+
+        elapsed = time.perf_counter() - start_time
+        logger.info('merged %d filled copies into %d pages in %.2fs', len(rows), len(writer.pages), elapsed)
+        return _write(writer, topath)
+
+    @instrumented()
+    def fill_rows(self, df, topath, processes=None, chunksize=8, flatten=False):
+        """
+        Fills the template once per DataFrame row, each into its own file.
+
+        Args:
+            df (pandas.DataFrame): One row per output file; columns matching field names are filled.
+            topath (str or callable): Output path pattern formatted with the row's columns and ``index``
+                (e.g. 'out/{EmployeeID}.pdf'), or a function taking ``(index, row_dict)`` and returning a path.
+                ``{index}`` is always the row's DataFrame index, even if ``df`` has an 'index' column.
+            processes (int, optional): Worker processes. Defaults to the number of CPUs; 1 fills in this process.
+            chunksize (int, optional): Rows sent to a worker at a time. Defaults to 8.
+            flatten (bool, optional): Flatten each output file; see :meth:`fill`. Defaults to False.
+
+        Returns:
+            list: The written paths, in row order.
+        """
+        start_time = time.perf_counter()
+        jobs = []
+        for index, row in zip(df.index, df.to_dict('records')):
+            path = topath(index, row) if callable(topath) else topath.format_map({**row, 'index': index})
+            values = {name: value for name, value in row.items() if name in self.fields}
+            jobs.append((values, path, flatten))
+
+        for directory in {os.path.dirname(path) for _, path, _ in jobs}:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        if processes == 1 or len(jobs) <= 1:
+            paths = [self.fill(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(self.data,)) as executor:
+                paths = list(executor.map(_fill_in_worker, jobs, chunksize=chunksize))
+
+        elapsed = time.perf_counter() - start_time
+        logger.info('filled %d PDFs in %.2fs (%.1f files/s)', len(paths), elapsed, len(paths) / elapsed if elapsed else 0.0)
+        return paths
+
+
+_worker_template = None
+
+
+def _init_worker(data):
+    global _worker_template
+    _worker_template = PdfTemplate.from_bytes(data)
+
+
+def _fill_in_worker(job):
+    return _worker_template.fill(*job)
+
+
+def _write(writer, topath):
+    if topath is None:
+        output = io.BytesIO()
+        writer.write(output)
+        return output.getvalue()
+    if is_path(topath):
+        with open(topath, 'wb') as pdf_output:
+            writer.write(pdf_output)
+    else:
+        writer.write(topath)
+    return topath
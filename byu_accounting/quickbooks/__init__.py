@@ -0,0 +1,16 @@
+"""QuickBooks Online API helpers."""
+from .auth import refresh_quickbooks_access_token
+from .tokens import (
+    TOKEN_URL,
+    QuickBooksTokenManager,
+    TokenRefreshError,
+    get_session,
+)
+from .client import (
+    API_BASE_URL,
+    SANDBOX_BASE_URL,
+    AdaptiveLimiter,
+    QuickBooksAPIError,
+    QuickBooksClient,
+)
+from .sync import QuickBooksSync, SQLiteStore
@@ -0,0 +1,371 @@
+"""
+Asyncio versions of the QuickBooks token manager and API client.
+
+Requires aiohttp (``pip install byu_accounting[async]``). One
+:class:`AsyncQuickBooksClient` serves any number of realms from a single event
+loop and connection pool, with a separate concurrency limit for each realm.
+"""
+import asyncio
+import logging
+from collections import deque
+from json import loads as json_loads
+
+try:
+    import aiohttp
+except ImportError as e:
+    raise ImportError(
+        'byu_accounting.quickbooks.aio requires aiohttp. Install it with: pip install "byu_accounting[async]"'
+    ) from e
+
+from .client import (
+    API_BASE_URL,
+    MAX_BATCH_SIZE,
+    MAX_PAGE_SIZE,
+    QuickBooksAPIError,
+    _batch_items,
+    _batch_results,
+    _chunks,
+    _retry_after,
+)
+from .tokens import TOKEN_URL, TokenRefreshError, apply_token_response, token_needs_refresh
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAdaptiveLimiter:
+    """
+    Asyncio counterpart of :class:`~byu_accounting.quickbooks.client.AdaptiveLimiter`.
+
+    Args:
+        max_limit (int): The largest number of requests allowed in flight.
+        min_limit (int, optional): The smallest limit after throttling. Defaults to 1.
+    """
+
+    def __init__(self, max_limit, min_limit=1):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._condition = None
+
+    def _get_condition(self):
+        # Created lazily so the limiter binds to the running event loop.
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def __aenter__(self):
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify()
+
+    def on_success(self):
+        if self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_throttle(self):
+        self.limit = max(self.min_limit, self.limit / 2)
+
+
+class AsyncQuickBooksTokenManager:
+    """
+    Keeps a QuickBooks Online access token fresh from async code.
+
+    Uses the same token dict as :class:`~byu_accounting.quickbooks.QuickBooksTokenManager`.
+    Concurrent tasks that need a token while a refresh is running wait for that refresh.
+    Tokens are not persisted; use the synchronous manager's ``token_file`` to share tokens
+    between processes.
+
+    Args:
+        client_id (str): The QuickBooks client ID.
+        client_secret (str): The QuickBooks client secret.
+        tokens (dict): Initial tokens with 'accessToken' and 'refreshToken'.
+        refresh_margin (float, optional): Refresh this many seconds before the access token expires. Defaults to 300.
+        timeout (float, optional): Request timeout in seconds. Defaults to 30.
+        token_url (str, optional): The token endpoint. Defaults to the QuickBooks Online endpoint.
+    """
+
+    def __init__(self, client_id, client_secret, tokens, refresh_margin=300, timeout=30, token_url=TOKEN_URL):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self.token_url = token_url
+        self.refresh_count = 0
+        self._tokens = dict(tokens)
+        self._lock = None
+        self._generation = 0
+
+    @property
+    def tokens(self):
+        """dict: A copy of the current tokens."""
+        return dict(self._tokens)
+
+    def needs_refresh(self):
+        return token_needs_refresh(self._tokens, self.refresh_margin)
+
+    async def access_token(self, session):
+        """
+        Returns a valid access token, refreshing it first if it is about to expire.
+
+        Args:
+            session (aiohttp.ClientSession): The session to refresh with.
+        """
+        if self.needs_refresh():
+            await self.refresh(session)
+        return self._tokens['accessToken']
+
+    async def refresh(self, session, force=False):
+        """
+        Refreshes the tokens unless another task already did.
+
+        Raises:
+            TokenRefreshError: If the token endpoint returns an error.
+
+        Returns:
+            dict: A copy of the current tokens.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        generation = self._generation
+        async with self._lock:
+            if self._generation != generation or (not force and not self.needs_refresh()):
+                return self.tokens
+            async with session.post(
+                self.token_url,
+                data={
+                    'grant_type': 'refresh_token',
+                    'refresh_token': self._tokens['refreshToken'],
+                },
+                auth=aiohttp.BasicAuth(self.client_id, self.client_secret),
+                headers={'Accept': 'application/json'},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            ) as response:
+                if response.status != 200:
+                    raise TokenRefreshError(response.status, await response.text())
+                apply_token_response(self._tokens, await response.json(content_type=None))
+            self.refresh_count += 1
+            self._generation += 1
+            logger.info('QuickBooks tokens refreshed')
+            return self.tokens
+
+
+class AsyncQuickBooksClient:
+    """
+    Async client for the QuickBooks Online API that serves many realms from one event loop.
+
+    All realms share one ``aiohttp`` connection pool. Each realm gets its own adaptive
+    concurrency limit, so a throttled company slows down without holding back the others.
+
+    Args:
+        realms (dict, optional): Maps realm IDs to :class:`AsyncQuickBooksTokenManager` instances. Defaults to None.
+        base_url (str, optional): The API host. Defaults to the production API.
+        minor_version (int, optional): The API minor version to request. Defaults to None.
+        per_realm_limit (int, optional): Largest number of requests in flight per realm. Defaults to 4.
+        total_limit (int, optional): Size of the shared connection pool. Defaults to 100.
+        max_retries (int, optional): Retries for throttled requests. Defaults to 5.
+        timeout (float, optional): Request timeout in seconds. Defaults to 60.
+
+    Example:
+        ```python
+        async def pull_all(managers):
+            async with AsyncQuickBooksClient(managers) as client:
+                return await asyncio.gather(*(
+                    client.query_all(realm_id, 'SELECT * FROM Invoice') for realm_id in managers
+                ))
+        ```
+    """
+
+    def __init__(self, realms=None, base_url=API_BASE_URL, minor_version=None, per_realm_limit=4,
+                 total_limit=100, max_retries=5, timeout=60):
+        self.base_url = base_url.rstrip('/')
+        self.minor_version = minor_version
+        self.per_realm_limit = per_realm_limit
+        self.total_limit = total_limit
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.stats = {'requests': 0, 'throttled': 0, 'retries': 0}
+        self._realms = {}
+        self._limiters = {}
+        self._session = None
+        for realm_id, token_manager in (realms or {}).items():
+            self.add_realm(realm_id, token_manager)
+
+    async def __aenter__(self):
+        self.session
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def session(self):
+        """aiohttp.ClientSession: The shared session, created on first use inside the event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.total_limit, limit_per_host=self.total_limit)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def add_realm(self, realm_id, token_manager):
+        """
+        Registers a company and the token manager that authenticates it.
+        """
+        self._realms[realm_id] = token_manager
+        self._limiters[realm_id] = AsyncAdaptiveLimiter(self.per_realm_limit)
+
+    def url(self, realm_id, endpoint):
+        return f'{self.base_url}/v3/company/{realm_id}/{endpoint}'
+
+    async def request(self, realm_id, method, endpoint, params=None, json=None):
+        """
+        Sends one API request for a realm, handling token refresh, throttling and retries.
+
+        Raises:
+            QuickBooksAPIError: If the API returns an error or keeps throttling after ``max_retries`` retries.
+
+        Returns:
+            dict: The decoded JSON response.
+        """
+        token_manager = self._realms[realm_id]
+        limiter = self._limiters[realm_id]
+        params = dict(params or {})
+        if self.minor_version is not None:
+            params.setdefault('minorversion', str(self.minor_version))
+
+        refreshed = False
+        delay = 1.0
+        for attempt in range(self.max_retries + 1):
+            headers = {
+                'Authorization': f'Bearer {await token_manager.access_token(self.session)}',
+                'Accept': 'application/json',
+            }
+            async with limiter:
+                async with self.session.request(method, self.url(realm_id, endpoint), params=params, json=json,
+                                                headers=headers) as response:
+                    status = response.status
+                    body = await response.read()
+                    wait = _retry_after(response, delay)
+            self.stats['requests'] += 1
+
+            if status == 401 and not refreshed:
+                await token_manager.refresh(self.session, force=True)
+                refreshed = True
+                continue
+            if status == 429:
+                self.stats['throttled'] += 1
+                limiter.on_throttle()
+                if attempt == self.max_retries:
+                    break
+                logger.info('QuickBooks throttled realm %s; retrying in %.1fs', realm_id, wait)
+                self.stats['retries'] += 1
+                await asyncio.sleep(wait)
+                delay = min(delay * 2, 60.0)
+                continue
+            if status >= 400:
+                raise QuickBooksAPIError(status, body.decode(errors='replace'))
+
+            limiter.on_success()
+            return json_loads(body)
+
+        raise QuickBooksAPIError(status, body.decode(errors='replace'))
+
+    async def _query_page(self, realm_id, query, start_position, page_size):
+        data = await self.request(realm_id, 'GET', 'query', params={
+            'query': f'{query} STARTPOSITION {start_position} MAXRESULTS {page_size}',
+        })
+        for value in data.get('QueryResponse', {}).values():
+            if isinstance(value, list):
+                return value
+        return []
+
+    async def query_pages(self, realm_id, query, page_size=MAX_PAGE_SIZE, prefetch=None):
+        """
+        Runs a query for a realm and yields its results one page at a time.
+
+        Args:
+            realm_id (str): The QuickBooks company ID.
+            query (str): A QuickBooks query without STARTPOSITION/MAXRESULTS.
+            page_size (int, optional): Results per page, at most 1000. Defaults to 1000.
+            prefetch (int, optional): Pages to request ahead. Defaults to ``per_realm_limit``.
+
+        Yields:
+            list: The entities (dicts) on each page.
+        """
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f'page_size must be between 1 and {MAX_PAGE_SIZE}.')
+        prefetch = self.per_realm_limit if prefetch is None else max(1, prefetch)
+
+        pending = deque()
+        next_start = 1  # STARTPOSITION is 1-based
+        done = False
+        try:
+            while True:
+                while not done and len(pending) < prefetch:
+                    pending.append(asyncio.ensure_future(self._query_page(realm_id, query, next_start, page_size)))
+                    next_start += page_size
+                if not pending:
+                    return
+                page = await pending.popleft()
+                if len(page) < page_size:
+                    done = True
+                    for task in pending:
+                        task.cancel()
+                    pending.clear()
+                if page:
+                    yield page
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def query(self, realm_id, query, page_size=MAX_PAGE_SIZE, prefetch=None):
+        """
+        Runs a query for a realm and yields each entity.
+        """
+        async for page in self.query_pages(realm_id, query, page_size=page_size, prefetch=prefetch):
+            for entity in page:
+                yield entity
+
+    async def query_all(self, realm_id, query, page_size=MAX_PAGE_SIZE, prefetch=None):
+        """
+        Runs a query for a realm and returns every entity in a list.
+        """
+        return [entity async for entity in self.query(realm_id, query, page_size=page_size, prefetch=prefetch)]
+
+    async def batch(self, realm_id, operations):
+        """
+        Sends write operations for a realm through the ``/batch`` endpoint, 30 per request, concurrently.
+
+        As in :meth:`QuickBooksClient.batch`, the operations of a request that fails as a whole get
+        ``Fault`` responses instead of the error being raised.
+
+        Returns:
+            list: One ``BatchItemResponse`` dict per operation, in the same order.
+        """
+        async def send(chunk):
+            try:
+                data = await self.request(realm_id, 'POST', 'batch', json={'BatchItemRequest': chunk})
+            except Exception as e:
+                logger.warning('QuickBooks batch request of %d operations for realm %s failed: %s',
+                               len(chunk), realm_id, e)
+                return e
+            return data.get('BatchItemResponse', [])
+
+        chunks = list(_chunks(_batch_items(operations), MAX_BATCH_SIZE))
+        chunk_results = await asyncio.gather(*(send(chunk) for chunk in chunks))
+        return _batch_results(operations, chunks, chunk_results)
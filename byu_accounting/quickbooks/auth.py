@@ -0,0 +1,30 @@
+from ..instrumentation import instrumented, record_failure
+from .tokens import QuickBooksTokenManager, TokenRefreshError
+
+@instrumented()
+def refresh_quickbooks_access_token(QUICKBOOKS_TOKENS, QUICKBOOKS_CLIENT_ID, QUICKBOOKS_CLIENT_SECRET):
+
+    """
+    Refreshes the QuickBooks Online OAuth2 access token.
+
+    This always refreshes. Use ``QuickBooksTokenManager`` to refresh only when the
+    access token is about to expire.
+
+    Args:
+        QUICKBOOKS_TOKENS (dict): A dictionary containing the 'accessToken' and 'refreshToken'.
+        QUICKBOOKS_CLIENT_ID (str): The QuickBooks client ID.
+        QUICKBOOKS_CLIENT_SECRET (str): The QuickBooks client secret.
+
+    Returns:
+        dict: The updated QuickBooks tokens, including 'expiresAt' and 'refreshExpiresAt' timestamps.
+    """
+    manager = QuickBooksTokenManager(QUICKBOOKS_CLIENT_ID, QUICKBOOKS_CLIENT_SECRET, tokens=QUICKBOOKS_TOKENS)
+
+    try:
+        QUICKBOOKS_TOKENS.update(manager.refresh(force=True))
+        print('TOKENS REFRESHED SUCCESSFULLY')
+    except TokenRefreshError as e:
+        # Handle errors
+        print(f"FAILED TO REFRESH TOKENS: {e.status_code}")
+        record_failure(e)
+    return QUICKBOOKS_TOKENS
@@ -0,0 +1,353 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ..instrumentation import instrumented, record_bytes, record_retry
+from .tokens import get_session
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = 'https://quickbooks.api.intuit.com'
+SANDBOX_BASE_URL = 'https://sandbox-quickbooks.api.intuit.com'
+
+# QuickBooks Online limits
+MAX_PAGE_SIZE = 1000
+MAX_BATCH_SIZE = 30
+
+
+class QuickBooksAPIError(Exception):
+    """
+    Raised when the QuickBooks Online API returns an error response.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+        body (str): The response body.
+    """
+
+    def __init__(self, status_code, body=''):
+        super().__init__(f'QuickBooks API request failed with HTTP {status_code}: {body}')
+        self.status_code = status_code
+        self.body = body
+
+
+class AdaptiveLimiter:
+    """
+    Limits concurrent requests, halving the limit when throttled and growing it back slowly.
+
+    The limit increases by about one slot per ``limit`` successful requests (additive
+    increase) and is halved on every throttled response (multiplicative decrease).
+
+    Args:
+        max_limit (int): The largest number of requests allowed in flight.
+        min_limit (int, optional): The smallest limit after throttling. Defaults to 1.
+    """
+
+    def __init__(self, max_limit, min_limit=1):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def on_success(self):
+        with self._condition:
+            if self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                self._condition.notify()
+
+    def on_throttle(self):
+        with self._condition:
+            self.limit = max(self.min_limit, self.limit / 2)
+
+
+def _retry_after(response, default):
+    value = response.headers.get('Retry-After')
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _batch_items(operations):
+    """
+    Copies batch operations with their positions as bIds, so bIds chosen by the caller cannot collide.
+    """
+    return [{**operation, 'bId': str(i)} for i, operation in enumerate(operations)]
+
+
+def _batch_fault(error):
+    """
+    Returns the ``BatchItemResponse`` given to each operation of a batch request that failed as a whole.
+    """
+    return {'Fault': {'type': 'BatchRequestFault', 'Error': [{
+        'Message': str(error),
+        'code': str(getattr(error, 'status_code', '')),
+        'Detail': getattr(error, 'body', ''),
+    }]}}
+
+
+def _batch_results(operations, chunks, chunk_results):
+    """
+    Matches the responses of batch requests to ``operations``, restoring each operation's own bId.
+
+    Args:
+        operations (list): The operations as given by the caller.
+        chunks (list): The items sent in each request (see :func:`_batch_items`).
+        chunk_results (list): Each request's ``BatchItemResponse`` list, or the exception it raised.
+
+    Returns:
+        list: One ``BatchItemResponse`` dict per operation (None if the API did not answer it).
+    """
+    responses = {}
+    for chunk, result in zip(chunks, chunk_results):
+        if isinstance(result, Exception):
+            result = [{'bId': item['bId'], **_batch_fault(result)} for item in chunk]
+        for response in result:
+            responses[response.get('bId')] = response
+    results = []
+    for i, operation in enumerate(operations):
+        response = responses.get(str(i))
+        results.append(None if response is None else {**response, 'bId': operation.get('bId', str(i))})
+    return results
+
+
+class QuickBooksClient:
+    """
+    Client for the QuickBooks Online accounting API for one company (realm).
+
+    Queries are paged with STARTPOSITION/MAXRESULTS and streamed as generators. Writes go
+    through the ``/batch`` endpoint, 30 operations per request. All requests share the pooled
+    session and an :class:`AdaptiveLimiter`: HTTP 429 responses honor ``Retry-After`` and
+    reduce the number of concurrent requests until the API stops throttling.
+
+    Args:
+        realm_id (str): The QuickBooks company ID.
+        token_manager (QuickBooksTokenManager): Supplies access tokens.
+        base_url (str, optional): The API host. Defaults to the production API; use ``SANDBOX_BASE_URL`` for sandbox companies.
+        minor_version (int, optional): The API minor version to request. Defaults to None.
+        max_concurrency (int, optional): Largest number of requests in flight. Defaults to 8.
+        max_retries (int, optional): Retries for throttled requests. Defaults to 5.
+        timeout (float, optional): Request timeout in seconds. Defaults to 60.
+        session (requests.Session, optional): Defaults to the shared pooled session, which does
+            not resend POST requests after a read timeout or 5xx response.
+
+    Example:
+        ```python
+        client = QuickBooksClient(REALM_ID, QuickBooksTokenManager(CLIENT_ID, CLIENT_SECRET, token_file='tokens.json'))
+        for invoice in client.query("SELECT * FROM Invoice WHERE TxnDate >= '2024-01-01'"):
+            ...
+        df = client.query_df('SELECT * FROM Customer')
+        ```
+    """
+
+    def __init__(self, realm_id, token_manager, base_url=API_BASE_URL, minor_version=None, max_concurrency=8,
+                 max_retries=5, timeout=60, session=None):
+        self.realm_id = realm_id
+        self.token_manager = token_manager
+        self.base_url = base_url.rstrip('/')
+        self.minor_version = minor_version
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = session or get_session()
+        self.limiter = AdaptiveLimiter(max_concurrency)
+        self.stats = {'requests': 0, 'throttled': 0, 'retries': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def url(self, endpoint):
+        return f'{self.base_url}/v3/company/{self.realm_id}/{endpoint}'
+
+    @instrumented()
+    def request(self, method, endpoint, params=None, json=None):
+        """
+        Sends one API request, handling token refresh, throttling and retries.
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (str): The path after ``/v3/company/<realm>/``, e.g. 'query' or 'batch'.
+            params (dict, optional): Query string parameters.
+            json (dict, optional): JSON request body.
+
+        Raises:
+            QuickBooksAPIError: If the API returns an error or keeps throttling after ``max_retries`` retries.
+
+        Returns:
+            dict: The decoded JSON response.
+        """
+        params = dict(params or {})
+        if self.minor_version is not None:
+            params.setdefault('minorversion', self.minor_version)
+
+        refreshed = False
+        delay = 1.0
+        for attempt in range(self.max_retries + 1):
+            with self.limiter:
+                response = self.session.request(
+                    method,
+                    self.url(endpoint),
+                    params=params,
+                    json=json,
+                    headers=self.token_manager.auth_headers(),
+                    timeout=self.timeout,
+                )
+            self._count('requests')
+
+            if response.status_code == 401 and not refreshed:
+                # The token may have been revoked or expired early; refresh once.
+                self.token_manager.refresh(force=True)
+                refreshed = True
+                continue
+            if response.status_code == 429:
+                self._count('throttled')
+                self.limiter.on_throttle()
+                if attempt == self.max_retries:
+                    break
+                wait = _retry_after(response, delay)
+                logger.info('QuickBooks throttled request to %s; retrying in %.1fs', endpoint, wait)
+                self._count('retries')
+                record_retry()
+                time.sleep(wait)
+                delay = min(delay * 2, 60.0)
+                continue
+            if response.status_code >= 400:
+                raise QuickBooksAPIError(response.status_code, response.text)
+
+            self.limiter.on_success()
+            record_bytes(len(response.content))
+            return response.json()
+
+        raise QuickBooksAPIError(response.status_code, response.text)
+
+    def _query_page(self, query, start_position, page_size):
+        data = self.request('GET', 'query', params={
+            'query': f'{query} STARTPOSITION {start_position} MAXRESULTS {page_size}',
+        })
+        query_response = data.get('QueryResponse', {})
+        for value in query_response.values():
+            if isinstance(value, list):
+                return value
+        return []
+
+    def query_pages(self, query, page_size=MAX_PAGE_SIZE, prefetch=None):
+        """
+        Runs a query and yields its results one page at a time.
+
+        Up to ``prefetch`` pages are requested ahead of the one being yielded, so pages
+        download concurrently while keeping their order.
+
+        Args:
+            query (str): A QuickBooks query without STARTPOSITION/MAXRESULTS, e.g. 'SELECT * FROM Invoice'.
+            page_size (int, optional): Results per page, at most 1000. Defaults to 1000.
+            prefetch (int, optional): Pages to request ahead. Defaults to ``max_concurrency``.
+
+        Yields:
+            list: The entities (dicts) on each page.
+        """
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f'page_size must be between 1 and {MAX_PAGE_SIZE}.')
+        prefetch = self.max_concurrency if prefetch is None else max(1, prefetch)
+
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            pending = deque()
+            next_start = 1  # STARTPOSITION is 1-based
+            done = False
+            try:
+                while True:
+                    while not done and len(pending) < prefetch:
+                        pending.append(executor.submit(contextvars.copy_context().run, self._query_page, query,
+                                                       next_start, page_size))
+                        next_start += page_size
+                    if not pending:
+                        return
+                    page = pending.popleft().result()
+                    if len(page) < page_size:
+                        # Last page; anything still in flight is past the end.
+                        done = True
+                        for future in pending:
+                            future.cancel()
+                        pending.clear()
+                    if page:
+                        yield page
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def query(self, query, page_size=MAX_PAGE_SIZE, prefetch=None):
+        """
+        Runs a query and yields each entity.
+
+        Args:
+            query (str): A QuickBooks query without STARTPOSITION/MAXRESULTS.
+            page_size (int, optional): Results per page, at most 1000. Defaults to 1000.
+            prefetch (int, optional): Pages to request ahead. Defaults to ``max_concurrency``.
+
+        Yields:
+            dict: Each entity returned by the query.
+        """
+        for page in self.query_pages(query, page_size=page_size, prefetch=prefetch):
+            yield from page
+
+    def query_df(self, query, page_size=MAX_PAGE_SIZE, prefetch=None):
+        """
+        Runs a query and returns all results as a Pandas DataFrame with nested fields flattened.
+
+        Returns:
+            pandas.DataFrame: One row per entity; nested objects become dotted column names.
+        """
+        import pandas as pd  # Only needed for DataFrame output
+
+        return pd.json_normalize(list(self.query(query, page_size=page_size, prefetch=prefetch)))
+
+    def batch(self, operations):
+        """
+        Sends write operations through the ``/batch`` endpoint, 30 per request, concurrently.
+
+        A request that fails as a whole (an HTTP error, or throttling past ``max_retries``) does not
+        stop the others, whose writes are already committed. Instead each of its operations gets a
+        ``Fault`` response of type 'BatchRequestFault', so only those operations need resending.
+
+        Args:
+            operations (list): Batch items such as ``{'operation': 'create', 'Invoice': {...}}``.
+                Each response carries its operation's 'bId', or the operation's position if it has none.
+
+        Returns:
+            list: One ``BatchItemResponse`` dict per operation, in the same order.
+        """
+        def send(chunk):
+            try:
+                data = self.request('POST', 'batch', json={'BatchItemRequest': chunk})
+            except Exception as e:
+                logger.warning('QuickBooks batch request of %d operations failed: %s', len(chunk), e)
+                return e
+            return data.get('BatchItemResponse', [])
+
+        chunks = list(_chunks(_batch_items(operations), MAX_BATCH_SIZE))
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            # Requests run in copies of the caller's context, so they are traced under the caller's span
+            futures = [executor.submit(contextvars.copy_context().run, send, chunk) for chunk in chunks]
+            chunk_results = [future.result() for future in futures]
+        return _batch_results(operations, chunks, chunk_results)
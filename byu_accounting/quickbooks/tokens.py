@@ -0,0 +1,283 @@
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# QuickBooks Online OAuth2 token endpoint
+TOKEN_URL = 'https://oauth.platform.intuit.com/oauth2/v1/tokens/bearer'
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class TokenRefreshError(Exception):
+    """
+    Raised when the token endpoint rejects a refresh request.
+
+    Attributes:
+        status_code (int): The HTTP status code returned by the token endpoint.
+        body (str): The response body.
+    """
+
+    def __init__(self, status_code, body=''):
+        super().__init__(f'Token refresh failed with HTTP {status_code}: {body}')
+        self.status_code = status_code
+        self.body = body
+
+
+def get_session():
+    """
+    Returns the process-wide pooled ``requests.Session`` used for QuickBooks calls.
+
+    Connections are kept alive between calls. Connection errors are retried with backoff for
+    every method, but read timeouts and 5xx responses only for idempotent methods: POST requests
+    create records and rotate refresh tokens, so resending one whose response was lost could
+    write it twice or fail with ``invalid_grant``. Throttling (HTTP 429) is left to
+    :class:`QuickBooksClient`.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=(500, 502, 503, 504),
+                    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                    raise_on_status=False,
+                    respect_retry_after_header=False,  # QuickBooksClient handles 429 itself.
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def apply_token_response(tokens, new_tokens, now=None):
+    """
+    Copies a token endpoint response into a tokens dict, converting lifetimes to expiry timestamps.
+
+    Args:
+        tokens (dict): Tokens with 'accessToken'/'refreshToken' keys; updated in place.
+        new_tokens (dict): The decoded JSON response from the token endpoint.
+        now (float, optional): The Unix time the response was received. Defaults to the current time.
+
+    Returns:
+        dict: The updated ``tokens``.
+    """
+    now = time.time() if now is None else now
+    tokens['accessToken'] = new_tokens.get('access_token')
+    tokens['refreshToken'] = new_tokens.get('refresh_token')
+    if 'expires_in' in new_tokens:
+        tokens['expiresAt'] = now + float(new_tokens['expires_in'])
+    if 'x_refresh_token_expires_in' in new_tokens:
+        tokens['refreshExpiresAt'] = now + float(new_tokens['x_refresh_token_expires_in'])
+    return tokens
+
+
+def token_needs_refresh(tokens, refresh_margin):
+    """
+    Returns True if the access token is missing, of unknown age, or within ``refresh_margin`` seconds of expiring.
+    """
+    expires_at = tokens.get('expiresAt')
+    if not tokens.get('accessToken') or expires_at is None:
+        return True
+    return expires_at - time.time() <= refresh_margin
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """
+    Holds an exclusive OS-level lock on ``path + '.lock'`` so only one process refreshes at a time.
+    """
+    with open(os.fspath(path) + '.lock', 'a+b') as lock_file:
+        if os.name == 'nt':
+            import msvcrt
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10 seconds; keep waiting.
+                    continue
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class QuickBooksTokenManager:
+    """
+    Keeps a QuickBooks Online access token fresh, refreshing only shortly before it expires.
+
+    Tokens use the same keys as ``refresh_quickbooks_access_token`` ('accessToken' and
+    'refreshToken') plus 'expiresAt' and 'refreshExpiresAt' (Unix timestamps). Threads that
+    need a token while a refresh is running wait for that refresh instead of starting their
+    own. With ``token_file``, tokens are persisted to disk under a file lock, so processes
+    sharing the file also share refreshes.
+
+    Args:
+        client_id (str): The QuickBooks client ID.
+        client_secret (str): The QuickBooks client secret.
+        tokens (dict, optional): Initial tokens. Defaults to the contents of ``token_file``.
+        token_file (str or os.PathLike, optional): Path of a JSON file to load and save tokens; it is
+            written readable by its owner only. Defaults to None.
+        refresh_margin (float, optional): Refresh this many seconds before the access token expires. Defaults to 300.
+        session (requests.Session, optional): Session for the token endpoint. Defaults to the shared pooled session.
+        timeout (float, optional): Request timeout in seconds. Defaults to 30.
+        token_url (str, optional): The token endpoint. Defaults to the QuickBooks Online endpoint.
+
+    Example:
+        ```python
+        manager = QuickBooksTokenManager(CLIENT_ID, CLIENT_SECRET, token_file='qbo_tokens.json')
+        headers = {'Authorization': f'Bearer {manager.access_token()}'}
+        ```
+    """
+
+    def __init__(self, client_id, client_secret, tokens=None, token_file=None, refresh_margin=300,
+                 session=None, timeout=30, token_url=TOKEN_URL):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_file = token_file
+        self.refresh_margin = refresh_margin
+        self.session = session
+        self.timeout = timeout
+        self.token_url = token_url
+        self.refresh_count = 0
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        if tokens is None and token_file is not None:
+            tokens = self._read_file() or {}
+        if tokens is None:
+            raise ValueError('Either tokens or token_file must be provided.')
+        self._tokens = dict(tokens)
+
+    @property
+    def tokens(self):
+        """dict: A copy of the current tokens."""
+        return dict(self._tokens)
+
+    def expires_in(self):
+        """
+        Returns the seconds until the access token expires, or None if the expiry is unknown.
+        """
+        expires_at = self._tokens.get('expiresAt')
+        return None if expires_at is None else expires_at - time.time()
+
+    def needs_refresh(self, tokens=None):
+        """
+        Returns True if the access token is missing, of unknown age, or within ``refresh_margin`` of expiring.
+        """
+        return token_needs_refresh(self._tokens if tokens is None else tokens, self.refresh_margin)
+
+    def access_token(self):
+        """
+        Returns a valid access token, refreshing it first if it is about to expire.
+
+        Returns:
+            str: The access token.
+        """
+        if self.needs_refresh():
+            self.refresh()
+        return self._tokens['accessToken']
+
+    def auth_headers(self):
+        """
+        Returns the headers for an authenticated QuickBooks API request.
+        """
+        return {'Authorization': f'Bearer {self.access_token()}', 'Accept': 'application/json'}
+
+    def refresh(self, force=False):
+        """
+        Refreshes the tokens unless another thread or process already did.
+
+        Args:
+            force (bool, optional): Refresh even if the access token is not close to expiring. Defaults to False.
+
+        Raises:
+            TokenRefreshError: If the token endpoint returns an error.
+
+        Returns:
+            dict: A copy of the current tokens.
+        """
+        generation = self._generation
+        with self._lock:
+            if self._generation != generation:
+                # Another thread refreshed while we waited for the lock.
+                return self.tokens
+            if not force and not self.needs_refresh():
+                return self.tokens
+
+            if self.token_file is None:
+                self._refresh()
+            else:
+                with _file_lock(self.token_file):
+                    stored = self._read_file()
+                    if stored and (stored.get('accessToken'), stored.get('expiresAt')) != (
+                            self._tokens.get('accessToken'), self._tokens.get('expiresAt')):
+                        # Another process refreshed (QuickBooks may return the same refresh token); use its tokens.
+                        self._tokens.update(stored)
+                        if not self.needs_refresh():
+                            self._generation += 1
+                            return self.tokens
+                    self._refresh()
+                    self._write_file()
+            self._generation += 1
+            return self.tokens
+
+    def _refresh(self):
+        session = self.session or get_session()
+        response = session.post(
+            self.token_url,
+            data={
+                'grant_type': 'refresh_token',
+                'refresh_token': self._tokens['refreshToken'],
+            },
+            auth=HTTPBasicAuth(self.client_id, self.client_secret),
+            headers={'Accept': 'application/json'},
+            timeout=self.timeout,
+        )
+        if response.status_code != 200:
+            raise TokenRefreshError(response.status_code, response.text)
+
+        new_tokens = response.json()
+        apply_token_response(self._tokens, new_tokens)
+        self.refresh_count += 1
+        logger.info('QuickBooks tokens refreshed; access token expires in %s seconds', new_tokens.get('expires_in'))
+
+    def _read_file(self):
+        try:
+            with open(self.token_file) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_file(self):
+        temp_path = f'{os.fspath(self.token_file)}.{os.getpid()}.tmp'
+        # The file holds secrets: only the owner may read it
+        with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+            json.dump(self._tokens, f, indent=2)
+        os.replace(temp_path, self.token_file)
@@ -0,0 +1,26 @@
+"""Selenium WebDriver helpers."""
+from .elements import (
+    click_button,
+    send_text,
+    switch_to_iframe,
+    switch_to_default_frame,
+)
+from .forms import fill_form
+from .cache import (
+    ElementCache,
+    enable_element_cache,
+    disable_element_cache,
+    get_element_cache,
+)
+from .pool import SessionPool, JobResult, PoolReport, chrome_factory
+from .waits import (
+    LOCATOR_TYPES,
+    WaitResult,
+    wait_until,
+    last_wait,
+    set_wait_defaults,
+    element_located,
+    element_visible,
+    element_clickable,
+    frame_available,
+)
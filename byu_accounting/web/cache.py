@@ -0,0 +1,131 @@
+import weakref
+
+_caches = weakref.WeakKeyDictionary()
+
+
+class ElementCache:
+    """
+    Remembers located elements for one WebDriver so repeated lookups skip ``find_element``.
+
+    Entries are keyed by ``(frame path, locator type, value, index)``. The cache is cleared
+    and the frame path reset when the page URL changes (if ``check_navigation`` is on), and
+    when the driver switches back to the default frame. Stale entries are dropped by the
+    helpers when Selenium raises ``StaleElementReferenceException`` and the element is looked
+    up again.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to query the page.
+        stale (int): Cached elements found to be stale and discarded.
+    """
+
+    def __init__(self, check_navigation=True):
+        self.check_navigation = check_navigation
+        self.frame_path = ()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._url = None
+        self._elements = {}
+
+    def __len__(self):
+        return len(self._elements)
+
+    def key(self, by, value, index):
+        return (self.frame_path, by, value, index)
+
+    def lookup(self, driver, by, value, index, find):
+        """
+        Returns the cached element for the locator, calling ``find(driver, by, value, index)`` on a miss.
+        """
+        if self.check_navigation:
+            url = driver.current_url
+            if url != self._url:
+                # A new page starts in its default content, so the old frame path no longer applies
+                self._elements.clear()
+                self.frame_path = ()
+                self._url = url
+
+        key = self.key(by, value, index)
+        element = self._elements.get(key)
+        if element is not None:
+            self.hits += 1
+            return element
+
+        self.misses += 1
+        element = find(driver, by, value, index)
+        self._elements[key] = element
+        return element
+
+    def discard(self, by, value, index):
+        """
+        Drops a stale entry for the locator in the current frame.
+        """
+        if self._elements.pop(self.key(by, value, index), None) is not None:
+            self.stale += 1
+
+    def enter_frame(self, by, value, index):
+        """
+        Records that the driver switched into a child iframe.
+        """
+        self.frame_path = self.frame_path + ((by, value, index),)
+
+    def invalidate(self):
+        """
+        Forgets every cached element and resets the frame context to the default content.
+        """
+        self._elements.clear()
+        self.frame_path = ()
+
+    def stats(self):
+        """
+        Returns the hit/miss counters.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``stale``, ``hit_rate`` and the number of cached ``entries``.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._elements),
+        }
+
+
+def enable_element_cache(driver, check_navigation=True):
+    """
+    Turns on element caching for a WebDriver instance.
+
+    Args:
+        driver (selenium.webdriver): The Selenium WebDriver instance.
+        check_navigation (bool, optional): Whether to read ``driver.current_url`` on each lookup and
+            clear the cache when it changes. Defaults to True.
+
+    Returns:
+        ElementCache: The cache attached to the driver.
+    """
+    cache = _caches.get(driver)
+    if cache is None:
+        cache = _caches[driver] = ElementCache(check_navigation=check_navigation)
+    else:
+        cache.check_navigation = check_navigation
+    return cache
+
+
+def disable_element_cache(driver):
+    """
+    Turns off element caching for a WebDriver instance and discards its cache.
+
+    Returns:
+        ElementCache: The removed cache, or None if caching was not enabled.
+    """
+    return _caches.pop(driver, None)
+
+
+def get_element_cache(driver):
+    """
+    Returns the :class:`ElementCache` for a driver, or None if caching is not enabled.
+    """
+    return _caches.get(driver)
@@ -0,0 +1,120 @@
+import logging
+
+from ..instrumentation import instrumented, record_failure
+from .cache import get_element_cache
+from .waits import (
+    wait_until,
+    resolve_locator,
+    element_clickable,
+    element_located,
+    frame_available,
+)
+
+logger = logging.getLogger(__name__)
+
+@instrumented()
+def click_button(value, driver, type='XPATH', index=0, timeout=None, poll_interval=None):
+    """
+    Clicks a button on a webpage using Selenium WebDriver.
+
+    Waits for the button to be clickable, polling with backoff instead of spinning.
+
+    Args:
+        value (str): The value of the locator to find the button.
+        driver (selenium.webdriver): The Selenium WebDriver instance.
+        type (str, optional): The type of locator to use (e.g., 'XPATH', 'CSS_SELECTOR', 'ID', etc.). Defaults to 'XPATH'.
+        timeout (float, optional): The time (in seconds) to attempt clicking before timing out. Defaults to None, which uses the wait default (30 seconds).
+        index (int, optional): The index of the element to click (used for locators that return multiple elements). Defaults to 0.
+        poll_interval (float, optional): The time (in seconds) between the first two attempts. Defaults to None, which uses the wait default.
+
+    Returns:
+        True if the button was clicked
+        False if the button was not clicked
+    """
+    def click(button):
+        button.click()
+        return True
+
+    condition = element_clickable(resolve_locator(type), value, index, action=click)
+
+    result = wait_until(condition, driver, timeout=timeout, poll_interval=poll_interval)
+    if not result:
+        logger.warning('Error clicking button: %s', result.last_exception or 'timed out')
+        record_failure(result.last_exception or 'timed out')
+    return result.success
+
+@instrumented()
+def send_text(text, value, driver, type='XPATH', index=0, timeout=None, poll_interval=None):
+    """
+    Sends text to a specified input field on a webpage using Selenium WebDriver.
+
+    Waits for the input field to exist, polling with backoff instead of spinning. It does not
+    have to be visible, so hidden inputs such as a styled ``<input type="file">`` still work.
+
+    Args:
+        text (str): The text to send to the input field.
+        value (str): The value of the locator to find the input field.
+        driver (selenium.webdriver): The Selenium WebDriver instance.
+        type (str, optional): The type of locator to use (e.g., 'XPATH', 'CSS_SELECTOR', 'ID', etc.). Defaults to 'XPATH'.
+        index (int, optional): The index of the element to send text to (used for locators that return multiple elements). Defaults to 0.
+        timeout (float, optional): The time (in seconds) to attempt sending text before timing out. Defaults to None, which uses the wait default (30 seconds).
+        poll_interval (float, optional): The time (in seconds) between the first two attempts. Defaults to None, which uses the wait default.
+
+    Returns:
+        True if the text was entered properly
+        False if the text was not entered properly
+    """
+    def type_text(input_field):
+        input_field.send_keys(text)
+        return True
+
+    condition = element_located(resolve_locator(type), value, index, action=type_text)
+
+    result = wait_until(condition, driver, timeout=timeout, poll_interval=poll_interval)
+    if not result:
+        logger.warning('Error sending text: %s', result.last_exception or 'timed out')
+        record_failure(result.last_exception or 'timed out')
+    return result.success
+
+@instrumented()
+def switch_to_iframe(value, driver, type='XPATH', index=0, timeout=None, poll_interval=None):
+    """
+    Switches the WebDriver context to a specified iframe.
+
+    Args:
+        value (str): The value of the locator to find the iframe.
+        driver (selenium.webdriver): The Selenium WebDriver instance.
+        type (str, optional): The type of locator to use (e.g., 'XPATH', 'CSS_SELECTOR', 'ID', etc.). Defaults to 'XPATH'.
+        index (int, optional): The index of the iframe to switch to (used for locators that return multiple elements). Defaults to 0.
+        timeout (float, optional): The time (in seconds) to attempt switching before timing out. Defaults to None, which uses the wait default (30 seconds).
+        poll_interval (float, optional): The time (in seconds) between the first two attempts. Defaults to None, which uses the wait default.
+
+    Returns:
+        True if the iframe was located and switched to
+        False if the iframe was not located and not switched to
+    """
+    condition = frame_available(resolve_locator(type), value, index)
+
+    result = wait_until(condition, driver, timeout=timeout, poll_interval=poll_interval)
+    if not result:
+        logger.warning('Error switching to iframe: %s', result.last_exception or 'timed out')
+        record_failure(result.last_exception or 'timed out')
+    return result.success
+
+
+@instrumented()
+def switch_to_default_frame(driver):
+    """
+    Switches the WebDriver context back to the default content frame.
+
+    Args:
+        driver (selenium.webdriver): The Selenium WebDriver instance.
+
+    Returns:
+        True
+    """
+    driver.switch_to.default_content()
+    cache = get_element_cache(driver)
+    if cache is not None:
+        cache.invalidate()
+    return True
@@ -0,0 +1,190 @@
+import logging
+
+from ..instrumentation import instrumented, record_failure
+from .waits import wait_until, resolve_locator
+
+logger = logging.getLogger(__name__)
+
+# Finds and fills every requested field in one round-trip. Each field is
+# [by, value, index, text, force_keys]; the script returns [status, detail]
+# per field where status is 'ok', 'missing', 'keys' (needs real key events;
+# detail is the element) or 'error' (cannot be filled; detail is the reason).
+_FILL_FORM_SCRIPT = """
+const fields = arguments[0];
+const KEY_EVENT_TYPES = ['file', 'date', 'datetime-local', 'month', 'time', 'week', 'color', 'range'];
+const CHECKABLE_TYPES = ['checkbox', 'radio'];
+const UNCHECKED_TEXTS = ['', 'false', '0', 'off', 'no'];
+
+function locate(by, value, index) {
+    switch (by) {
+        case 'xpath':
+            return document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotItem(index);
+        case 'css selector':
+            return document.querySelectorAll(value)[index];
+        case 'id':
+            return document.querySelectorAll('[id="' + CSS.escape(value) + '"]')[index];
+        case 'name':
+            return document.getElementsByName(value)[index];
+        case 'class name':
+            return document.getElementsByClassName(value)[index];
+        case 'tag name':
+            return document.getElementsByTagName(value)[index];
+        case 'link text':
+        case 'partial link text':
+            const links = Array.from(document.getElementsByTagName('a')).filter(function (a) {
+                const text = a.innerText.trim();
+                return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+            });
+            return links[index];
+    }
+    return null;
+}
+
+function setChecked(element, text) {
+    const checked = UNCHECKED_TEXTS.indexOf(text.trim().toLowerCase()) === -1;
+    if (element.checked !== checked) {
+        // A click toggles the box and fires the click, input and change events pages listen for.
+        element.click();
+    }
+    return element.checked === checked;
+}
+
+function setValue(element, text) {
+    const tag = element.tagName;
+    let prototype = null;
+    if (tag === 'INPUT') {
+        if (KEY_EVENT_TYPES.indexOf((element.type || '').toLowerCase()) !== -1) {
+            return false;
+        }
+        prototype = HTMLInputElement.prototype;
+    } else if (tag === 'TEXTAREA') {
+        prototype = HTMLTextAreaElement.prototype;
+    } else if (tag === 'SELECT') {
+        const option = Array.from(element.options).find(function (o) {
+            return o.value === text || o.text.trim() === text;
+        });
+        if (!option) {
+            return false;
+        }
+        element.value = option.value;
+    } else {
+        return false;
+    }
+    if (prototype !== null) {
+        // Use the native setter so frameworks that track the value (e.g. React) see the change.
+        Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, text);
+    }
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    return true;
+}
+
+return fields.map(function (field) {
+    let element;
+    try {
+        element = locate(field[0], field[1], field[2]);
+    } catch (error) {
+        return ['error', String(error)];
+    }
+    if (!element) {
+        return ['missing', null];
+    }
+    if (element.tagName === 'INPUT' && CHECKABLE_TYPES.indexOf((element.type || '').toLowerCase()) !== -1) {
+        if (element.disabled) {
+            return ['error', 'the ' + element.type + ' is disabled'];
+        }
+        return setChecked(element, field[3]) ? ['ok', null] : ['error', 'the ' + element.type + ' did not change'];
+    }
+    if (field[4] || element.disabled || element.readOnly || !setValue(element, field[3])) {
+        return ['keys', element];
+    }
+    return ['ok', null];
+});
+"""
+
+
+def _normalize_locator(locator, type):
+    """
+    Turns a ``fill_form`` key into ``(by, value, index)``.
+    """
+    if isinstance(locator, str):
+        return resolve_locator(type), locator, 0
+    if len(locator) == 2:
+        locator_type, value = locator
+        return resolve_locator(locator_type), value, 0
+    locator_type, value, index = locator
+    return resolve_locator(locator_type), value, index
+
+
+@instrumented()
+def fill_form(driver, fields, type='XPATH', key_events=None, timeout=None, poll_interval=None):
+    """
+    Fills many input fields on a webpage in a single WebDriver round-trip.
+
+    All fields are located and filled by one ``execute_script`` call. Checkboxes and radio
+    buttons are checked unless their text is '', 'false', '0', 'off' or 'no' (ignoring case);
+    they are clicked when their state has to change. Fields the script cannot fill directly
+    (file and date inputs, editable non-input elements, or anything listed in ``key_events``)
+    are cleared and typed into with ``send_keys``. Fields that are not on the page yet are
+    retried with backoff until the timeout; a locator the browser rejects (such as malformed
+    XPath) fails its field at once. Unlike ``send_text``, filled fields are replaced rather
+    than appended to.
+
+    Args:
+        driver (selenium.webdriver): The Selenium WebDriver instance.
+        fields (dict): Maps each locator to the text to enter. A locator is either a value
+            string (using ``type``), a ``(type, value)`` tuple or a ``(type, value, index)`` tuple.
+        type (str, optional): The locator type for string locators (e.g., 'XPATH', 'CSS_SELECTOR', 'ID', etc.). Defaults to 'XPATH'.
+        key_events (iterable, optional): Locators that must be filled with real key events. Defaults to None.
+        timeout (float, optional): The time (in seconds) to wait for missing fields before timing out. Defaults to None, which uses the wait default (30 seconds).
+        poll_interval (float, optional): The time (in seconds) between the first two attempts. Defaults to None, which uses the wait default.
+
+    Returns:
+        dict: Maps each locator in ``fields`` to True if it was filled, False otherwise.
+
+    Example:
+        ```python
+        results = fill_form(driver, {
+            '//input[@name="first"]': 'Cosmo',
+            ('ID', 'amount'): 125.50,
+        })
+        failed = {locator: fields[locator] for locator, ok in results.items() if not ok}
+        ```
+    """
+    key_events = set(key_events or ())
+    requests = {
+        locator: _normalize_locator(locator, type) + (str(text), locator in key_events)
+        for locator, text in fields.items()
+    }
+    results = {locator: False for locator in fields}
+    errors = {}
+    pending = list(requests)
+
+    def fill_pending(driver):
+        statuses = driver.execute_script(_FILL_FORM_SCRIPT, [list(requests[locator]) for locator in pending])
+        missing = []
+        for locator, (status, detail) in zip(pending, statuses):
+            if status == 'ok':
+                results[locator] = True
+            elif status == 'keys':
+                try:
+                    detail.clear()
+                    detail.send_keys(requests[locator][3])
+                    results[locator] = True
+                except Exception as e:
+                    errors[locator] = e
+            elif status == 'error':
+                errors[locator] = detail
+            else:
+                missing.append(locator)
+        pending[:] = missing
+        return not pending
+
+    wait_until(fill_pending, driver, timeout=timeout, poll_interval=poll_interval)
+
+    failed = {locator: errors.get(locator, 'not found') for locator, ok in results.items() if not ok}
+    if failed:
+        message = f'Error filling form: {len(failed)} of {len(results)} fields were not filled: {failed}'
+        logger.warning('%s', message)
+        record_failure(message)
+    return results
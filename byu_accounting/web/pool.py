@@ -0,0 +1,246 @@
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from .cache import get_element_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobResult:
+    """
+    Outcome of one job run by a :class:`SessionPool`.
+
+    Attributes:
+        name: The job name (the key or position it was submitted with).
+        value: What the job returned, or None if it raised.
+        error (Exception): The exception the job raised, if any.
+        elapsed (float): Wall time spent running the job, in seconds.
+    """
+    name: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+
+    @property
+    def success(self):
+        return self.error is None
+
+
+@dataclass
+class PoolReport:
+    """
+    Results and throughput for one :meth:`SessionPool.run` call.
+
+    Attributes:
+        results (list): One :class:`JobResult` per job, in submission order.
+        elapsed (float): Wall time for the whole run, in seconds.
+        sessions_started (int): WebDriver sessions created during the run.
+    """
+    results: List[JobResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    sessions_started: int = 0
+
+    @property
+    def succeeded(self):
+        return [r for r in self.results if r.success]
+
+    @property
+    def failed(self):
+        return [r for r in self.results if not r.success]
+
+    @property
+    def jobs_per_second(self):
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (f'{len(self.succeeded)} succeeded, {len(self.failed)} failed in {self.elapsed:.1f}s '
+                f'({self.jobs_per_second:.2f} jobs/s, {self.sessions_started} sessions started)')
+
+
+def chrome_factory(headless=True, arguments=()):
+    """
+    Returns a driver factory that starts Chrome, headless by default.
+
+    Args:
+        headless (bool, optional): Whether to run Chrome without a window. Defaults to True.
+        arguments (iterable, optional): Extra Chrome command-line arguments. Defaults to ().
+
+    Returns:
+        callable: A function that takes no arguments and returns a new ``webdriver.Chrome``.
+    """
+    def create():
+        from selenium import webdriver
+
+        options = webdriver.ChromeOptions()
+        if headless:
+            options.add_argument('--headless=new')
+            options.add_argument('--no-sandbox')
+            options.add_argument('--disable-dev-shm-usage')
+        for argument in arguments:
+            options.add_argument(argument)
+        return webdriver.Chrome(options=options)
+    return create
+
+
+class SessionPool:
+    """
+    Keeps up to ``size`` WebDriver sessions alive and runs jobs on them concurrently.
+
+    Each worker thread owns one session and reuses it from job to job. A job that
+    raises is recorded as failed without stopping the others; if its session no longer
+    responds afterwards, the session is quit and a new one is started for the next job.
+
+    Args:
+        driver_factory (callable): Takes no arguments and returns a new WebDriver (or any object with the same interface).
+        size (int, optional): Number of sessions (and worker threads). Defaults to 4.
+        reset (callable, optional): Called with the driver before each job, e.g. to navigate to a start page. Defaults to None.
+        max_jobs_per_session (int, optional): Restart a session after this many jobs. Defaults to None (never).
+
+    Example:
+        ```python
+        def reconcile(driver, company):
+            driver.get(company['url'])
+            click_button('//button[@id="reconcile"]', driver)
+            return send_text(company['balance'], '//input[@name="ending"]', driver)
+
+        with SessionPool(chrome_factory(), size=8) as pool:
+            report = pool.map(reconcile, {c['name']: c for c in companies})
+        print(report.summary())
+        ```
+    """
+
+    def __init__(self, driver_factory, size=4, reset=None, max_jobs_per_session=None):
+        if size < 1:
+            raise ValueError('size must be at least 1.')
+        self.driver_factory = driver_factory
+        self.size = size
+        self.reset = reset
+        self.max_jobs_per_session = max_jobs_per_session
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='byu-session')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._drivers = set()
+        self._sessions_started = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _acquire(self):
+        driver = getattr(self._local, 'driver', None)
+        if driver is None:
+            driver = self.driver_factory()
+            self._local.driver = driver
+            self._local.jobs = 0
+            with self._lock:
+                self._drivers.add(driver)
+                self._sessions_started += 1
+        return driver
+
+    def _discard(self, driver):
+        self._local.driver = None
+        with self._lock:
+            self._drivers.discard(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _run_job(self, name, job):
+        start_time = time.perf_counter()
+        result = JobResult(name)
+        driver = None
+        try:
+            driver = self._acquire()
+            if self.reset is not None:
+                self.reset(driver)
+            result.value = job(driver)
+        except Exception as e:
+            result.error = e
+            logger.warning('job %r failed: %s', name, e)
+        result.elapsed = time.perf_counter() - start_time
+
+        if driver is not None:
+            self._local.jobs += 1
+            cache = get_element_cache(driver)
+            if cache is not None:
+                cache.invalidate()
+            worn_out = self.max_jobs_per_session is not None and self._local.jobs >= self.max_jobs_per_session
+            if worn_out or (result.error is not None and not self._is_alive(driver)):
+                self._discard(driver)
+        return result
+
+    def run(self, jobs):
+        """
+        Runs jobs concurrently and waits for all of them to finish.
+
+        Args:
+            jobs (dict or iterable): Callables that take a driver. Pass a dict to name each job
+                (e.g. by company); otherwise jobs are named by position.
+
+        Returns:
+            PoolReport: The per-job results and throughput.
+        """
+        named_jobs = jobs.items() if hasattr(jobs, 'items') else enumerate(jobs)
+        with self._lock:
+            sessions_before = self._sessions_started
+        start_time = time.perf_counter()
+
+        # Each job runs in a copy of the caller's context, so its calls are traced under the caller's span
+        futures = [self._executor.submit(contextvars.copy_context().run, self._run_job, name, job)
+                   for name, job in named_jobs]
+        report = PoolReport(results=[future.result() for future in futures])
+
+        report.elapsed = time.perf_counter() - start_time
+        with self._lock:
+            report.sessions_started = self._sessions_started - sessions_before
+        logger.info('session pool run: %s', report.summary())
+        return report
+
+    def map(self, func, items):
+        """
+        Runs ``func(driver, item)`` for every item.
+
+        Args:
+            func (callable): Takes a driver and one item.
+            items (dict or iterable): The items. Pass a dict to name each job by its key.
+
+        Returns:
+            PoolReport: The per-job results and throughput.
+        """
+        if hasattr(items, 'items'):
+            return self.run({name: _bind(func, item) for name, item in items.items()})
+        return self.run([_bind(func, item) for item in items])
+
+    def close(self):
+        """
+        Waits for running jobs, then quits every session.
+        """
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            drivers, self._drivers = self._drivers, set()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+def _bind(func, item):
+    return lambda driver: func(driver, item)
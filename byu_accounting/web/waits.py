@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from ..instrumentation import record_retry
+from .cache import get_element_cache
+
+logger = logging.getLogger(__name__)
+
+LOCATOR_TYPES = {
+    'XPATH': By.XPATH,
+    'CLASS_NAME': By.CLASS_NAME,
+    'CSS_SELECTOR': By.CSS_SELECTOR,
+    'ID': By.ID,
+    'NAME': By.NAME,
+    'LINK_TEXT': By.LINK_TEXT,
+    'PARTIAL_LINK_TEXT': By.PARTIAL_LINK_TEXT,
+    'TAG_NAME': By.TAG_NAME,
+}
+
+# Defaults used when a helper is called without explicit wait settings.
+_defaults = {
+    'timeout': 30.0,
+    'poll_interval': 0.05,
+    'max_poll_interval': 1.0,
+    'backoff': 1.5,
+}
+
+_local = threading.local()
+
+
+@dataclass
+class WaitResult:
+    """
+    Outcome of a single :func:`wait_until` call.
+
+    Attributes:
+        value: The truthy value returned by the condition, or None if the wait timed out.
+        success (bool): Whether the condition was met before the timeout.
+        polls (int): How many times the condition was evaluated.
+        elapsed (float): Wall time spent waiting, in seconds.
+        last_exception (Exception): The last exception raised by the condition, if any.
+    """
+    value: Any = None
+    success: bool = False
+    polls: int = 0
+    elapsed: float = 0.0
+    last_exception: Optional[BaseException] = None
+
+    def __bool__(self):
+        return self.success
+
+
+def set_wait_defaults(timeout=None, poll_interval=None, max_poll_interval=None, backoff=None):
+    """
+    Changes the default wait settings used by the Selenium helpers.
+
+    Args:
+        timeout (float, optional): Seconds to wait before giving up. Defaults to 30.
+        poll_interval (float, optional): Seconds between the first two polls. Defaults to 0.05.
+        max_poll_interval (float, optional): Upper bound on the time between polls. Defaults to 1.0.
+        backoff (float, optional): Factor the poll interval grows by after each failed poll. Defaults to 1.5.
+
+    Returns:
+        dict: The updated default settings.
+    """
+    updates = {
+        'timeout': timeout,
+        'poll_interval': poll_interval,
+        'max_poll_interval': max_poll_interval,
+        'backoff': backoff,
+    }
+    for key, value in updates.items():
+        if value is not None:
+            _defaults[key] = float(value)
+    return dict(_defaults)
+
+
+def last_wait():
+    """
+    Returns the :class:`WaitResult` of the most recent wait in the current thread.
+
+    Returns:
+        WaitResult: The last result, or None if this thread has not waited yet.
+    """
+    return getattr(_local, 'last', None)
+
+
+def resolve_locator(type):
+    """
+    Maps a locator type name such as 'XPATH' to its Selenium ``By`` value.
+
+    Raises:
+        ValueError: If the locator type is not supported.
+    """
+    try:
+        return LOCATOR_TYPES[type]
+    except KeyError:
+        raise ValueError(f"Invalid locator type '{type}'. Valid options are: {list(LOCATOR_TYPES.keys())}") from None
+
+
+def wait_until(condition, driver, timeout=None, poll_interval=None, max_poll_interval=None, backoff=None):
+    """
+    Polls ``condition(driver)`` with exponential backoff until it returns a truthy value.
+
+    Exceptions raised by the condition are treated as "not yet" and retried until the timeout.
+
+    Args:
+        condition (callable): Called with the driver; returns a truthy value once satisfied.
+        driver (selenium.webdriver): The Selenium WebDriver instance.
+        timeout (float, optional): Seconds to wait before giving up. Defaults to the value from :func:`set_wait_defaults`.
+        poll_interval (float, optional): Seconds between the first two polls.
+        max_poll_interval (float, optional): Upper bound on the time between polls.
+        backoff (float, optional): Factor the poll interval grows by after each failed poll.
+
+    Returns:
+        WaitResult: The result, which is truthy if the condition was met.
+    """
+    timeout = _defaults['timeout'] if timeout is None else timeout
+    interval = _defaults['poll_interval'] if poll_interval is None else poll_interval
+    max_interval = _defaults['max_poll_interval'] if max_poll_interval is None else max_poll_interval
+    backoff = _defaults['backoff'] if backoff is None else backoff
+
+    result = WaitResult()
+    start_time = time.monotonic()
+    deadline = start_time + timeout
+
+    while True:
+        result.polls += 1
+        try:
+            value = condition(driver)
+        except Exception as e:
+            value = None
+            result.last_exception = e
+        if value:
+            result.value = value
+            result.success = True
+            break
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(interval, remaining))
+        interval = min(interval * backoff, max_interval)
+
+    result.elapsed = time.monotonic() - start_time
+    _local.last = result
+    record_retry(result.polls - 1)
+    logger.debug('wait %s after %d polls in %.3fs', 'succeeded' if result.success else 'timed out', result.polls, result.elapsed)
+    return result
+
+
+# ----- Expected conditions -----
+
+def _find(driver, by, value, index):
+    if index != 0:  # Handle multiple elements for the locator
+        elements = driver.find_elements(by, value)
+        if len(elements) <= index:
+            raise IndexError(f"No element found at index {index} for {by} '{value}'.")
+        return elements[index]
+    return driver.find_element(by, value)
+
+
+def _with_element(driver, by, value, index, use):
+    """
+    Locates the element (through the driver's element cache, if enabled) and returns ``use(element)``.
+    """
+    cache = get_element_cache(driver)
+    if cache is None:
+        return use(_find(driver, by, value, index))
+    try:
+        return use(cache.lookup(driver, by, value, index, _find))
+    except StaleElementReferenceException:
+        # The page changed under a cached element; look it up again once.
+        cache.discard(by, value, index)
+        return use(cache.lookup(driver, by, value, index, _find))
+
+
+def element_located(by, value, index=0, action=None):
+    """
+    Condition that returns the element at ``index`` for the locator once it exists.
+
+    If ``action`` is given, it is called with the element and its result is returned instead.
+    """
+    def use(element):
+        return action(element) if action is not None else element
+
+    return lambda driver: _with_element(driver, by, value, index, use)
+
+
+def element_visible(by, value, index=0, action=None):
+    """
+    Condition that returns the element once it exists and is displayed.
+
+    If ``action`` is given, it is called with the element and its result is returned instead.
+    """
+    def use(element):
+        if not element.is_displayed():
+            return False
+        return action(element) if action is not None else element
+
+    return lambda driver: _with_element(driver, by, value, index, use)
+
+
+def element_clickable(by, value, index=0, action=None):
+    """
+    Condition that returns the element once it exists, is displayed and is enabled.
+
+    If ``action`` is given, it is called with the element and its result is returned instead.
+    """
+    def use(element):
+        if not (element.is_displayed() and element.is_enabled()):
+            return False
+        return action(element) if action is not None else element
+
+    return lambda driver: _with_element(driver, by, value, index, use)
+
+
+def frame_available(by, value, index=0):
+    """
+    Condition that switches the driver into the iframe once it exists and returns True.
+    """
+    def switch(driver):
+        _with_element(driver, by, value, index, driver.switch_to.frame)
+        cache = get_element_cache(driver)
+        if cache is not None:
+            cache.enter_frame(by, value, index)
+        return True
+
+    return switch
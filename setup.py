@@ -1,4 +1,4 @@
-from setuptools import setup
+from setuptools import setup, find_packages
 
 setup(
     name='byu_accounting',
@@ -8,15 +8,19 @@ setup(
     author='Josh Lee',
     author_email='joshlee84@byu.edu',
     license='MIT',
-    packages=['byu_accounting'],
+    packages=find_packages(include=['byu_accounting', 'byu_accounting.*']),
     install_requires=[
         'requests',
-        'pypdf',
+        'pypdf>=6.10,<7',  # compress_identical_objects(remove_duplicates=..., remove_unreferenced=...)
         'pandas',
         'selenium',
         'tk',
         'numpy',
     ],
+    extras_require={
+        'async': ['aiohttp'],
+        'parquet': ['pyarrow'],
+    },
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
     classifiers=[
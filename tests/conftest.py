@@ -0,0 +1,115 @@
+"""
+Shared test fakes: stand-ins for ``requests.Session``, the QuickBooks token endpoint, and QuickBooks clients.
+
+The browser and PDF fakes used by the benchmarks are imported from the ``benchmarks`` directory
+(``benchmarks.fake_driver``, ``benchmarks.pdf_fixtures``), which pytest puts on the path (see setup.cfg).
+"""
+import json
+import re
+import time
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+from byu_accounting.quickbooks import QuickBooksClient, QuickBooksTokenManager
+
+
+def json_response(payload, status_code=200):
+    """
+    Returns a ``requests.Response`` with a JSON body.
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload).encode()
+    return response
+
+
+class FakeSession:
+    """
+    Stands in for ``requests.Session`` in a QuickBooksClient: answers API requests from recorded responses.
+
+    ``/batch`` requests create each item's entity with its bId as the Id.
+
+    Args:
+        queries (dict, optional): Entity name -> query response, returned for the first page of
+            ``SELECT * FROM <entity>``. Later pages are empty.
+        cdc (dict, optional): The response to ``/cdc`` requests.
+        failing_batches (iterable, optional): Which ``/batch`` requests (counting from 0) are answered
+            with a 400 error instead.
+    """
+
+    def __init__(self, queries=None, cdc=None, failing_batches=()):
+        self.queries = queries or {}
+        self.cdc = cdc
+        self.failing_batches = set(failing_batches)
+        self.requests = []
+
+    def request(self, method, url, params=None, json=None, headers=None, timeout=None):
+        endpoint = urlparse(url).path.rsplit('/', 1)[-1]
+        self.requests.append((method, endpoint, dict(params or {})))
+        if endpoint == 'cdc':
+            return json_response(self.cdc)
+        if endpoint == 'query':
+            match = re.match(r'SELECT \* FROM (\w+).* STARTPOSITION (\d+) MAXRESULTS \d+$', params['query'])
+            entity, start_position = match.group(1), int(match.group(2))
+            return json_response(self.queries[entity] if start_position == 1 else {'QueryResponse': {}})
+        if endpoint == 'batch':
+            if len(self.calls('batch')) - 1 in self.failing_batches:
+                return json_response({'Fault': {'Error': [{'Message': 'Request has invalid or unsupported property'}],
+                                                'type': 'ValidationFault'}}, status_code=400)
+            return json_response({'BatchItemResponse': self.answer_batch(json['BatchItemRequest'])})
+        raise AssertionError(f'unexpected request to {url}')
+
+    def answer_batch(self, items):
+        responses = []
+        for item in items:
+            entity = next(key for key in item if key not in ('bId', 'operation'))
+            responses.append({'bId': item['bId'], entity: {**item[entity], 'Id': item['bId']}})
+        return responses
+
+    def calls(self, endpoint):
+        """
+        Returns the query parameters of each request made to ``endpoint``.
+        """
+        return [params for _, called, params in self.requests if called == endpoint]
+
+
+class FakeTokenEndpoint:
+    """
+    Stands in for the session a QuickBooksTokenManager refreshes with. Like QuickBooks often does,
+    it returns the same refresh token with each new access token ('access-1', 'access-2', ...).
+    """
+
+    def __init__(self):
+        self.refreshes = 0
+
+    def post(self, url, data=None, auth=None, headers=None, timeout=None):
+        self.refreshes += 1
+        return json_response({'access_token': f'access-{self.refreshes}', 'refresh_token': data['refresh_token'],
+                              'expires_in': 3600, 'x_refresh_token_expires_in': 8726400})
+
+
+@pytest.fixture
+def token_endpoint():
+    return FakeTokenEndpoint()
+
+
+@pytest.fixture
+def fake_session():
+    """
+    Returns :class:`FakeSession`, to build with the recorded responses a test needs.
+    """
+    return FakeSession
+
+
+@pytest.fixture
+def make_client():
+    """
+    Returns a function that builds a QuickBooksClient on a fake session, with a valid access token.
+    """
+    def make(session, realm_id='1', **kwargs):
+        tokens = {'accessToken': 'access', 'refreshToken': 'refresh', 'expiresAt': time.time() + 3600}
+        return QuickBooksClient(realm_id, QuickBooksTokenManager('id', 'secret', tokens=tokens),
+                                session=session, **kwargs)
+    return make
@@ -0,0 +1,133 @@
+"""
+Tests for the dialog backends: the non-interactive answers, backend selection and the DialogBackend interface.
+"""
+import json
+
+import pytest
+
+from byu_accounting.dialogs import backends
+from byu_accounting.dialogs.backends import (
+    ANSWERS_FILE_ENV_VAR, BACKEND_ENV_VAR, DialogBackend, MissingAnswerError, NonInteractiveBackend,
+    answer_env_var, get_backend, input_form, select_file, set_backend, show_message, single_input,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_backend(monkeypatch):
+    monkeypatch.setattr(backends, '_current', None)
+    monkeypatch.delenv(BACKEND_ENV_VAR, raising=False)
+    monkeypatch.delenv(ANSWERS_FILE_ENV_VAR, raising=False)
+
+
+def test_answer_env_var():
+    assert answer_env_var('Client ID:') == 'BYU_ACCOUNTING_ANSWER_CLIENT_ID'
+
+
+def test_answers_from_dict_then_environment_then_file(tmp_path, monkeypatch):
+    path = tmp_path / 'answers.json'
+    path.write_text(json.dumps({'Username': 'from-file', 'Realm': 'from-file'}))
+    monkeypatch.setenv(answer_env_var('Realm'), 'from-env')
+    backend = NonInteractiveBackend(answers={'Username': 'cosmo'}, path=str(path))
+
+    assert backend.single_input('Username') == 'cosmo'
+    assert backend.single_input('Realm') == 'from-env'
+    monkeypatch.delenv(answer_env_var('Realm'))
+    assert backend.single_input('Realm') == 'from-file'
+
+
+def test_answers_are_strings():
+    assert NonInteractiveBackend(answers={'Year': 2024}).single_input('Year') == '2024'
+
+
+def test_missing_answer_raises_instead_of_waiting():
+    with pytest.raises(MissingAnswerError, match='BYU_ACCOUNTING_ANSWER_PASSWORD'):
+        NonInteractiveBackend().single_input('Password', mask=True)
+
+
+def test_input_form_prefers_answers_keyed_by_form():
+    backend = NonInteractiveBackend(answers={'Login': {'Username': 'cosmo'}, 'Username': 'other',
+                                             'Password': 'secret'})
+
+    assert backend.input_form('Login', ['Username', 'Password']) == {'Username': 'cosmo', 'Password': 'secret'}
+    assert backend.input_form('Other', ['Username']) == {'Username': 'other'}
+
+
+def test_input_form_checks_masks():
+    with pytest.raises(Exception, match='masks'):
+        NonInteractiveBackend(answers={'A': 'a'}).input_form('Form', ['A'], masks=[True, False])
+
+
+def test_show_message_is_kept(caplog):
+    backend = NonInteractiveBackend()
+
+    with caplog.at_level('INFO', logger=backends.__name__):
+        assert backend.show_message('Done', 'All files sent') is None
+
+    assert backend.messages == [('Done', 'All files sent')]
+    assert 'Done: All files sent' in caplog.text
+
+
+def test_select_file_requires_an_existing_file(tmp_path):
+    existing = tmp_path / 'report.csv'
+    existing.write_text('')
+    backend = NonInteractiveBackend(answers={'Report': str(existing), 'Missing': str(tmp_path / 'missing.csv')})
+
+    assert backend.select_file('Report') == str(existing)
+    with pytest.raises(FileNotFoundError):
+        backend.select_file('Missing')
+
+
+def test_dialog_functions_use_the_backend_set():
+    backend = set_backend('noninteractive', answers={'Username': 'cosmo', 'Password': 'secret'})
+
+    assert get_backend() is backend
+    assert single_input('Username') == 'cosmo'
+    assert input_form('Login', ['Username', 'Password']) == {'Username': 'cosmo', 'Password': 'secret'}
+    show_message('Title', 'Message')
+    assert backend.messages == [('Title', 'Message')]
+    with pytest.raises(MissingAnswerError):
+        select_file('Statement')
+
+
+def test_backend_chosen_from_environment(tmp_path, monkeypatch):
+    path = tmp_path / 'answers.json'
+    path.write_text(json.dumps({'Username': 'cosmo'}))
+    monkeypatch.setenv(BACKEND_ENV_VAR, 'noninteractive')
+    monkeypatch.setenv(ANSWERS_FILE_ENV_VAR, str(path))
+
+    assert isinstance(get_backend(), NonInteractiveBackend)
+    assert single_input('Username') == 'cosmo'
+
+
+def test_answers_file_selects_noninteractive_automatically(tmp_path, monkeypatch):
+    path = tmp_path / 'answers.json'
+    path.write_text('{}')
+    monkeypatch.setenv(ANSWERS_FILE_ENV_VAR, str(path))
+
+    assert backends.auto_backend() == 'noninteractive'
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match='Unknown dialog backend'):
+        set_backend('carrier-pigeon')
+
+
+def test_incomplete_backend_cannot_be_instantiated():
+    class MessagesOnly(DialogBackend):
+        def show_message(self, title, message, width=0, height=0):
+            pass
+
+    with pytest.raises(TypeError):
+        MessagesOnly()
+
+
+def test_registered_backend():
+    class Recording(NonInteractiveBackend):
+        name = 'recording'
+
+    backends.register_backend('recording', Recording)
+    try:
+        assert set_backend('recording', answers={'Username': 'cosmo'}).name == 'recording'
+        assert single_input('Username') == 'cosmo'
+    finally:
+        del backends._BACKENDS['recording']
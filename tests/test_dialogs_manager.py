@@ -0,0 +1,56 @@
+"""
+Tests for the per-thread dialog manager and the tk backend that uses it. No windows are shown.
+"""
+import threading
+
+import pytest
+
+from byu_accounting.dialogs.backends import TkBackend
+
+manager = pytest.importorskip('byu_accounting.dialogs.manager', reason='tkinter is not installed')
+
+
+def test_manager_is_shared_within_a_thread():
+    assert manager.get_manager() is manager.get_manager()
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(manager.get_manager()))
+    thread.start()
+    thread.join()
+    assert other[0] is not manager.get_manager()
+
+
+def test_root_is_created_on_first_dialog(monkeypatch):
+    monkeypatch.setattr(manager.tk, 'Tk', lambda: pytest.fail('Tk root created before a dialog'))
+
+    with manager.DialogManager() as dialogs:
+        assert dialogs._root is None
+
+
+class RecordingManager:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def dialog(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return name
+        return dialog
+
+
+def test_tk_backend_uses_the_thread_manager(monkeypatch):
+    recording = RecordingManager()
+    monkeypatch.setattr(manager, 'get_manager', lambda: recording)
+    backend = TkBackend()
+
+    assert backend.single_input('Password', mask=True) == 'single_input'
+    backend.input_form('Login', ['Username'])
+    backend.show_message('Done', 'Sent')
+    backend.select_file('Statement', filetypes=[('CSV files', '*.csv')])
+
+    assert recording.calls == [
+        ('single_input', ('Password',), {'mask': True, 'width': 300, 'height': 150}),
+        ('input_form', (), {'prompt': 'Login', 'inputs': ['Username'], 'masks': None, 'width': 0, 'height': 0}),
+        ('show_message', ('Done', 'Sent'), {'width': 0, 'height': 0}),
+        ('select_file', ('Statement',), {'filetypes': [('CSV files', '*.csv')]}),
+    ]
@@ -0,0 +1,100 @@
+"""
+Tests for the cached theme detection and the theme override.
+"""
+import pytest
+
+from byu_accounting.dialogs import theme
+from byu_accounting.dialogs.theme import THEME_ENV_VAR, ThemeService
+
+
+@pytest.fixture
+def detections(monkeypatch):
+    """
+    Replaces system detection with a counter; set ``state['dark']`` to change the detected theme.
+    """
+    state = {'dark': True, 'calls': 0}
+
+    def detect():
+        state['calls'] += 1
+        return state['dark']
+
+    monkeypatch.setattr(theme, 'detect_dark_mode', detect)
+    monkeypatch.delenv(THEME_ENV_VAR, raising=False)
+    return state
+
+
+def test_detects_once(detections):
+    service = ThemeService()
+
+    assert [service.theme() for _ in range(3)] == ['dark'] * 3
+    assert detections['calls'] == 1
+
+
+def test_refresh_and_clear_detect_again(detections):
+    service = ThemeService()
+    service.theme()
+    detections['dark'] = False
+
+    assert service.theme() == 'dark'
+    assert service.theme(refresh=True) == 'light'
+    detections['dark'] = True
+    service.clear()
+    assert service.is_dark_mode()
+    assert detections['calls'] == 3
+
+
+def test_ttl_expires_the_detected_theme(detections, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(theme.time, 'monotonic', lambda: now[0])
+    service = ThemeService(ttl=60)
+    service.theme()
+
+    now[0] += 30
+    service.theme()
+    assert detections['calls'] == 1
+    now[0] += 31
+    service.theme()
+    assert detections['calls'] == 2
+
+
+def test_override_skips_detection(detections):
+    service = ThemeService(theme='Light')
+
+    assert service.theme() == 'light'
+    service.set_theme('auto')
+    assert service.theme() == 'dark'
+    assert detections['calls'] == 1
+
+
+def test_environment_variable(detections, monkeypatch):
+    monkeypatch.setenv(THEME_ENV_VAR, 'light')
+
+    assert ThemeService().theme() == 'light'
+    assert detections['calls'] == 0
+
+
+def test_invalid_theme():
+    with pytest.raises(ValueError, match='theme must be one of'):
+        ThemeService(theme='solarized')
+
+
+def test_set_theme_applies_to_is_dark_mode(detections, monkeypatch):
+    monkeypatch.setattr(theme, '_service', ThemeService())
+
+    theme.set_theme('light')
+    assert not theme.is_dark_mode()
+    theme.set_theme(None)
+    assert theme.is_dark_mode()
+
+
+def test_linux_reads_gtk_settings(tmp_path, monkeypatch):
+    monkeypatch.delenv('GTK_THEME', raising=False)
+    monkeypatch.setenv('XDG_CONFIG_HOME', str(tmp_path))
+    assert not theme._detect_linux()
+
+    (tmp_path / 'gtk-3.0').mkdir()
+    (tmp_path / 'gtk-3.0' / 'settings.ini').write_text('[Settings]\ngtk-theme-name=Adwaita-dark\n')
+    assert theme._detect_linux()
+
+    monkeypatch.setenv('GTK_THEME', 'Adwaita:light')
+    assert not theme._detect_linux()
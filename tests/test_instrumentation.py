@@ -0,0 +1,130 @@
+"""
+Tests for the opt-in instrumentation: wrapped exports, reported failures and spans in worker threads.
+"""
+import contextlib
+import contextvars
+
+import pytest
+
+import byu_accounting
+from benchmarks.fake_driver import FakeDriver
+from byu_accounting import instrumentation
+from byu_accounting.web import SessionPool, click_button
+
+
+class RecordingSpan:
+    def __init__(self, name, parent):
+        self.name = name
+        self.parent = parent
+        self.attributes = {}
+        self.exceptions = []
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        self.exceptions.append(exception)
+
+
+class RecordingTracer:
+    """
+    Keeps every span with its parent, tracking the current span in a context variable like OpenTelemetry.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._current = contextvars.ContextVar('recording_span', default=None)
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        span = RecordingSpan(name, self._current.get())
+        self.spans.append(span)
+        token = self._current.set(span)
+        try:
+            yield span
+        finally:
+            self._current.reset(token)
+
+    def named(self, name):
+        return [span for span in self.spans if span.name == name]
+
+
+@pytest.fixture
+def tracer():
+    tracer = RecordingTracer()
+    instrumentation.reset_stats()
+    instrumentation.enable(tracer)
+    yield tracer
+    instrumentation.disable()
+    instrumentation.reset_stats()
+
+
+# Reading the statistics is not a call worth recording
+NOT_INSTRUMENTED = {'stats', 'reset_stats', 'enable', 'disable', 'is_enabled'}
+
+
+def test_every_export_is_instrumented():
+    unwrapped = [name for name in byu_accounting.__all__
+                 if callable(getattr(byu_accounting, name)) and not hasattr(getattr(byu_accounting, name), '__wrapped__')]
+    assert set(unwrapped) <= NOT_INSTRUMENTED
+
+
+def test_stats_does_not_record_itself(tracer):
+    byu_accounting.winsorize([1.0, 2.0, 3.0], 0.1, 0.9)
+
+    byu_accounting.stats()
+
+    assert list(byu_accounting.stats()) == ['winsorize']
+
+
+def test_reported_failure_is_recorded(tracer):
+    driver = FakeDriver(appear_after=10, latency=0)
+
+    assert click_button('//button', driver, timeout=0.05, poll_interval=0.01) is False
+
+    assert instrumentation.stats()['click_button']['errors'] == 1
+    [span] = tracer.named('click_button')
+    assert span.attributes['byu_accounting.failed'] is True
+    assert span.attributes['byu_accounting.error']
+
+
+def test_record_failure_keeps_the_exception(tracer):
+    error = ValueError('bad response')
+
+    with instrumentation.span('job'):
+        instrumentation.record_failure(error)
+
+    [span] = tracer.named('job')
+    assert span.exceptions == [error]
+    assert span.attributes['byu_accounting.error'] == 'bad response'
+    assert instrumentation.stats()['job']['errors'] == 1
+
+
+def test_session_pool_jobs_are_traced_under_the_caller(tracer):
+    def job(driver):
+        driver.load()
+        return click_button('//button', driver)
+
+    with SessionPool(lambda: FakeDriver(appear_after=0, latency=0), size=2) as pool:
+        with instrumentation.span('reconcile'):
+            report = pool.run([job] * 4)
+
+    assert all(result.value for result in report.results)
+    [parent] = tracer.named('reconcile')
+    clicks = tracer.named('click_button')
+    assert len(clicks) == 4
+    assert all(span.parent is parent for span in clicks)
+
+
+def test_batch_requests_are_traced_under_the_caller(tracer, fake_session, make_client):
+    client = make_client(fake_session())
+    operations = [{'operation': 'create', 'Invoice': {'Line': []}} for _ in range(75)]
+
+    with instrumentation.span('post_invoices'):
+        responses = client.batch(operations)
+
+    assert [response['bId'] for response in responses] == [str(i) for i in range(75)]
+    [parent] = tracer.named('post_invoices')
+    requests_sent = tracer.named('QuickBooksClient.request')
+    assert len(requests_sent) == 3
+    assert all(span.parent is parent for span in requests_sent)
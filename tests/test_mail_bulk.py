@@ -0,0 +1,79 @@
+"""
+Tests for BulkMailer retries and failures against the benchmarks' SMTP stub.
+"""
+import smtplib
+
+import pytest
+
+from benchmarks.smtp_stub import SmtpStub
+from byu_accounting.mail import BulkMailer
+
+
+@pytest.fixture
+def make_mailer():
+    mailers = []
+
+    def make(stub, **kwargs):
+        mailer = BulkMailer(stub.host, stub.port, starttls=False, retry_delay=0.01, timeout=5, **kwargs)
+        mailers.append(mailer)
+        return mailer
+    yield make
+    for mailer in mailers:
+        mailer.close()
+
+
+def messages(mailer, count):
+    return {f'user{i}@example.com': mailer.build_message(f'user{i}@example.com', 'Statement', 'Attached.')
+            for i in range(count)}
+
+
+def test_sends_over_pooled_connections(make_mailer):
+    with SmtpStub(latency=0, connect_latency=0) as stub:
+        mailer = make_mailer(stub, sender='ar@example.com', connections=2)
+        report = mailer.send(messages(mailer, 20))
+
+    assert len(report.sent) == 20
+    assert stub.messages == 20
+    assert report.connections_opened <= 2
+
+
+def test_transient_replies_are_retried(make_mailer):
+    with SmtpStub(latency=0, connect_latency=0, failure_rate=0.3) as stub:
+        mailer = make_mailer(stub, sender='ar@example.com', max_retries=10)
+        report = mailer.send(messages(mailer, 20))
+
+    assert len(report.sent) == 20
+    assert stub.messages == 20
+
+
+def test_lost_reply_after_data_is_not_resent(make_mailer):
+    with SmtpStub(latency=0, connect_latency=0, drop_replies=1) as stub:
+        mailer = make_mailer(stub, sender='ar@example.com', connections=1)
+        report = mailer.send(messages(mailer, 3))
+
+    [failed] = report.failed
+    assert failed.maybe_sent
+    assert failed.attempts == 1
+    # Every message reached the server exactly once
+    assert stub.messages == 3
+    assert len(report.sent) == 2
+
+
+def test_rejected_login_stops_the_run(make_mailer):
+    with SmtpStub(latency=0, connect_latency=0, password='right') as stub:
+        mailer = make_mailer(stub, username='ar@example.com', password='wrong', connections=2)
+        report = mailer.send(messages(mailer, 50))
+
+    assert len(report.failed) == 50
+    assert all(isinstance(result.error, smtplib.SMTPAuthenticationError) for result in report.results)
+    assert stub.logins <= 2
+    assert stub.messages == 0
+
+
+def test_login(make_mailer):
+    with SmtpStub(latency=0, connect_latency=0, password='right') as stub:
+        mailer = make_mailer(stub, username='ar@example.com', password='right', connections=1)
+        report = mailer.send(messages(mailer, 3))
+
+    assert len(report.sent) == 3
+    assert stub.logins == 1
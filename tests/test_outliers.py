@@ -0,0 +1,93 @@
+"""
+Tests for winsorize/truncate and their DataFrame-level versions.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from byu_accounting.outliers import truncate, truncate_frame, winsorize, winsorize_frame
+
+
+def baseline_winsorize(data, lower, upper):
+    data = np.array(data, dtype=float)
+    low, high = np.nanpercentile(data, [lower * 100, upper * 100])
+    return np.where(np.isnan(data), np.nan, np.clip(data, low, high))
+
+
+def baseline_truncate(data, lower, upper):
+    data = np.array(data, dtype=float)
+    low, high = np.nanpercentile(data, [lower * 100, upper * 100])
+    return np.where(np.isnan(data) | (data < low) | (data > high), np.nan, data)
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    data = rng.standard_t(3, 1000)
+    data[rng.random(1000) < 0.1] = np.nan
+    return data
+
+
+@pytest.mark.parametrize('function, baseline', [(winsorize, baseline_winsorize), (truncate, baseline_truncate)])
+def test_matches_nanpercentile(values, function, baseline):
+    np.testing.assert_allclose(function(values, 0.05, 0.95), baseline(values, 0.05, 0.95))
+    np.testing.assert_allclose(function(values.tolist(), 0.05, 0.95), baseline(values, 0.05, 0.95))
+
+
+def test_out_in_place(values):
+    expected = baseline_winsorize(values, 0.05, 0.95)
+    assert winsorize(values, 0.05, 0.95, out=values) is values
+    np.testing.assert_allclose(values, expected)
+
+
+@pytest.mark.parametrize('series', [
+    pd.Series([1, 2, None, 100, 5], dtype=object),
+    pd.Series([True, False, True, True, False]),
+    pd.Series([1.0, 2.0, np.nan, 100.0, 5.0]),
+])
+def test_pandas_converted_like_arrays(series):
+    result = winsorize(series, 0.1, 0.9)
+    assert isinstance(result, np.ndarray)
+    np.testing.assert_allclose(result, baseline_winsorize(series, 0.1, 0.9))
+
+
+def test_dataframe_uses_thresholds_over_all_values():
+    df = pd.DataFrame({'a': [1.0, 2.0, 3.0, 4.0], 'b': [10.0, 20.0, 30.0, 400.0]})
+    result = winsorize(df, 0.1, 0.9)
+    assert isinstance(result, np.ndarray)
+    np.testing.assert_allclose(result, baseline_winsorize(df, 0.1, 0.9))
+
+
+@pytest.mark.parametrize('dtype', [object, bool])
+def test_frame_series_of_any_dtype(dtype):
+    series = pd.Series([1, 0, 1, 1, 0] if dtype is bool else [1, 2, None, 100, 5], dtype=dtype,
+                       index=list('vwxyz'), name='amount')
+    result = winsorize_frame(series, 0.1, 0.9)
+    assert isinstance(result, pd.Series)
+    assert result.name == 'amount'
+    assert list(result.index) == list('vwxyz')
+    np.testing.assert_allclose(result.to_numpy(), baseline_winsorize(series, 0.1, 0.9))
+
+
+def test_frame_columns_and_groups():
+    df = pd.DataFrame({
+        'industry': ['a'] * 5 + ['b'] * 5,
+        'amount': pd.array([1, 2, 3, 4, 100, 10, 20, 30, 40, 1000], dtype=object),
+        'flag': [True] * 10,
+    }, index=range(100, 110))
+
+    result = truncate_frame(df, 0.1, 0.9, columns=['amount'], by='industry')
+
+    assert list(result.index) == list(df.index)
+    assert result['flag'].dtype == bool
+    for industry, group in df.groupby('industry'):
+        np.testing.assert_allclose(result.loc[group.index, 'amount'].to_numpy(),
+                                   baseline_truncate(group['amount'], 0.1, 0.9))
+
+
+def test_frame_default_columns_skip_keys_and_booleans():
+    df = pd.DataFrame({'year': [2020] * 4 + [2021] * 4, 'x': np.arange(8.0), 'ok': [True, False] * 4})
+    result = winsorize_frame(df, 0.25, 0.75, by='year')
+    assert result['year'].tolist() == df['year'].tolist()
+    assert result['ok'].tolist() == df['ok'].tolist()
+    assert result['x'].tolist() != df['x'].tolist()
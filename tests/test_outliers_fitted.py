@@ -0,0 +1,85 @@
+"""
+Tests for Winsorizer: fitted thresholds, unseen groups and the JSON round-trip.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from byu_accounting.outliers import Winsorizer, truncate, winsorize
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(0)
+    n = 600
+    df = pd.DataFrame({
+        'year': rng.choice([2021, 2022, 2023], n),
+        'industry': rng.choice(['retail', 'mining'], n),
+        'amount': rng.standard_t(3, n),
+        'ratio': rng.standard_t(3, n),
+    })
+    df.loc[rng.random(n) < 0.05, 'amount'] = np.nan
+    return df
+
+
+def test_array_thresholds_match_winsorize():
+    values = np.random.default_rng(1).standard_t(3, 500)
+
+    winsorizer = Winsorizer(0.05, 0.95).fit(values)
+
+    np.testing.assert_allclose(winsorizer.transform(values), winsorize(values, 0.05, 0.95))
+    np.testing.assert_allclose(Winsorizer(0.05, 0.95, mode='truncate').fit_transform(values),
+                               truncate(values, 0.05, 0.95))
+
+
+def test_groups_use_their_own_thresholds(panel):
+    winsorizer = Winsorizer(0.1, 0.9, columns=['amount'], by=['year', 'industry']).fit(panel)
+
+    result = winsorizer.transform(panel)
+
+    assert len(winsorizer.groups_) == 6
+    for _, group in panel.groupby(['year', 'industry']):
+        np.testing.assert_allclose(result.loc[group.index, 'amount'], winsorize(group['amount'], 0.1, 0.9))
+    pd.testing.assert_series_equal(result['ratio'], panel['ratio'])
+
+
+def test_unseen_groups_are_left_unchanged(panel):
+    winsorizer = Winsorizer(0.1, 0.9, columns=['amount'], by='year').fit(panel[panel['year'] < 2023])
+
+    result = winsorizer.transform(panel)
+
+    unseen = panel['year'] == 2023
+    pd.testing.assert_series_equal(result.loc[unseen, 'amount'], panel.loc[unseen, 'amount'])
+    assert (result.loc[~unseen, 'amount'] != panel.loc[~unseen, 'amount']).any()
+
+
+@pytest.mark.parametrize('by', [None, 'year', ['year', 'industry']])
+def test_json_round_trip(panel, tmp_path, by):
+    winsorizer = Winsorizer(0.05, 0.95, by=by, mode='truncate').fit(panel)
+    path = tmp_path / 'cutoffs.json'
+
+    winsorizer.save(path)
+    loaded = Winsorizer.load(path)
+
+    assert repr(loaded) == repr(winsorizer)
+    assert loaded.columns_ == winsorizer.columns_
+    np.testing.assert_array_equal(loaded.thresholds_, winsorizer.thresholds_)
+    if by is not None:
+        assert loaded.groups_.equals(winsorizer.groups_)
+    pd.testing.assert_frame_equal(loaded.transform(panel), winsorizer.transform(panel))
+
+
+def test_round_trip_keeps_groups_without_values(panel, tmp_path):
+    panel.loc[panel['year'] == 2022, 'amount'] = np.nan
+    winsorizer = Winsorizer(0.05, 0.95, columns=['amount'], by='year').fit(panel)
+    assert np.isnan(winsorizer.thresholds_).any()
+
+    winsorizer.save(tmp_path / 'cutoffs.json')
+    loaded = Winsorizer.load(tmp_path / 'cutoffs.json')
+
+    np.testing.assert_array_equal(loaded.thresholds_, winsorizer.thresholds_)
+
+
+def test_transform_before_fit():
+    with pytest.raises(ValueError, match='not been fitted'):
+        Winsorizer(0.05, 0.95).transform(np.arange(10.0))
@@ -0,0 +1,74 @@
+"""
+Tests for the chunked (out-of-core) thresholds, winsorize_chunked and truncate_chunked.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from byu_accounting.outliers import chunked_thresholds, truncate_chunked, winsorize_chunked
+
+# Small chunks, bins and buffers so even short inputs need several reads and narrowing passes
+SMALL = {'chunksize': 7, 'bins': 4, 'max_buffer': 3}
+
+
+def expected(values, lower, upper):
+    return tuple(np.nanpercentile(values, [lower * 100, upper * 100]))
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    data = rng.standard_t(3, 500)
+    data[rng.random(500) < 0.1] = np.nan
+    return data
+
+
+@pytest.mark.parametrize('lower, upper', [(0.01, 0.99), (0.0, 1.0), (0.25, 0.5)])
+def test_thresholds_match_nanpercentile(values, lower, upper):
+    assert chunked_thresholds(values, lower, upper, **SMALL)[None] == pytest.approx(expected(values, lower, upper))
+
+
+@pytest.mark.parametrize('lower, upper', [(0.0, 1.0), (0.01, 0.99), (0.1, 0.9), (0.3, 0.7)])
+def test_thresholds_with_infinities(values, lower, upper):
+    values[[3, 50, 120]] = np.inf
+    values[[10, 400]] = -np.inf
+
+    with np.errstate(invalid='ignore'):
+        result = chunked_thresholds(values, lower, upper, **SMALL)[None]
+        np.testing.assert_array_equal(result, expected(values, lower, upper))
+
+
+@pytest.mark.parametrize('values', [
+    np.array([np.inf, -np.inf, np.nan, np.inf]),
+    np.array([np.inf, 1.0, 2.0, 3.0]),
+    np.array([-np.inf] * 3 + [5.0] * 10),
+])
+def test_thresholds_on_infinities(values):
+    with np.errstate(invalid='ignore'):
+        for lower, upper in [(0.0, 1.0), (0.1, 0.9), (0.2, 0.95)]:
+            np.testing.assert_array_equal(chunked_thresholds(values, lower, upper)[None],
+                                          expected(values, lower, upper))
+
+
+def test_all_nan_column():
+    np.testing.assert_array_equal(chunked_thresholds(np.full(10, np.nan), 0.1, 0.9)[None], (np.nan, np.nan))
+
+
+def test_winsorize_chunked_array(values):
+    destination = np.empty_like(values)
+    lower, upper = winsorize_chunked(values, destination, 0.05, 0.95, chunksize=64)[None]
+    np.testing.assert_array_equal(destination, np.clip(values, lower, upper))
+
+
+def test_truncate_chunked_csv(tmp_path, values):
+    source, destination = tmp_path / 'in.csv', tmp_path / 'out.csv'
+    pd.DataFrame({'id': np.arange(values.size), 'amount': values}).to_csv(source, index=False)
+
+    thresholds = truncate_chunked(str(source), str(destination), 0.05, 0.95, columns=['amount'], chunksize=64)
+
+    lower, upper = thresholds['amount']
+    result = pd.read_csv(destination)
+    assert result['id'].tolist() == list(range(values.size))
+    kept = values.copy()
+    kept[(values < lower) | (values > upper)] = np.nan
+    np.testing.assert_allclose(result['amount'].to_numpy(), kept)
@@ -0,0 +1,108 @@
+"""
+Tests for ExtractionCache, on its own and through get_pdf/get_pdfs.
+"""
+import os
+import shutil
+
+import pytest
+
+from benchmarks.pdf_fixtures import make_form_pdf
+from byu_accounting.pdf import ExtractionCache, get_pdf, get_pdfs
+
+
+@pytest.fixture
+def forms(tmp_path):
+    directory = tmp_path / 'forms'
+    directory.mkdir()
+    for i in range(3):
+        make_form_pdf(str(directory / f'form_{i}.pdf'), n_fields=4, values={'field_0': f'value {i}'})
+    return directory
+
+
+def values(df):
+    return sorted(zip(df['file'].map(os.path.basename), df['name'], df['value']))
+
+
+def test_get_pdf_hits_and_misses(forms):
+    path = str(forms / 'form_0.pdf')
+    with ExtractionCache(':memory:') as cache:
+        first = get_pdf(path, cache=cache)
+        second = get_pdf(path, cache=cache)
+        with open(path, 'rb') as f:
+            third = get_pdf(f.read(), cache=cache)
+
+        assert cache.stats['hits'] == 2
+        assert cache.stats['misses'] == 1
+        assert cache.stats['entries'] == 1
+    assert first.equals(second) and first.equals(third)
+    assert first.set_index('name').loc['field_0', 'value'] == 'value 0'
+
+
+@pytest.mark.parametrize('trust_mtime', [True, False])
+def test_get_pdfs_rerun_parses_nothing(forms, trust_mtime):
+    with ExtractionCache(':memory:', trust_mtime=trust_mtime) as cache:
+        first = get_pdfs(str(forms), processes=1, cache=cache)
+        second = get_pdfs(str(forms), processes=1, cache=cache)
+
+        assert cache.stats['misses'] == 3
+        assert cache.stats['hits'] == 3
+    assert second.attrs['stats']['cached'] == 3
+    assert values(first) == values(second)
+
+
+def test_get_pdfs_copies_and_renames_hit(forms, tmp_path):
+    copies = tmp_path / 'copies'
+    shutil.copytree(forms, copies)
+    for path in copies.iterdir():
+        path.rename(path.with_name('renamed_' + path.name))
+
+    with ExtractionCache(':memory:') as cache:
+        first = get_pdfs(str(forms), processes=1, cache=cache)
+        second = get_pdfs(str(copies), processes=1, cache=cache)
+
+        assert cache.stats['misses'] == 3
+        assert cache.stats['hits'] == 3
+    assert values(second) == [('renamed_' + file, name, value) for file, name, value in values(first)]
+
+
+def test_get_pdfs_parses_identical_files_once(forms):
+    shutil.copy(forms / 'form_0.pdf', forms / 'form_0_copy.pdf')
+
+    with ExtractionCache(':memory:') as cache:
+        df = get_pdfs(str(forms), processes=1, cache=cache)
+
+        assert cache.stats['misses'] == 3
+        assert cache.stats['hits'] == 1
+    assert df.attrs['stats']['files'] == 4
+    assert set(df.loc[df['name'] == 'field_0', 'value']) == {'value 0', 'value 1', 'value 2'}
+
+
+def test_changed_file_is_parsed_again(forms):
+    path = forms / 'form_1.pdf'
+    with ExtractionCache(':memory:') as cache:
+        get_pdfs(str(forms), processes=1, cache=cache)
+        make_form_pdf(str(path), n_fields=4, values={'field_0': 'changed'})
+        os.utime(path, ns=(0, 0))
+
+        df = get_pdfs(str(forms), processes=1, cache=cache)
+
+        assert cache.stats['misses'] == 4
+    assert df.loc[(df['file'] == str(path)) & (df['name'] == 'field_0'), 'value'].item() == 'changed'
+
+
+def test_eviction_and_invalidate(forms):
+    paths = sorted(str(path) for path in forms.iterdir())
+    with ExtractionCache(':memory:', max_bytes=1) as cache:
+        for path in paths:
+            get_pdf(path, cache=cache)
+        assert len(cache) == 0
+
+        cache.max_bytes = 2**20
+        for path in paths:
+            get_pdf(path, cache=cache)
+        assert len(cache) == 3
+
+        cache.invalidate(paths[0])
+        assert len(cache) == 2
+        cache.invalidate()
+        assert cache.stats['entries'] == 0 and cache.stats['bytes'] == 0
@@ -0,0 +1,71 @@
+"""
+Tests for create_pdf and get_pdf.
+"""
+import io
+
+import pytest
+from pypdf import PdfReader
+
+from benchmarks.pdf_fixtures import make_form_pdf
+from byu_accounting.pdf import FieldIndex, create_pdf, get_pdf
+
+
+@pytest.fixture
+def template(tmp_path):
+    # Three pages of two fields each
+    return make_form_pdf(str(tmp_path / 'form.pdf'), n_fields=6, values={'field_5': 'kept'}, fields_per_page=2)
+
+
+def field_values(pdf):
+    return {name: field.get('/V') for name, field in PdfReader(pdf).get_fields().items()}
+
+
+def test_returns_unmatched_names(template, tmp_path):
+    output = tmp_path / 'filled.pdf'
+
+    unmatched = create_pdf(template, str(output), {'field_0': 'a', 'missing': 'b', 'field_3': 4.5, 'Field_1': 'c'})
+
+    assert unmatched == ['missing', 'Field_1']
+    values = field_values(str(output))
+    assert values['field_0'] == 'a'
+    assert values['field_3'] == '4.5'
+    assert values['field_1'] == ''
+    assert values['field_5'] == 'kept'
+
+
+def test_nothing_matched(template):
+    output = io.BytesIO()
+
+    assert create_pdf(template, output, {'nope': 1}) == ['nope']
+    assert field_values(io.BytesIO(output.getvalue()))['field_0'] == ''
+
+
+def test_flattened_output_reports_unmatched_names(template):
+    output = io.BytesIO()
+
+    unmatched = create_pdf(template, output, {'field_2': 'page two', 'missing': 'x'}, flatten=True)
+
+    assert unmatched == ['missing']
+    reader = PdfReader(io.BytesIO(output.getvalue()))
+    assert not reader.get_fields()
+    assert 'page two' in reader.pages[1].extract_text()
+    assert 'kept' in reader.pages[2].extract_text()
+
+
+def test_field_index_pages(template):
+    index = FieldIndex(PdfReader(template))
+
+    assert index.names == [f'field_{i}' for i in range(6)]
+    assert index.pages['field_3'] == [1]
+    updates, unmatched = index.updates_by_page({'field_0': 1, 'field_5': 2, 'other': 3})
+    assert updates == {0: {'field_0': '1'}, 2: {'field_5': '2'}}
+    assert unmatched == ['other']
+
+
+def test_get_pdf_from_bytes(template):
+    with open(template, 'rb') as f:
+        df = get_pdf(f.read())
+
+    assert list(df.columns) == ['name', 'type', 'value']
+    assert df.set_index('name').loc['field_5', 'value'] == 'kept'
+    assert (df['type'] == '/Tx').all()
@@ -0,0 +1,53 @@
+"""
+Tests for PdfTemplate.fill_merged.
+"""
+import io
+
+import pandas as pd
+from pypdf import PdfReader, PdfWriter
+
+from benchmarks.pdf_fixtures import make_form_pdf
+from byu_accounting.pdf.template import PdfTemplate
+
+
+def test_fill_merged_adds_one_copy_per_row(tmp_path):
+    template = PdfTemplate(make_form_pdf(str(tmp_path / 'form.pdf'), n_fields=3))
+
+    merged = PdfReader(io.BytesIO(template.fill_merged(pd.DataFrame({'field_0': ['a', 'b'], 'field_1': ['c', 'd']}))))
+
+    assert len(merged.pages) == 2
+    assert 'a' in merged.pages[0].extract_text()
+    assert 'b' in merged.pages[1].extract_text()
+
+
+def test_fill_merged_without_form(tmp_path):
+    writer = PdfWriter()
+    writer.add_blank_page(612, 792)
+    path = tmp_path / 'plain.pdf'
+    writer.write(str(path))
+    template = PdfTemplate(str(path))
+
+    merged = PdfReader(io.BytesIO(template.fill_merged(pd.DataFrame({'x': [1, 2, 3]}))))
+
+    assert len(merged.pages) == 3
+    assert '/AcroForm' not in merged.trailer['/Root']
+
+
+def test_fill_flattened(tmp_path, recwarn):
+    template = PdfTemplate(make_form_pdf(str(tmp_path / 'form.pdf'), n_fields=3))
+
+    filled = PdfReader(io.BytesIO(template.fill({'field_0': 'flat value'}, None, flatten=True)))
+
+    assert 'flat value' in filled.pages[0].extract_text()
+    assert '/AcroForm' not in filled.trailer['/Root']
+    assert not [warning for warning in recwarn if issubclass(warning.category, DeprecationWarning)]
+
+
+def test_fill_rows_paths_use_the_dataframe_index(tmp_path):
+    template = PdfTemplate(make_form_pdf(str(tmp_path / 'form.pdf'), n_fields=2))
+    df = pd.DataFrame({'index': ['x', 'y'], 'field_0': ['a', 'b']}, index=[7, 8])
+
+    paths = template.fill_rows(df, str(tmp_path / 'out' / '{index}_{field_0}.pdf'), processes=1)
+
+    assert paths == [str(tmp_path / 'out' / '7_a.pdf'), str(tmp_path / 'out' / '8_b.pdf')]
+    assert PdfReader(paths[1]).get_fields()['field_0']['/V'] == 'b'
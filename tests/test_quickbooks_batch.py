@@ -0,0 +1,36 @@
+"""
+Tests for QuickBooksClient.batch: bIds and requests that fail as a whole.
+"""
+
+
+def test_caller_bids_do_not_collide_with_assigned_ones(fake_session, make_client):
+    client = make_client(fake_session())
+    operations = [
+        {'operation': 'create', 'Invoice': {'DocNumber': 'A'}},
+        {'operation': 'create', 'Invoice': {'DocNumber': 'B'}, 'bId': '0'},
+        {'operation': 'create', 'Invoice': {'DocNumber': 'C'}, 'bId': 'C'},
+    ]
+
+    responses = client.batch(operations)
+
+    assert [response['bId'] for response in responses] == ['0', '0', 'C']
+    assert [response['Invoice']['DocNumber'] for response in responses] == ['A', 'B', 'C']
+    assert 'bId' not in operations[0]
+
+
+def test_failed_request_does_not_lose_committed_chunks(fake_session, make_client):
+    session = fake_session(failing_batches={1})
+    client = make_client(session, max_concurrency=1)
+    operations = [{'operation': 'create', 'Invoice': {'DocNumber': str(i)}} for i in range(75)]
+
+    responses = client.batch(operations)
+
+    assert len(session.calls('batch')) == 3
+    created = [i for i, response in enumerate(responses) if 'Invoice' in response]
+    assert created == list(range(30)) + list(range(60, 75))
+    for response in responses[30:60]:
+        [error] = response['Fault']['Error']
+        assert response['Fault']['type'] == 'BatchRequestFault'
+        assert error['code'] == '400'
+        assert 'ValidationFault' in error['Detail']
+    assert [response['bId'] for response in responses] == [str(i) for i in range(75)]
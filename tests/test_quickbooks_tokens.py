@@ -0,0 +1,44 @@
+"""
+Tests for QuickBooksTokenManager refreshes shared through a token file.
+"""
+import json
+import os
+import stat
+import time
+
+from byu_accounting.quickbooks import QuickBooksTokenManager, get_session
+
+
+def expired_tokens():
+    return {'accessToken': 'access-0', 'refreshToken': 'refresh', 'expiresAt': time.time() - 1}
+
+
+def test_second_process_adopts_a_refresh_that_kept_the_refresh_token(tmp_path, token_endpoint):
+    token_file = tmp_path / 'tokens.json'
+    token_file.write_text(json.dumps(expired_tokens()))
+    first = QuickBooksTokenManager('id', 'secret', token_file=token_file, session=token_endpoint)
+    second = QuickBooksTokenManager('id', 'secret', token_file=token_file, session=token_endpoint)
+
+    # The second manager, like another process, still holds the expired token when it needs one
+    assert first.access_token() == 'access-1'
+    assert second.access_token() == 'access-1'
+    assert token_endpoint.refreshes == 1
+    assert second.refresh_count == 0
+
+
+def test_token_file_is_private(tmp_path, token_endpoint):
+    token_file = tmp_path / 'tokens.json'
+    manager = QuickBooksTokenManager('id', 'secret', tokens=expired_tokens(), token_file=token_file,
+                                     session=token_endpoint)
+
+    manager.refresh()
+
+    assert json.loads(token_file.read_text())['accessToken'] == 'access-1'
+    if os.name != 'nt':
+        assert stat.S_IMODE(os.stat(token_file).st_mode) == 0o600
+
+
+def test_session_does_not_resend_posts():
+    retry = get_session().get_adapter('https://').max_retries
+    assert not retry.is_retry('POST', 503)
+    assert retry.is_retry('GET', 503)
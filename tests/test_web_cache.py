@@ -0,0 +1,94 @@
+"""
+Tests for the per-driver element cache: hits, navigation, frames and stale elements.
+"""
+import pytest
+
+from benchmarks.fake_driver import FakeDriver
+from byu_accounting.web import (
+    click_button,
+    disable_element_cache,
+    enable_element_cache,
+    get_element_cache,
+    switch_to_default_frame,
+    switch_to_iframe,
+)
+
+
+@pytest.fixture
+def driver():
+    driver = FakeDriver(appear_after=0, latency=0)
+    driver.get('https://example.com/start')
+    yield driver
+    disable_element_cache(driver)
+
+
+def test_repeated_lookups_hit_the_cache(driver):
+    cache = enable_element_cache(driver)
+
+    for _ in range(3):
+        assert click_button('//button', driver) is True
+
+    assert driver.finds == 1
+    assert driver.clicks == 3
+    assert cache.stats() == {'hits': 2, 'misses': 1, 'stale': 0, 'hit_rate': 2 / 3, 'entries': 1}
+
+
+def test_stale_elements_are_looked_up_again(driver):
+    cache = enable_element_cache(driver)
+    click_button('//button', driver)
+
+    driver.rerender()
+
+    assert click_button('//button', driver, timeout=0.1) is True
+    assert cache.stale == 1
+    assert driver.finds == 2
+
+
+def test_navigation_clears_elements_and_frame_path(driver):
+    cache = enable_element_cache(driver)
+    assert switch_to_iframe('//iframe', driver) is True
+    click_button('//button', driver)
+    assert cache.frame_path and len(cache) == 2
+
+    driver.get('https://example.com/next')
+    click_button('//button', driver)
+
+    assert cache.frame_path == ()
+    assert len(cache) == 1
+    assert cache.stale == 0
+
+
+def test_frames_have_their_own_entries(driver):
+    cache = enable_element_cache(driver)
+    click_button('//button', driver)
+    switch_to_iframe('//iframe', driver)
+
+    click_button('//button', driver)
+    assert cache.misses == 3  # the button, the iframe, and the button inside the iframe
+
+    switch_to_default_frame(driver)
+    assert cache.frame_path == () and len(cache) == 0
+    assert driver.frames == []
+
+
+def test_without_navigation_checks_the_url_is_not_read(driver):
+    cache = enable_element_cache(driver, check_navigation=False)
+    click_button('//button', driver)
+
+    driver.get('https://example.com/next')
+
+    # The old element is stale on the new page; it is discarded and found again.
+    assert click_button('//button', driver, timeout=0.1) is True
+    assert cache.stale == 1
+
+
+def test_enable_and_disable(driver):
+    assert get_element_cache(driver) is None
+    cache = enable_element_cache(driver)
+    assert enable_element_cache(driver) is cache
+    assert disable_element_cache(driver) is cache
+    assert get_element_cache(driver) is None
+
+    click_button('//button', driver)
+    click_button('//button', driver)
+    assert driver.finds == 2
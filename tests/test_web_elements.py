@@ -0,0 +1,32 @@
+"""
+Tests for click_button, send_text and switch_to_iframe against the benchmarks' fake driver.
+"""
+import logging
+
+from benchmarks.fake_driver import FakeDriver
+from byu_accounting.web import click_button, send_text, switch_to_iframe
+
+
+def test_send_text_types_into_hidden_inputs():
+    driver = FakeDriver(appear_after=0, latency=0, hidden={'//input[@type="file"]'})
+
+    assert send_text('statement.pdf', '//input[@type="file"]', driver, timeout=0.1) is True
+
+
+def test_click_button_waits_for_the_button_to_be_displayed():
+    driver = FakeDriver(appear_after=0, latency=0, hidden={'//button'})
+
+    assert click_button('//button', driver, timeout=0.05, poll_interval=0.01) is False
+    assert driver.clicks == 0
+
+
+def test_failures_are_logged_not_printed(caplog, capsys):
+    driver = FakeDriver(appear_after=10, latency=0)
+
+    with caplog.at_level(logging.WARNING, logger='byu_accounting.web'):
+        assert send_text('x', '//input', driver, timeout=0.05, poll_interval=0.01) is False
+        assert switch_to_iframe('//iframe', driver, timeout=0.05, poll_interval=0.01) is False
+
+    assert [record.getMessage().split(':')[0] for record in caplog.records] == [
+        'Error sending text', 'Error switching to iframe']
+    assert capsys.readouterr().out == ''
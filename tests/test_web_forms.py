@@ -0,0 +1,73 @@
+"""
+Tests for fill_form: the Python side of its script's answers, against the benchmarks' fake driver.
+"""
+import logging
+import time
+
+from benchmarks.fake_driver import FakeDriver, FakeElement
+from byu_accounting.web import fill_form
+
+
+class ScriptedDriver(FakeDriver):
+    """
+    Answers fill_form's script with a fixed status per locator value; other fields are filled once the page is ready.
+    """
+
+    def __init__(self, answers, **kwargs):
+        super().__init__(latency=0, **kwargs)
+        self.answers = answers
+        self.scripts = 0
+
+    def execute_script(self, script, fields):
+        self.scripts += 1
+        statuses = super().execute_script(script, fields)
+        return [self.answers.get(field[1], status) for field, status in zip(fields, statuses)]
+
+
+class UnclearableElement(FakeElement):
+    def clear(self):
+        raise RuntimeError('invalid element state')
+
+
+def test_fills_every_field_in_one_script():
+    driver = ScriptedDriver({}, appear_after=0)
+
+    assert fill_form(driver, {'//input[1]': 'a', ('ID', 'amount'): 125.5}) == {'//input[1]': True, ('ID', 'amount'): True}
+    assert driver.scripts == 1
+
+
+def test_waits_for_fields_to_appear():
+    driver = ScriptedDriver({}, appear_after=0.05)
+
+    assert fill_form(driver, {'//input': 'a'}, timeout=2, poll_interval=0.01) == {'//input': True}
+    assert driver.scripts > 1
+
+
+def test_key_events_fields_are_cleared_and_typed_into():
+    driver = ScriptedDriver({}, appear_after=0)
+    element = FakeElement(driver, '//input[@type="date"]')
+    element.text = 'old'
+    driver.answers['//input[@type="date"]'] = ['keys', element]
+
+    assert fill_form(driver, {'//input[@type="date"]': '2024-06-30'}) == {'//input[@type="date"]': True}
+    assert element.text == '2024-06-30'
+
+
+def test_script_errors_fail_their_field_without_waiting(caplog):
+    driver = ScriptedDriver({'//[bad': ['error', "SyntaxError: '//[bad' is not a valid XPath expression."]},
+                            appear_after=0)
+    start = time.perf_counter()
+
+    with caplog.at_level(logging.WARNING, logger='byu_accounting.web'):
+        results = fill_form(driver, {'//[bad': 'x', '//input': 'y'}, timeout=5)
+
+    assert results == {'//[bad': False, '//input': True}
+    assert time.perf_counter() - start < 1
+    assert 'not a valid XPath' in caplog.text
+
+
+def test_send_keys_failures_are_reported():
+    driver = ScriptedDriver({}, appear_after=0)
+    driver.answers['//div[@contenteditable]'] = ['keys', UnclearableElement(driver, '//div[@contenteditable]')]
+
+    assert fill_form(driver, {'//div[@contenteditable]': 'x'}) == {'//div[@contenteditable]': False}
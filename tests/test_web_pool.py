@@ -0,0 +1,71 @@
+"""
+Tests for SessionPool: session reuse and replacement.
+"""
+from benchmarks.fake_driver import FakeDriver
+from byu_accounting.web import SessionPool, click_button, enable_element_cache, get_element_cache
+
+
+class Factory:
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        driver = FakeDriver(appear_after=0, latency=0)
+        self.drivers.append(driver)
+        return driver
+
+
+def test_sessions_are_reused():
+    factory = Factory()
+    with SessionPool(factory, size=2) as pool:
+        report = pool.run([lambda driver: click_button('//button', driver)] * 10)
+
+    assert [result.value for result in report.results] == [True] * 10
+    assert 1 <= report.sessions_started == len(factory.drivers) <= 2
+    assert not any(driver.alive for driver in factory.drivers)
+
+
+def test_max_jobs_per_session():
+    factory = Factory()
+    with SessionPool(factory, size=1, max_jobs_per_session=3) as pool:
+        report = pool.run([lambda driver: id(driver)] * 7)
+
+    assert report.sessions_started == 3
+    assert len({result.value for result in report.results[:3]}) == 1
+    assert report.results[2].value != report.results[3].value != report.results[6].value
+    assert [driver.alive for driver in factory.drivers] == [False, False, False]
+
+
+def test_dead_session_is_replaced_after_a_failure():
+    def crash(driver):
+        driver.quit()
+        raise RuntimeError('browser crashed')
+
+    def fail(driver):
+        raise ValueError('bad data')
+
+    factory = Factory()
+    with SessionPool(factory, size=1) as pool:
+        report = pool.run({'fail': fail, 'after fail': id, 'crash': crash, 'after crash': id})
+
+    assert [result.name for result in report.failed] == ['fail', 'crash']
+    assert isinstance(report.failed[1].error, RuntimeError)
+    # A failure with a live session keeps it; a dead session is replaced
+    assert len(factory.drivers) == 2
+    assert report.results[1].value == id(factory.drivers[0])
+    assert report.results[3].value == id(factory.drivers[1])
+
+
+def test_reset_runs_before_each_job_and_the_element_cache_is_cleared():
+    def job(driver, company):
+        enable_element_cache(driver)
+        assert len(get_element_cache(driver)) == 0
+        click_button('//button', driver)
+        return driver.current_url
+
+    with SessionPool(Factory(), size=1, reset=lambda driver: driver.get('https://example.com/start')) as pool:
+        report = pool.map(job, {'a': 1, 'b': 2})
+
+    assert [(result.name, result.value) for result in report.results] == [
+        ('a', 'https://example.com/start'), ('b', 'https://example.com/start')]
+    assert report.succeeded == report.results
@@ -0,0 +1,57 @@
+"""
+Tests for wait_until and the wait defaults.
+"""
+import pytest
+
+from byu_accounting.web import last_wait, set_wait_defaults, wait_until
+from byu_accounting.web.waits import _defaults
+
+
+@pytest.fixture
+def defaults():
+    saved = dict(_defaults)
+    yield
+    _defaults.update(saved)
+
+
+def test_returns_the_first_truthy_value():
+    answers = iter([None, 0, 'ready'])
+
+    result = wait_until(lambda driver: next(answers), None, timeout=1, poll_interval=0.001)
+
+    assert result and result.value == 'ready'
+    assert result.polls == 3
+    assert last_wait() is result
+
+
+def test_exceptions_are_retried_and_kept():
+    calls = []
+
+    def condition(driver):
+        calls.append(driver)
+        if len(calls) < 3:
+            raise LookupError('not yet')
+        return True
+
+    result = wait_until(condition, 'driver', timeout=1, poll_interval=0.001)
+
+    assert result.success and result.last_exception is not None
+    assert calls == ['driver'] * 3
+
+
+def test_timeout_with_backoff():
+    result = wait_until(lambda driver: False, None, timeout=0.2, poll_interval=0.01, backoff=2, max_poll_interval=0.05)
+
+    assert not result
+    assert result.value is None
+    assert 0.2 <= result.elapsed < 0.5
+    # 10, 20, 40 ms, then every 50 ms: far fewer polls than a busy loop
+    assert 4 <= result.polls <= 8
+
+
+def test_defaults(defaults):
+    set_wait_defaults(timeout=0.05, poll_interval=0.01)
+
+    result = wait_until(lambda driver: False, None)
+
+    assert 0.05 <= result.elapsed < 0.3